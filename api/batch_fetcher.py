@@ -0,0 +1,182 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from cachetools import TTLCache
+
+from api.config import FETCH_BACKOFF, FETCH_MAX_WORKERS, FETCH_MEMO_ENTRIES, FETCH_MEMO_MAX_AGE, FETCH_RETRIES
+from api.providers import BaseProvider
+
+
+class NoDataError(ValueError):
+    """
+    The provider answered but returned no data for the ticker; retrying does not help.
+    """
+
+
+class FetchReport:
+    """
+    Outcome of a batch fetch, split per ticker.
+
+    Attributes:
+        values (dict): Ticker to fetched value for every successful ticker.
+        errors (dict): Ticker to the exception raised by its last attempt.
+    """
+
+    def __init__(self, values, errors):
+        self.values = values
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def __repr__(self):
+        return f"FetchReport(ok={sorted(self.values)}, failed={sorted(self.errors)})"
+
+
+class BatchFetcher(BaseProvider):
+    """
+    Concurrent, coalescing front for a market-data provider.
+
+    Per-ticker requests run on a bounded thread pool and failures are
+    retried with exponential backoff, except for empty answers
+    (`NoDataError`). Successful requests are memoised for `memo_max_age`,
+    so a ticker asked for twice within one simulation (e.g. once for its
+    currency from two call sites, or once as component and once as
+    benchmark) is fetched only once, even when the calls overlap in time;
+    failed requests are forgotten and tried again by the next call.
+
+    The fetcher is itself a provider, so it can sit behind `PriceCache` and
+    be handed to `YahooFinance`; one fetcher (one thread pool) is meant to
+    be shared by every run of a pipeline and shut down with it.
+
+    Attributes
+    ----------
+    provider : BaseProvider
+        Underlying source of data (Yahoo Finance, local stub, ...).
+    max_workers : int
+        Maximum number of requests in flight at once.
+    retries : int
+        Attempts per request after the first failure.
+    backoff : float
+        Base delay in seconds; attempt k sleeps `backoff * 2**k` before retrying.
+    memo_entries : int
+        Successful requests remembered at most.
+    memo_max_age : datetime.timedelta
+        Remembered requests older than this are fetched again.
+
+    Methods
+    -------
+    fetch_prices(tickers, start_date, end_date, adjusted)
+        FetchReport of close price Series per ticker.
+    fetch_currencies(tickers)
+        FetchReport of currency codes per ticker.
+    fetch_dividends(tickers, start_date, end_date)
+        FetchReport of cash dividend Series per ticker.
+    shutdown()
+        Waits for requests in flight and stops the thread pool.
+    """
+
+    def __init__(self, provider, max_workers=FETCH_MAX_WORKERS, retries=FETCH_RETRIES, backoff=FETCH_BACKOFF,
+                 memo_entries=FETCH_MEMO_ENTRIES, memo_max_age=FETCH_MEMO_MAX_AGE):
+        self.provider = provider
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = TTLCache(maxsize=memo_entries, ttl=memo_max_age.total_seconds())
+        self._lock = threading.Lock()
+        self.last_errors = {}
+
+    def fetch_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        return self._fetch_many(
+            "prices", tickers, (start_date, end_date, adjusted),
+            lambda t: self._price_series(t, start_date, end_date, adjusted),
+        )
+
+    def fetch_currencies(self, tickers):
+        return self._fetch_many("currency", tickers, (), self.provider.get_currency)
+
+    def fetch_dividends(self, tickers, start_date=None, end_date=None):
+        return self._fetch_many(
+            "dividends", tickers, (start_date, end_date),
+            lambda t: self.provider.get_dividends(t, start_date, end_date),
+        )
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Provider interface: failed tickers come back as all-NaN columns.
+        """
+        report = self.fetch_prices(tickers, start_date, end_date, adjusted)
+        self.last_errors = report.errors
+        df = pd.DataFrame({t: report.values.get(t, pd.Series(dtype=float)) for t in tickers})
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "Date"
+        return df.sort_index().astype(float)
+
+    def get_currency(self, ticker):
+        return self._submit("currency", ticker, (), self.provider.get_currency).result()
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        return self._submit(
+            "dividends", ticker, (start_date, end_date),
+            lambda t: self.provider.get_dividends(t, start_date, end_date),
+        ).result()
+
+    def _price_series(self, ticker, start_date, end_date, adjusted=True):
+        prices = self.provider.get_prices([ticker], start_date, end_date, adjusted=adjusted)[ticker]
+        if prices.isna().all():
+            raise NoDataError(f"No price data returned for ticker: {ticker}")
+        return prices
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def _fetch_many(self, kind, tickers, key, call):
+        # Submit everything first so requests overlap, then collect
+        futures = {t: self._submit(kind, t, key, call) for t in dict.fromkeys(tickers)}
+
+        values, errors = {}, {}
+        for ticker, future in futures.items():
+            try:
+                values[ticker] = future.result()
+            except Exception as e:
+                errors[ticker] = e
+        return FetchReport(values, errors)
+
+    def _submit(self, kind, ticker, key, call):
+        request = (kind, ticker) + tuple(key)
+        with self._lock:
+            future = self._futures.get(request)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._with_retries, call, ticker)
+            self._futures[request] = future
+        # Outside the lock: the callback runs at once if the request already finished
+        future.add_done_callback(lambda done: self._forget_failure(request, done))
+        return future
+
+    def _forget_failure(self, request, future):
+        if future.exception() is not None:
+            with self._lock:
+                if self._futures.get(request) is future:
+                    del self._futures[request]
+
+    def _with_retries(self, call, ticker):
+        for attempt in range(self.retries + 1):
+            try:
+                return call(ticker)
+            except NoDataError:
+                raise
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+# --- Local price cache ---
+# Directory holding one Parquet file per ticker plus the coverage index.
+PRICE_CACHE_DIR = ".cache/prices"
+# Cached histories older than this have their trailing rows re-fetched.
+PRICE_CACHE_MAX_AGE = timedelta(hours=12)
+# Least recently used tickers beyond this count are evicted from disk.
+PRICE_CACHE_MAX_ENTRIES = 500
+
+# --- Batch fetcher ---
+# Maximum number of provider requests in flight at once.
+FETCH_MAX_WORKERS = 8
+# Retries per ticker after the first failed attempt.
+FETCH_RETRIES = 2
+# Base backoff in seconds, doubled after every failed attempt.
+FETCH_BACKOFF = 0.5
+# Successful requests remembered by a fetcher (a long-lived one is shared by every run).
+FETCH_MEMO_ENTRIES = 2048
+# Remembered requests older than this are fetched again.
+FETCH_MEMO_MAX_AGE = timedelta(minutes=15)
+
+# --- Simulation pipeline ---
+# Results kept in memory per stage (data, index, wrapper, analytics, display).
+PIPELINE_CACHE_MAX_ENTRIES = 32
+# Stage results older than this are recomputed (matches the price cache refresh).
+PIPELINE_CACHE_MAX_AGE = timedelta(hours=12)
+# Optional directory for pickled stage results shared across sessions (None = memory only).
+PIPELINE_CACHE_DIR = None
+
+# --- Memory-mapped research store ---
+# Directory holding one .npy file per field plus the ticker/date index.
+MMAP_STORE_DIR = ".cache/store"
+
+# --- Batch pricing ---
+# Monte Carlo paths per product priced headless (matches Note.price).
+BATCH_PRICING_PATHS = 100_000
+# Result rows buffered before a Parquet row group is written.
+BATCH_FLUSH_ROWS = 50
+
+# --- Stress tests ---
+# Named historical stress windows (peak to trough of the equity drawdown).
+STRESS_WINDOWS = {
+    "Global Financial Crisis": ("2008-09-12", "2009-03-09"),
+    "Flash Crash": ("2010-04-23", "2010-07-02"),
+    "Euro Sovereign Crisis": ("2011-07-22", "2011-10-03"),
+    "Taper Tantrum": ("2013-05-21", "2013-06-24"),
+    "China Devaluation": ("2015-08-10", "2015-08-25"),
+    "Volmageddon": ("2018-01-26", "2018-02-08"),
+    "Q4 2018 Selloff": ("2018-09-20", "2018-12-24"),
+    "COVID Crash": ("2020-02-19", "2020-03-23"),
+    "2022 Rate Shock": ("2022-01-03", "2022-10-12"),
+}
+
+# --- Charts ---
+# Points drawn per series by default (LTTB downsampling above this).
+CHART_MAX_POINTS = 2000
+# Downsampled series kept in memory, keyed by (series hash, resolution).
+CHART_CACHE_ENTRIES = 64
+# Rows per page of the result tables.
+TABLE_PAGE_ROWS = 250
+
+# --- Rates ---
+# Directory holding fixings/<NAME>.csv and curves/<NAME>.csv (see RateStore).
+RATES_DIR = "data/rates"
+# Bootstrapped curves kept in memory, one per (curve, snapshot date, day count, calendar).
+RATES_CURVE_CACHE_ENTRIES = 256
+
+# --- Analytics ---
+# Fixings per rolling window of the index vs benchmark statistics (about three months).
+ANALYTICS_ROLLING_WINDOW = 63
+
+# --- Tracing ---
+# Record peak allocations per traced stage with tracemalloc, for the whole process (slows allocation-heavy code down).
+TRACE_MEMORY = False
+# Finished stages kept in memory across runs (oldest dropped first).
+TRACE_MAX_SPANS = 5000
+# JSON lines file every finished run is appended to (None = export on demand only).
+TRACE_EXPORT_PATH = None
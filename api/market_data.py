@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+
+def pad(values: np.ndarray) -> np.ndarray:
+    """
+    Forward-fills NaNs down each column of a (dates × columns) array, as `DataFrame.ffill`.
+    """
+    values = np.asarray(values, dtype=float)
+    rows = np.where(np.isnan(values), 0, np.arange(len(values))[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(values, rows, axis=0)
+
+
+def pad_returns(values: np.ndarray) -> np.ndarray:
+    """
+    Daily returns of a (dates × columns) price array with missing prices
+    padded forward and undefined returns set to 0, bit for bit equal to
+    `DataFrame.pct_change().fillna(0)`.
+    """
+    padded = pad(values)
+    returns = np.zeros(padded.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns[1:] = padded[1:] / padded[:-1] - 1
+    returns[np.isnan(returns)] = 0.0
+    return returns
+
+
+class MarketData:
+    """
+    Compact (dates × tickers) market data block.
+
+    Values are held in one column-major NumPy array, so every ticker's
+    history is contiguous, with a ticker → column index and a datetime64 date
+    axis. float32 storage halves memory for large universes; computations
+    read columns back as float64. Missing values are NaN (never object
+    `pd.NA`), exposed through `mask`.
+
+    Single columns are served as zero-copy Series, so code written against
+    a wide DataFrame (`data[ticker]`, `data.index`, `data.columns`) reads it
+    without materializing one.
+
+    Attributes:
+        values (np.ndarray): (dates × tickers) block, Fortran-ordered when
+            built by `from_frame` (slices may be strided views of it).
+        tickers (list of str): Column labels.
+        dates (np.ndarray): datetime64[ns] date axis.
+
+    Example:
+        data = MarketData.from_frame(prices, dtype=np.float32)
+        data.matrix(["AAPL", "MSFT"])  # float64 (dates × 2) array
+    """
+
+    def __init__(self, values, tickers, dates, dtype=np.float64):
+        self.values = np.asarray(values, dtype=dtype)
+        self.tickers = list(tickers)
+        self.dates = np.asarray(dates, dtype="datetime64[ns]")
+        self._column_of = {t: i for i, t in enumerate(self.tickers)}
+        self._index = None
+
+        if self.values.shape != (len(self.dates), len(self.tickers)):
+            raise ValueError("values must have one row per date and one column per ticker.")
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame, dtype=np.float64):
+        """
+        Builds the block from a wide frame in one conversion.
+        """
+        return cls(np.asfortranarray(frame.to_numpy(dtype=dtype)), frame.columns, pd.DatetimeIndex(frame.index),
+                   dtype=dtype)
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        if self._index is None:
+            self._index = pd.DatetimeIndex(self.dates, name="Date")
+        return self._index
+
+    @property
+    def columns(self) -> pd.Index:
+        return pd.Index(self.tickers)
+
+    @property
+    def mask(self) -> np.ndarray:
+        """
+        True where a value is missing.
+        """
+        return np.isnan(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.dates.nbytes
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __contains__(self, ticker):
+        return ticker in self._column_of
+
+    def __getitem__(self, ticker) -> pd.Series:
+        if ticker not in self._column_of:
+            raise KeyError(ticker)
+        return pd.Series(self.values[:, self._column_of[ticker]], index=self.index, name=ticker, copy=False)
+
+    def columns_of(self, tickers) -> np.ndarray:
+        """
+        Column positions of `tickers`.
+        """
+        missing = [t for t in tickers if t not in self._column_of]
+        if missing:
+            raise KeyError(f"Unknown tickers: {missing}")
+        return np.array([self._column_of[t] for t in tickers], dtype=np.int64)
+
+    def matrix(self, tickers=None, dtype=np.float64) -> np.ndarray:
+        """
+        (dates × tickers) array of the selected columns (all by default).
+        """
+        values = self.values if tickers is None else self.values[:, self.columns_of(tickers)]
+        return values.astype(dtype, copy=False)
+
+    def select(self, tickers) -> "MarketData":
+        return MarketData(self.values[:, self.columns_of(tickers)], tickers, self.dates, dtype=self.values.dtype)
+
+    def slice_dates(self, start=None, end=None) -> "MarketData":
+        """
+        Rows within [start, end), as a view of the same block.
+        """
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), side="left")
+        return MarketData(self.values[lo:hi], self.tickers, self.dates[lo:hi], dtype=self.values.dtype)
+
+    def returns(self, tickers=None) -> np.ndarray:
+        """
+        Daily padded returns of the selected columns (see `pad_returns`).
+        """
+        return pad_returns(self.matrix(tickers))
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=self.index, columns=self.tickers)
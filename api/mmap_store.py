@@ -0,0 +1,160 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from api.config import MMAP_STORE_DIR
+from api.market_data import MarketData
+from api.providers import BaseProvider
+
+
+class MmapStore:
+    """
+    Memory-mapped (dates × tickers) store for large research universes.
+
+    Each field (e.g. 'close', 'dividends') is one fixed-layout `.npy` file in
+    column-major order, so every ticker's history is contiguous on disk; the
+    tickers, fields and currencies are listed in `index.json` and the shared
+    date axis is stored in `dates.npy`. Opening the store only reads the index:
+    fields are mapped on first access and the OS pages in just the columns
+    and rows that are actually sliced.
+
+    Attributes:
+        path (str): Store directory.
+        tickers (list of str): Column labels.
+        fields (list of str): Stored fields.
+        currencies (dict): Quote currency per ticker, when recorded.
+        dates (np.ndarray): Memory-mapped datetime64[ns] date axis.
+
+    Example:
+        store = MmapStore.create(".cache/store", {"close": closes, "dividends": cash})
+        data = MmapStore(".cache/store").market_data(["AAPL", "MSFT"], "1995-01-01", "2025-01-01")
+        dividends = DividendSchedule.from_cash(store.market_data(tickers, field="dividends"), data)
+    """
+
+    INDEX_FILE = "index.json"
+    DATES_FILE = "dates.npy"
+
+    def __init__(self, path=MMAP_STORE_DIR):
+        self.path = path
+        with open(os.path.join(path, self.INDEX_FILE)) as f:
+            meta = json.load(f)
+        self.tickers = meta["tickers"]
+        self.fields = meta["fields"]
+        self.currencies = meta.get("currencies", {})
+        self.dates = np.load(os.path.join(path, self.DATES_FILE), mmap_mode="r")
+        self._column_of = {t: i for i, t in enumerate(self.tickers)}
+        self._arrays = {}
+
+    @classmethod
+    def create(cls, path, fields: dict, currencies=None, dtype=np.float32):
+        """
+        Writes a store from wide frames, one per field.
+
+        The date axis and tickers are those of the first field; other fields
+        are aligned to them (missing values are NaN) through positional row
+        indexers, never reindexed. Columns are written one at a time, so
+        building a store never holds a second full copy.
+        """
+        os.makedirs(path, exist_ok=True)
+        names = list(fields)
+        grid = fields[names[0]]
+        dates = pd.DatetimeIndex(grid.index).sort_values()
+        tickers = [str(t) for t in grid.columns]
+
+        np.save(os.path.join(path, cls.DATES_FILE), dates.to_numpy(dtype="datetime64[ns]"))
+        for name in names:
+            frame = fields[name]
+            positions = pd.DatetimeIndex(frame.index).get_indexer(dates)
+            missing = positions < 0
+            array = np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+", dtype=dtype,
+                                              shape=(len(dates), len(tickers)), fortran_order=True)
+            for i, ticker in enumerate(tickers):
+                if ticker not in frame.columns:
+                    array[:, i] = np.nan
+                    continue
+                array[:, i] = frame[ticker].to_numpy()[positions]
+                array[missing, i] = np.nan
+            array.flush()
+            del array
+
+        with open(os.path.join(path, cls.INDEX_FILE), "w") as f:
+            json.dump({"tickers": tickers, "fields": names, "currencies": currencies or {}}, f)
+        return cls(path)
+
+    def field(self, name) -> np.ndarray:
+        """
+        Read-only memory map of a whole field.
+        """
+        if name not in self.fields:
+            raise ValueError(f"Unknown field: {name}")
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+        return self._arrays[name]
+
+    def rows(self, start=None, end=None) -> slice:
+        """
+        Row range of the dates within [start, end).
+        """
+        lo = 0 if start is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = len(self.dates) if end is None else np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end)), side="left")
+        return slice(int(lo), int(hi))
+
+    def columns_of(self, tickers) -> np.ndarray:
+        missing = [t for t in tickers if t not in self._column_of]
+        if missing:
+            raise KeyError(f"Unknown tickers: {missing}")
+        return np.array([self._column_of[t] for t in tickers], dtype=np.int64)
+
+    def block(self, tickers=None, start=None, end=None, field="close") -> np.ndarray:
+        """
+        (dates × tickers) values of a field.
+
+        Row ranges and runs of adjacent columns are zero-copy views of the
+        map; any other selection gathers only the requested columns.
+        """
+        array = self.field(field)
+        rows = self.rows(start, end)
+        if tickers is None:
+            return array[rows]
+        columns = self.columns_of(tickers)
+        if len(columns) and np.array_equal(columns, np.arange(columns[0], columns[0] + len(columns))):
+            return array[rows, columns[0]:columns[0] + len(columns)]
+        return array[rows][:, columns]
+
+    def market_data(self, tickers=None, start=None, end=None, field="close") -> MarketData:
+        """
+        Selected columns and rows as a MarketData block, in the stored dtype.
+        """
+        values = self.block(tickers, start, end, field)
+        tickers = self.tickers if tickers is None else list(tickers)
+        return MarketData(values, tickers, self.dates[self.rows(start, end)], dtype=values.dtype)
+
+
+class MmapProvider(BaseProvider):
+    """
+    Provider serving prices, currencies and dividends from an MmapStore.
+    """
+
+    def __init__(self, store: MmapStore):
+        self.store = store
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Stored closes, served as recorded whether or not `adjusted` is asked.
+        """
+        known = [t for t in tickers if t in self.store.tickers]
+        frame = self.store.market_data(known, start_date, end_date).to_frame()
+        return frame.reindex(columns=list(tickers)).astype(float)
+
+    def get_currency(self, ticker):
+        if ticker not in self.store.currencies:
+            raise ValueError(f"No currency available for ticker: {ticker}")
+        return self.store.currencies[ticker]
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        if "dividends" not in self.store.fields or ticker not in self.store.tickers:
+            return pd.Series(dtype=float)
+        cash = self.store.market_data([ticker], start_date, end_date, field="dividends")[ticker]
+        return cash[cash.fillna(0) != 0].astype(float)
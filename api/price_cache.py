@@ -0,0 +1,220 @@
+import json
+import os
+import threading
+from datetime import date, datetime
+from urllib.parse import quote
+
+import pandas as pd
+
+from api.config import PRICE_CACHE_DIR, PRICE_CACHE_MAX_AGE, PRICE_CACHE_MAX_ENTRIES
+from api.providers import YahooProvider
+from src.profiling import TRACER
+
+
+class PriceCache:
+    """
+    On-disk Parquet store of close prices with incremental refresh.
+
+    Each ticker is stored in its own Parquet file together with the date range
+    it covers. A request only fetches the date gaps that are not yet covered,
+    merges them into the stored history and serves warm requests without
+    calling the provider at all.
+
+    The cache can be shared by threads (sessions, batch loaders): the
+    coverage index and the files are read and written under a lock, while
+    provider calls run outside it.
+
+    Attributes
+    ----------
+    provider : BaseProvider
+        Source used to fill missing date gaps (Yahoo Finance by default).
+    cache_dir : str
+        Directory holding the Parquet files and the coverage index.
+    max_age : datetime.timedelta or None
+        Entries fetched longer ago than this have their last stored row and
+        everything after it re-fetched. None disables staleness checks.
+    max_entries : int or None
+        Maximum number of tickers kept on disk; least recently used tickers
+        are evicted first. None disables eviction.
+    hits, misses : int
+        Tickers served from disk alone / needing a provider call.
+
+    Methods
+    -------
+    get_prices(tickers, start_date, end_date)
+        Returns a DataFrame indexed by date with one column per ticker.
+    evict()
+        Removes least recently used tickers beyond `max_entries`.
+    clear()
+        Removes every cached ticker.
+    """
+
+    INDEX_FILE = "_index.json"
+    # Suffix of the entries holding unadjusted closes, stored apart from the adjusted ones
+    UNADJUSTED_SUFFIX = "@unadjusted"
+
+    def __init__(self, provider=None, cache_dir=PRICE_CACHE_DIR, max_age=PRICE_CACHE_MAX_AGE,
+                 max_entries=PRICE_CACHE_MAX_ENTRIES):
+        self.provider = provider or YahooProvider()
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.max_entries = max_entries
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Serve close prices for `tickers` over [start_date, end_date),
+        adjusted for dividends or not (the two are cached separately).
+
+        Open-ended requests cannot be checked against the stored coverage and
+        are passed straight to the provider.
+        """
+        if start_date is None or end_date is None:
+            return self.provider.get_prices(tickers, start_date, end_date, adjusted=adjusted)
+        keys = {ticker: ticker if adjusted else ticker + self.UNADJUSTED_SUFFIX for ticker in tickers}
+
+        start = pd.Timestamp(start_date).normalize()
+        end = pd.Timestamp(end_date).normalize()
+        # Dates from today onwards may not have a final close yet
+        covered_end = min(end, pd.Timestamp(date.today()))
+
+        # Group tickers sharing the same missing gap so each gap is one provider call
+        gaps = {}
+        with self._lock:
+            for ticker in tickers:
+                for gap in self._missing_gaps(keys[ticker], start, end):
+                    gaps.setdefault(gap, []).append(ticker)
+
+            missing = len(set().union(*gaps.values())) if gaps else 0
+            self.hits += len(tickers) - missing
+            self.misses += missing
+        TRACER.annotate(cache_hits=len(tickers) - missing, cache_misses=missing)
+
+        fetched = {}
+        for (gap_start, gap_end), gap_tickers in gaps.items():
+            frame = self.provider.get_prices(gap_tickers, gap_start.date(), gap_end.date(), adjusted=adjusted)
+            for ticker in gap_tickers:
+                if ticker in frame.columns and frame[ticker].notna().any():
+                    fetched.setdefault(ticker, []).append(frame[ticker])
+
+        # Only tickers that returned data extend their coverage; failed ones stay gaps
+        now = datetime.now().isoformat()
+        with self._lock:
+            for ticker in tickers:
+                if ticker in fetched:
+                    self._merge(keys[ticker], fetched[ticker], start, covered_end, now)
+                if keys[ticker] in self.index:
+                    self.index[keys[ticker]]["last_access"] = now
+
+            df = pd.DataFrame({ticker: self._read(keys[ticker]) for ticker in tickers})
+            self.evict()
+            self._save_index()
+        df = df.loc[(df.index >= start) & (df.index < end)]
+        df.index.name = "Date"
+        return df
+
+    def evict(self):
+        """
+        Removes least recently used tickers beyond `max_entries`.
+        """
+        with self._lock:
+            if self.max_entries is None or len(self.index) <= self.max_entries:
+                return
+
+            by_access = sorted(self.index, key=lambda t: self.index[t]["last_access"])
+            for ticker in by_access[:len(self.index) - self.max_entries]:
+                self._remove(ticker)
+            self._save_index()
+
+    def clear(self):
+        """
+        Removes every cached ticker.
+        """
+        with self._lock:
+            for ticker in list(self.index):
+                self._remove(ticker)
+            self._save_index()
+
+    def _missing_gaps(self, ticker, start, end):
+        """
+        Returns the [gap_start, gap_end) ranges of the request not covered on disk.
+        """
+        entry = self.index.get(ticker)
+        # Entries without a stored close never returned data: fetch them again in full
+        if entry is None or not entry.get("last_date") or not os.path.exists(self._path(ticker)):
+            return [(start, end)]
+
+        cov_start = pd.Timestamp(entry["start"])
+        cov_end = pd.Timestamp(entry["end"])
+
+        # Stale entries re-fetch from their last stored row to refresh revised closes
+        if self.max_age is not None:
+            age = datetime.now() - datetime.fromisoformat(entry["fetched_at"])
+            if age > self.max_age:
+                cov_end = min(cov_end, pd.Timestamp(entry["last_date"]))
+
+        # Gaps always extend up to the stored range so coverage stays contiguous
+        gaps = []
+        if start < cov_start:
+            gaps.append((start, cov_start))
+        if end > cov_end:
+            gaps.append((cov_end, end))
+        return gaps
+
+    def _merge(self, ticker, pieces, start, covered_end, fetched_at):
+        """
+        Merges fetched pieces into the stored history, new values taking precedence.
+        """
+        stored = self._read(ticker)
+        new = [p.dropna() for p in pieces]
+        history = pd.concat([stored] + new) if new else stored
+        history = history[~history.index.duplicated(keep="last")].sort_index().astype(float)
+        history.name = "Close"
+
+        path = self._path(ticker)
+        history.to_frame().to_parquet(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+        entry = self.index.get(ticker)
+        cov_start = start if entry is None else min(start, pd.Timestamp(entry["start"]))
+        cov_end = covered_end if entry is None else max(covered_end, pd.Timestamp(entry["end"]))
+        self.index[ticker] = {
+            "start": cov_start.date().isoformat(),
+            "end": cov_end.date().isoformat(),
+            "last_date": history.index.max().date().isoformat() if len(history) else None,
+            "fetched_at": fetched_at,
+            "last_access": fetched_at,
+        }
+
+    def _read(self, ticker):
+        path = self._path(ticker)
+        if ticker not in self.index or not os.path.exists(path):
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([], name="Date"), name="Close")
+        return pd.read_parquet(path)["Close"]
+
+    def _remove(self, ticker):
+        path = self._path(ticker)
+        if os.path.exists(path):
+            os.remove(path)
+        self.index.pop(ticker, None)
+
+    def _path(self, ticker):
+        # Tickers such as '^GSPC' or 'EURUSD=X' are not safe file names as is
+        return os.path.join(self.cache_dir, quote(ticker, safe="") + ".parquet")
+
+    def _load_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(path + ".tmp", path)
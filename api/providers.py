@@ -0,0 +1,202 @@
+import time
+from abc import ABC, abstractmethod
+
+import numpy as np
+import pandas as pd
+
+from src.profiling import PROFILER
+
+
+class BaseProvider(ABC):
+    """
+    Abstract source of historical market data.
+
+    Each subclass must implement `get_prices()`, which returns close prices
+    for a list of tickers as a DataFrame indexed by date with one column per
+    ticker. Tickers that cannot be served are returned as all-NaN columns.
+    Closes are adjusted for dividends by default; `adjusted=False` asks for
+    the closes actually traded, to be combined with `get_dividends()` cash
+    amounts (the total return types) without counting dividends twice.
+    `get_currency()` and `get_dividends()` work on a single ticker and raise
+    on failure so that batch callers can report errors per ticker.
+    """
+
+    @abstractmethod
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Fetch close prices for `tickers` over [start_date, end_date),
+        dividend-adjusted unless `adjusted` is False.
+        """
+        pass
+
+    @abstractmethod
+    def get_currency(self, ticker):
+        """
+        Fetch the trading currency code of `ticker` (e.g. 'USD').
+        """
+        pass
+
+    @abstractmethod
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        """
+        Fetch cash dividends per share of `ticker` as a Series indexed by ex-date.
+        """
+        pass
+
+
+class YahooProvider(BaseProvider):
+    """
+    Provider downloading close prices from Yahoo Finance.
+    """
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Downloads close price data for all tickers over the specified date
+        range, adjusted for dividends and splits unless `adjusted` is False
+        (then split-adjusted only).
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexed by date, columns are tickers with their close prices.
+        """
+        data = _yfinance().download(
+            tickers=tickers,
+            start=start_date,
+            end=end_date,
+            progress=False,
+            group_by='ticker',
+            auto_adjust=adjusted
+        )
+
+        # If only one ticker, yfinance returns a DataFrame with no ticker level, fix that:
+        if len(tickers) == 1:
+            df = data[["Close"]].rename(columns={"Close": tickers[0]})
+        else:
+            # For multiple tickers, data is multi-level columns: ticker / OHLCV
+            # Extract the 'Close' column (the adjusted close when auto_adjust=True)
+            # All columns are taken in one selection; tickers missing in data (delisted
+            # or invalid) come back as float NaN columns from the reindex
+            close = data.loc[:, data.columns.get_level_values(1) == "Close"]
+            close.columns = close.columns.get_level_values(0)
+            df = close.reindex(columns=tickers).astype(float)
+
+        df.index = pd.to_datetime(df.index)
+        df.index.name = "Date"
+        df.sort_index(inplace=True)
+        return df
+
+    def get_currency(self, ticker):
+        currency = _yfinance().Ticker(ticker).fast_info.get("currency")
+        if currency is None:
+            raise ValueError(f"No currency available for ticker: {ticker}")
+        return currency
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        dividends = _yfinance().Ticker(ticker).dividends
+        dividends.index = pd.to_datetime(dividends.index).tz_localize(None).normalize()
+        return _slice_dates(dividends, start_date, end_date)
+
+
+class LocalProvider(BaseProvider):
+    """
+    Offline provider serving prices from a local fixture.
+
+    Attributes:
+        source (pd.DataFrame or str): Wide price frame indexed by date, or the
+            path to a CSV/Parquet file holding one (first column is the date).
+        currencies (dict): Ticker to currency code; missing tickers raise.
+        dividends (pd.DataFrame): Wide frame of cash dividends per share,
+            indexed by ex-date. Tickers absent from it pay no dividends. The
+            fixture closes are unadjusted; adjusted closes are derived from
+            them and these dividends as Yahoo Finance does.
+        latency (float): Seconds slept per call, to mimic network round trips
+            in benchmarks.
+
+    Example:
+        LocalProvider("tests/fixtures/prices.parquet", currencies={"AAPL": "USD"})
+    """
+
+    def __init__(self, source, currencies=None, dividends=None, latency=0.0):
+        if isinstance(source, pd.DataFrame):
+            frame = source.copy()
+        elif str(source).endswith(".parquet"):
+            frame = pd.read_parquet(source)
+        else:
+            frame = pd.read_csv(source, index_col=0)
+
+        frame.index = pd.to_datetime(frame.index)
+        frame.index.name = "Date"
+        self.frame = frame.sort_index()
+        self.currencies = currencies or {}
+        self.dividends = dividends
+        self.latency = latency
+        self.calls = []
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        """
+        Slice the fixture to [start_date, end_date); unknown tickers are NaN.
+        """
+        self._record("prices", tuple(tickers), start_date, end_date, adjusted)
+        frame = _slice_dates(self._adjusted() if adjusted else self.frame, start_date, end_date)
+        return frame.reindex(columns=list(tickers)).astype(float)
+
+    def get_currency(self, ticker):
+        self._record("currency", ticker)
+        if ticker not in self.currencies:
+            raise ValueError(f"No currency available for ticker: {ticker}")
+        return self.currencies[ticker]
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        self._record("dividends", ticker, start_date, end_date)
+        if self.dividends is None or ticker not in self.dividends.columns:
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([]), name=ticker)
+        dividends = self.dividends[ticker]
+        return _slice_dates(dividends[dividends.fillna(0) != 0], start_date, end_date)
+
+    def _adjusted(self):
+        """
+        Fixture closes scaled down before each ex-date by 1 - dividend /
+        previous close, so the dividend is part of the price return.
+        """
+        if self.dividends is None:
+            return self.frame
+        closes = self.frame.to_numpy(dtype=float)
+        cash = self.dividends.reindex(columns=self.frame.columns).fillna(0.0)
+        rows = self.frame.index.searchsorted(pd.DatetimeIndex(cash.index), side="left")
+        keep = (rows >= 1) & (rows < len(closes))
+        amounts = np.zeros(closes.shape)
+        np.add.at(amounts, rows[keep], cash.to_numpy(dtype=float)[keep])
+
+        previous = pd.DataFrame(closes).ffill().shift(1).to_numpy()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            factors = np.where(amounts != 0, 1 - amounts / previous, 1.0)
+        factors = np.nan_to_num(factors, nan=1.0)
+        # Each close carries the factors of every later ex-date
+        later = np.ones(closes.shape)
+        later[:-1] = np.cumprod(factors[::-1], axis=0)[::-1][1:]
+        return pd.DataFrame(closes * later, index=self.frame.index, columns=self.frame.columns)
+
+    def _record(self, *call):
+        self.calls.append(call)
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def _slice_dates(obj, start_date=None, end_date=None):
+    """
+    Restricts a date-indexed Series or DataFrame to [start_date, end_date).
+    """
+    mask = pd.Series(True, index=obj.index)
+    if start_date is not None:
+        mask &= obj.index >= pd.Timestamp(start_date)
+    if end_date is not None:
+        mask &= obj.index < pd.Timestamp(end_date)
+    return obj.loc[mask.values]
+
+
+def _yfinance():
+    """
+    yfinance, imported on the first Yahoo Finance request rather than at startup.
+    """
+    return PROFILER.load("yfinance")
@@ -1,8 +1,11 @@
-import yfinance as yf
-
-import yfinance as yf
+import numpy as np
 import pandas as pd
 
+from api.batch_fetcher import BatchFetcher
+from api.market_data import MarketData
+from api.providers import YahooProvider
+from src.profiling import TRACER
+
 class YahooFinance:
     """
     A class to fetch historical price data for a list of tickers from Yahoo Finance.
@@ -19,12 +22,30 @@ class YahooFinance:
         Start date for historical data in 'YYYY-MM-DD' format.
     end_period : str or None
         End date for historical data in 'YYYY-MM-DD' format.
+    adjusted : bool
+        Dividend-adjusted closes (default), or the traded closes when the
+        caller adds the cash dividends of `get_dividends` itself.
+    provider : BaseProvider
+        Source of price data, Yahoo Finance unless another provider is given.
+    cache : PriceCache or None
+        Optional on-disk price cache; when set, prices are served through it.
+    fetcher : BatchFetcher
+        Concurrent front for `provider`, shared by every call of this instance
+        so each ticker is fetched at most once per simulation.
 
     Methods
     -------
     get_data()
         Fetches adjusted close price data for all relevant tickers and returns
         a DataFrame indexed by date with tickers as columns.
+    get_market_data(dtype)
+        Same prices as a compact MarketData block.
+    get_currency()
+        Fetches the trading currency of every ticker.
+    get_dividends()
+        Fetches cash dividends of the component tickers.
+    get_fx_data(fx_tickers)
+        Fetches FX closes over the same date range.
     """
 
     def __init__(self, **args):
@@ -33,6 +54,12 @@ class YahooFinance:
         self.benchmark_ticker = args.get("benchmark_ticker", None)
         self.start_date = args.get("start_date", None)
         self.end_date = args.get("end_date", None)
+        self.adjusted = args.get("adjusted", True)
+        self.provider = args.get("provider", None) or YahooProvider()
+        self.cache = args.get("cache", None)
+        self.fetcher = args.get("fetcher", None) or BatchFetcher(self.provider)
+        self.currency_errors = {}
+        self.dividend_errors = {}
         self.final_tickers = []
         self._process_inputs()
 
@@ -57,49 +84,77 @@ class YahooFinance:
         if len(self.final_tickers) == 0:
             raise ValueError("No valid tickers found to download.")
     
+    @TRACER.trace("fetch.prices")
     def get_data(self):
         """
-        Downloads adjusted close price data for all tickers over the specified date range.
+        Fetches close price data for all tickers over the specified date range,
+        through the price cache when one is configured.
 
         Returns
         -------
         pd.DataFrame
             DataFrame indexed by date, columns are tickers with their adjusted close prices.
         """
-        
-
-        data = yf.download(
-            tickers=self.final_tickers,
-            start=self.start_date,
-            end=self.end_date,
-            progress=False,
-            group_by='ticker',
-            auto_adjust=True
-        )
-
-        # If only one ticker, yfinance returns a DataFrame with no ticker level, fix that:
-        if len(self.final_tickers) == 1:
-            df = data[["Close"]].rename(columns={"Close": self.final_tickers[0]})
-        else:
-            # For multiple tickers, data is multi-level columns: ticker / OHLCV
-            # Extract Adjusted Close by taking 'Close' column (auto_adjust=True so Close = Adjusted Close)
-            df = pd.DataFrame()
-            for ticker in self.final_tickers:
-                if ticker in data.columns.get_level_values(0):
-                    df[ticker] = data[ticker]["Close"]
-                else:
-                    # If ticker missing in data (delisted or invalid), fill with NaN
-                    df[ticker] = pd.NA
+        source = self.cache if self.cache is not None else self.fetcher
+        df = source.get_prices(self.final_tickers, self.start_date, self.end_date, adjusted=self.adjusted)
 
         df.index = pd.to_datetime(df.index)
         df.sort_index(inplace=True)
         return df
     
     
+    def get_market_data(self, dtype=np.float64):
+        """
+        Fetches the same prices as `get_data` as a compact MarketData block
+        (float32 storage with `dtype=np.float32`).
+        """
+        return MarketData.from_frame(self.get_data(), dtype=dtype)
+
+    @TRACER.trace("fetch.fx")
+    def get_fx_data(self, fx_tickers):
+        """
+        Fetches closes of `fx_tickers` (e.g. 'USDEUR=X') over the same date
+        range as `get_data`, through the price cache when one is configured.
+        """
+        if not fx_tickers:
+            return pd.DataFrame()
+        source = self.cache if self.cache is not None else self.fetcher
+        df = source.get_prices(list(fx_tickers), self.start_date, self.end_date)
+        df.index = pd.to_datetime(df.index)
+        return df.sort_index()
+
+    @TRACER.trace("fetch.currencies")
     def get_currency(self):
-        result = []
-        for ticker in self.final_tickers:
-            try:
-                result.append(yf.Ticker(ticker).fast_info.get("currency"))
-            except Exception as e:
-                return None
\ No newline at end of file
+        """
+        Fetches the trading currency of every ticker concurrently.
+
+        Tickers whose currency could not be fetched are returned as None and
+        their errors kept in `currency_errors` instead of failing the batch.
+
+        Returns
+        -------
+        list of str or None
+            Currency codes in the order of `final_tickers`.
+        """
+        report = self.fetcher.fetch_currencies(self.final_tickers)
+        self.currency_errors = report.errors
+        return [report.values.get(ticker) for ticker in self.final_tickers]
+
+    @TRACER.trace("fetch.dividends")
+    def get_dividends(self):
+        """
+        Fetches cash dividends per share of the component tickers concurrently.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame indexed by ex-date, columns are tickers with their cash
+            dividends (0 when no dividend was paid that day).
+        """
+        tickers = [comp["ticker"] for comp in self.components if comp.get("ticker")]
+        report = self.fetcher.fetch_dividends(tickers, self.start_date, self.end_date)
+        self.dividend_errors = report.errors
+
+        df = pd.DataFrame({ticker: report.values.get(ticker, pd.Series(dtype=float)) for ticker in tickers})
+        df.index = pd.to_datetime(df.index)
+        return df.sort_index().fillna(0.0)
@@ -1,5 +1,11 @@
 import streamlit as st
 
+from src.profiling import PROFILER, TRACER
+from src.displayer.display_factory import DisplayFactory
+
+PROFILER.start_run()
+TRACER.start_run("app")
+
 pages = {
     "Simulation": [
         st.Page("pages/simulation.py", title="Simulation", icon=":material/monitoring:"),
@@ -18,3 +24,9 @@ pg = st.navigation(pages)
 st.logo("static/img/bank_logo.png", icon_image="static/img/bank_logo.png")
 
 pg.run()
+PROFILER.end_run()
+trace = TRACER.end_run()
+
+# --- Debug panel: startup, rerun and lazy import timings, stage traces ---
+if st.sidebar.checkbox("Show timings"):
+    DisplayFactory(display="DISPLAY_PROFILING", profiler=PROFILER, tracer=TRACER, run=trace).render()
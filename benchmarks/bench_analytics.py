@@ -0,0 +1,80 @@
+"""
+Index vs benchmark analytics from shared prefix sums against metric-by-metric pandas calls.
+
+Usage:
+    python -m benchmarks.bench_analytics --dates 5000 --window 63
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.compute.analytics import TRADING_DAYS, PerformanceAnalytics
+
+
+def pandas_analytics(index, benchmark, live_start, window):
+    """
+    The same statistics, each metric and period computed on its own slice.
+    """
+    returns = pd.DataFrame({"index": index, "benchmark": benchmark}).pct_change()
+    live = index.index.searchsorted(live_start)
+    rows = {}
+    for name, period in {"Full": slice(1, None), "Backtest": slice(1, live), "Live": slice(live, None)}.items():
+        x, y = returns["index"].iloc[period], returns["benchmark"].iloc[period]
+        rows[name] = {
+            "volatility": x.std() * np.sqrt(TRADING_DAYS) * 100,
+            "sharpe": x.mean() * TRADING_DAYS / (x.std() * np.sqrt(TRADING_DAYS)),
+            "tracking_error": (x - y).std() * np.sqrt(TRADING_DAYS) * 100,
+            "beta": x.cov(y) / y.var(),
+            "correlation": x.corr(y),
+        }
+    x, y = returns["index"], returns["benchmark"]
+    rolling = pd.DataFrame({
+        "volatility": x.rolling(window).std() * np.sqrt(TRADING_DAYS) * 100,
+        "tracking_error": (x - y).rolling(window).std() * np.sqrt(TRADING_DAYS) * 100,
+        "beta": x.rolling(window).cov(y) / y.rolling(window).var(),
+    })
+    return pd.DataFrame(rows).T, rolling.iloc[window:]
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dates", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=63)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2005-01-03", periods=args.dates)
+    market = rng.normal(0.0003, 0.011, args.dates)
+    benchmark = pd.Series(100 * np.exp(np.cumsum(market)), index=dates)
+    index = pd.Series(100 * np.exp(np.cumsum(0.8 * market + rng.normal(0.0001, 0.004, args.dates))), index=dates)
+    live_start = dates[args.dates * 3 // 4]
+
+    analytics = PerformanceAnalytics(index, dates, benchmark, live_start=live_start, window=args.window)
+    engine_time, result = best_of(analytics.compute, args.repeat)
+    pandas_time, (summary, rolling) = best_of(
+        lambda: pandas_analytics(index, benchmark, live_start, args.window), args.repeat)
+
+    columns = list(summary.columns)
+    summary_error = np.nanmax(np.abs(result["summary"][columns].to_numpy(dtype=float) - summary.to_numpy()))
+    rolling_error = np.nanmax(np.abs(result["rolling"][list(rolling.columns)].to_numpy() - rolling.to_numpy()))
+    print(f"dates={args.dates} window={args.window}")
+    print(f"  pandas per metric : {pandas_time * 1e3:8.2f} ms")
+    print(f"  PerformanceAnalytics: {engine_time * 1e3:6.2f} ms ({pandas_time / engine_time:.1f}x, "
+          f"also drawdowns, CAGR and benchmark statistics)")
+    print(f"  max |diff| summary = {summary_error:.1e}  rolling = {rolling_error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
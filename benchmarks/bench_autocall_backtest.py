@@ -0,0 +1,84 @@
+"""
+Autocall backtest over every launch date against a launch-by-launch Python loop.
+
+Usage:
+    python -m benchmarks.bench_autocall_backtest --dates 5000 --assets 3 --maturity 5
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.compute.autocall_backtest import AutocallBacktest
+
+
+def loop_payoffs(backtest):
+    """
+    Payoff of each launch, one launch and one observation at a time.
+    """
+    prices = backtest.prices.to_numpy()
+    window = backtest.n_observations * backtest.step
+    observation = np.arange(1, backtest.n_observations + 1) * backtest.step - 1
+    payoffs = np.empty(len(prices) - window)
+    for launch in range(len(payoffs)):
+        path = prices[launch + 1:launch + window + 1] / prices[launch]
+        basket = path.max(axis=1) if backtest.option_type == "Best of" else path.min(axis=1)
+        observed = basket[observation]
+        lowest = {"European": observed[-1], "American": observed.min(), "Continuous": basket.min()}
+        knocked_in = lowest[backtest.barrier_type] < backtest.redemption_barrier
+
+        coupons, missed, redemption = 0.0, 0, None
+        for k, performance in enumerate(observed):
+            if performance >= min(backtest.coupon_barrier, backtest.autocall_barrier):
+                coupons += backtest.coupon * (missed + 1 if backtest.effet_memoire else 1)
+                missed = 0
+            else:
+                missed += 1
+            if k < backtest.n_observations - 1 and performance >= backtest.autocall_barrier:
+                redemption = 1.0
+                break
+        if redemption is None:
+            redemption = min(observed[-1], 1.0) if knocked_in else 1.0
+            if backtest.capital_guaranteed:
+                redemption = max(redemption, 1.0)
+        payoffs[launch] = coupons + redemption
+    return payoffs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dates", type=int, default=5000)
+    parser.add_argument("--assets", type=int, default=3)
+    parser.add_argument("--maturity", type=float, default=5.0)
+    parser.add_argument("--frequency", default="Quarterly")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2005-01-03", periods=args.dates)
+    returns = rng.normal(0.0002, 0.012, (args.dates, args.assets))
+    prices = pd.DataFrame(100 * np.exp(np.cumsum(returns, axis=0)), index=dates)
+
+    for option_type in ("Worst of", "Best of"):
+        for barrier_type in ("European", "American", "Continuous"):
+            backtest = AutocallBacktest(prices, autocall_barrier=100, redemption_barrier=60, coupon=8,
+                                        coupon_barrier=70, maturity_years=args.maturity,
+                                        observation_frequency=args.frequency, effet_memoire=True,
+                                        barrier_type=barrier_type, option_type=option_type)
+            elapsed = min(backtest.run()["elapsed"] for _ in range(args.repeat))
+            result = backtest.run()
+
+            start = time.perf_counter()
+            reference = loop_payoffs(backtest)
+            loop = time.perf_counter() - start
+
+            launches = result["summary"]["launches"]
+            error = np.max(np.abs(result["launches"]["payoff"].to_numpy() / 100 - reference))
+            print(f"{option_type:<8} {barrier_type:<10} launches={launches}  "
+                  f"vectorized {elapsed:7.4f} s ({launches / elapsed:12,.0f} launches/s)  "
+                  f"loop {loop:7.3f} s ({loop / elapsed:5.0f}x)  max |diff| = {error:.1e}")
+
+
+if __name__ == "__main__":
+    main()
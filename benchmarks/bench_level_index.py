@@ -0,0 +1,175 @@
+"""
+Throughput and peak memory of LevelIndex and data loading, with a JSON baseline.
+
+Times `LevelIndex.compute` for every return type, both volatility-targeting
+methods, `_aggregate_dividends`, and `YahooFinance.get_data` (Yahoo reshaping
+served by a local `yf.download` stub) on synthetic frames of several sizes.
+
+The recorded baseline (benchmarks/baseline.json, small scale) is committed;
+comparing against a missing baseline fails rather than passing silently.
+
+Usage:
+    python -m benchmarks.bench_level_index --save          # record the baseline
+    python -m benchmarks.bench_level_index                 # compare, exit 1 on regression or missing baseline
+    python -m benchmarks.bench_level_index --scale full --threshold 0.3
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from unittest import mock
+
+import numpy as np
+
+from api.providers import YahooProvider
+from api.yahoo_finance import YahooFinance
+from benchmarks.synthetic import RATE_TICKER, synthetic_market_data, yfinance_download_stub
+from src.compute.level_index import LevelIndex
+from src.compute.level_index_batch import RETURN_TYPES
+
+# (components, dates) grids of each scale
+SCALES = {
+    "small": [(10, 1_000), (100, 5_000)],
+    "full": [(10, 1_000), (100, 10_000), (500, 50_000)],
+}
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def level_index_params(tickers, return_type="Price Return", vol_method=None):
+    weight = 100 / len(tickers)
+    params = {
+        "components": [{"ticker": t, "weight": weight} for t in tickers],
+        "return_type": return_type,
+        "excess_return_benchmark": RATE_TICKER,
+        "withholding_rate": 15.0,
+        "synthetic_dividend_level": 2.0,
+    }
+    if vol_method:
+        params.update({"use_vol_target": True, "target_vol": 10.0, "vol_window": 60, "vol_method": vol_method})
+    return params
+
+
+def cases(n_components, n_dates):
+    """
+    Benchmark cases of one grid size as (name, callable) pairs.
+    """
+    data = synthetic_market_data(n_dates, n_components)
+    tickers = [f"T{i}" for i in range(n_components)]
+
+    for return_type in RETURN_TYPES:
+        params = level_index_params(tickers, return_type)
+        yield f"compute[{return_type}]", lambda p=params: LevelIndex(data, p).compute()
+
+    returns = LevelIndex(data, level_index_params(tickers)).compute()["index_value"].pct_change().fillna(0)
+    for method in ("Historical", "Exponential"):
+        index = LevelIndex(data, level_index_params(tickers, vol_method=method))
+        yield f"vol_target[{method}]", lambda i=index: i._apply_volatility_targeting(returns)
+
+    # Fresh instance per run: the dividend schedule is built on first use
+    params = level_index_params(tickers, "Net Total Return")
+    yield "aggregate_dividends", lambda: LevelIndex(data, params)._aggregate_dividends(gross=False, withholding=0.15)
+
+    prices = data[tickers]
+    start, end = prices.index[0].date(), (prices.index[-1] + np.timedelta64(1, "D")).date()
+
+    def get_data():
+        with mock.patch("yfinance.download", yfinance_download_stub(prices)):
+            market_data = YahooFinance(components=[{"ticker": t} for t in tickers], start_date=start, end_date=end,
+                                       provider=YahooProvider())
+            market_data.get_data()
+            market_data.fetcher.shutdown()
+
+    yield "get_data", get_data
+
+
+def measure(func, repeat):
+    """
+    Best wall time over `repeat` runs, then the tracemalloc peak of one more run
+    (traced separately so tracing does not skew the timings).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def run(scale, repeat):
+    results = {}
+    for n_components, n_dates in SCALES[scale]:
+        for name, func in cases(n_components, n_dates):
+            seconds, peak = measure(func, repeat)
+            key = f"{name}/{n_components}x{n_dates}"
+            results[key] = {
+                "seconds": seconds,
+                "rows_per_second": n_dates / seconds,
+                "peak_mb": peak / 2 ** 20,
+            }
+            print(f"{key:55s} {seconds * 1e3:10.2f} ms {n_dates / seconds:14,.0f} rows/s {peak / 2 ** 20:9.1f} MB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Regressions against `baseline`: throughput below (1 - threshold) or peak
+    memory above (1 + threshold) times the recorded value.
+    """
+    regressions = []
+    for key, current in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        if current["rows_per_second"] < reference["rows_per_second"] * (1 - threshold):
+            regressions.append(f"{key}: throughput {current['rows_per_second']:,.0f} rows/s "
+                               f"vs baseline {reference['rows_per_second']:,.0f}")
+        if current["peak_mb"] > reference["peak_mb"] * (1 + threshold):
+            regressions.append(f"{key}: peak memory {current['peak_mb']:.1f} MB vs baseline {reference['peak_mb']:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (best kept)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Record the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Tolerated relative regression before failing (default 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.scale, args.repeat)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results},
+                      f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save first.")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
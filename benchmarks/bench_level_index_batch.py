@@ -0,0 +1,63 @@
+"""
+Throughput of LevelIndexBatch against a loop of LevelIndex.compute calls.
+
+Usage:
+    python -m benchmarks.bench_level_index_batch --scenarios 2000 --dates 5000 --components 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import synthetic_prices
+from src.compute.level_index import LevelIndex
+from src.compute.level_index_batch import LevelIndexBatch
+
+
+def synthetic_scenarios(tickers, n_scenarios, seed=1):
+    rng = np.random.default_rng(seed)
+    weights = rng.dirichlet(np.ones(len(tickers)), n_scenarios) * 100
+    return [
+        {
+            "components": [{"ticker": t, "weight": w} for t, w in zip(tickers, row)],
+            "return_type": "Price Return",
+            "use_vol_target": bool(i % 2),
+            "target_vol": float(rng.uniform(5, 20)),
+            "vol_window": int(rng.choice([20, 60, 120])),
+            "vol_method": "Historical" if i % 4 < 2 else "Exponential",
+        }
+        for i, row in enumerate(weights)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--dates", type=int, default=5000)
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument("--loop-sample", type=int, default=20,
+                        help="Number of scenarios timed with the per-scenario loop")
+    args = parser.parse_args(argv)
+
+    data = synthetic_prices(args.dates, args.components)
+    scenarios = synthetic_scenarios(list(data.columns), args.scenarios)
+
+    start = time.perf_counter()
+    LevelIndexBatch.from_params(data, scenarios).compute()
+    batch_time = time.perf_counter() - start
+
+    sample = scenarios[:args.loop_sample]
+    start = time.perf_counter()
+    for params in sample:
+        LevelIndex(data, params).compute()
+    loop_time = (time.perf_counter() - start) * args.scenarios / len(sample)
+
+    cells = args.scenarios * args.dates
+    print(f"scenarios={args.scenarios} dates={args.dates} components={args.components}")
+    print(f"batch : {batch_time:8.3f} s  {cells / batch_time:14,.0f} scenario-rows/s")
+    print(f"loop  : {loop_time:8.3f} s  {cells / loop_time:14,.0f} scenario-rows/s (extrapolated)")
+    print(f"speedup: {loop_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
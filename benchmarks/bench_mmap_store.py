@@ -0,0 +1,60 @@
+"""
+Open and slice times of the memory-mapped store against loading a full Parquet universe.
+
+Usage:
+    python -m benchmarks.bench_mmap_store --tickers 3000 --dates 8000 --basket 50
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from api.mmap_store import MmapStore
+from benchmarks.synthetic import synthetic_prices
+from src.compute.level_index import LevelIndex
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=3000)
+    parser.add_argument("--dates", type=int, default=8000)
+    parser.add_argument("--basket", type=int, default=50, help="Components of the backtested basket")
+    args = parser.parse_args(argv)
+
+    prices = synthetic_prices(args.dates, args.tickers).astype(np.float32)
+    basket = list(np.random.default_rng(0).choice(prices.columns, args.basket, replace=False))
+    params = {"components": [{"ticker": t, "weight": 100 / args.basket} for t in basket],
+              "return_type": "Price Return"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        parquet = os.path.join(directory, "prices.parquet")
+        prices.to_parquet(parquet)
+        MmapStore.create(os.path.join(directory, "store"), {"close": prices})
+        del prices
+
+        start = time.perf_counter()
+        frame = pd.read_parquet(parquet)
+        LevelIndex(frame, params).compute()
+        parquet_time = time.perf_counter() - start
+        del frame
+
+        start = time.perf_counter()
+        store = MmapStore(os.path.join(directory, "store"))
+        open_time = time.perf_counter() - start
+        data = store.market_data(basket)
+        slice_time = time.perf_counter() - start - open_time
+        LevelIndex(data, params).compute()
+        mmap_time = time.perf_counter() - start
+
+    print(f"universe={args.tickers} tickers x {args.dates} dates, basket={args.basket}")
+    print(f"parquet load + compute : {parquet_time * 1e3:9.1f} ms")
+    print(f"mmap open              : {open_time * 1e3:9.1f} ms")
+    print(f"mmap slice             : {slice_time * 1e3:9.1f} ms")
+    print(f"mmap open + compute    : {mmap_time * 1e3:9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
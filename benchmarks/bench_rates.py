@@ -0,0 +1,75 @@
+"""
+Curve bootstrapping, cached curve lookups and vectorized discounting of a cash-flow book.
+
+Usage:
+    python -m benchmarks.bench_rates --cashflows 100000 --snapshots 250
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.rates.store import RateStore
+
+TENORS = ["1M", "3M", "6M", "1Y", "2Y", "3Y", "5Y", "7Y", "10Y", "15Y", "20Y", "30Y"]
+INSTRUMENTS = ["deposit"] * 4 + ["swap"] * 8
+
+
+def write_curves(path, n_snapshots, rng):
+    os.makedirs(os.path.join(path, "curves"), exist_ok=True)
+    days = pd.bdate_range("2024-01-02", periods=n_snapshots)
+    base = np.linspace(4.0, 3.5, len(TENORS))
+    rows = [(day, tenor, instrument, rate) for day in days
+            for tenor, instrument, rate in zip(TENORS, INSTRUMENTS, base + rng.normal(0, 0.05, len(TENORS)))]
+    pd.DataFrame(rows, columns=["date", "tenor", "instrument", "rate"]).to_csv(
+        os.path.join(path, "curves", "USD.csv"), index=False)
+    return days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cashflows", type=int, default=100_000)
+    parser.add_argument("--snapshots", type=int, default=250)
+    parser.add_argument("--loop-sample", type=int, default=2000, help="Cash flows discounted one at a time")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as path:
+        days = write_curves(path, args.snapshots, rng)
+        store = RateStore(path)
+
+        start = time.perf_counter()
+        for day in days:
+            store.curve("USD", day, "Actual/360")
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for day in days:
+            curve = store.curve("USD", day, "Actual/360")
+        warm = time.perf_counter() - start
+        print(f"snapshots={args.snapshots} pillars={len(TENORS)}")
+        print(f"  bootstrap (cold) : {cold / args.snapshots * 1e3:8.3f} ms per curve")
+        print(f"  cached lookup    : {warm / args.snapshots * 1e6:8.2f} us per curve "
+              f"(hits={store.hits}, misses={store.misses})")
+
+        dates = curve.asof + rng.integers(1, 30 * 365, args.cashflows).astype("timedelta64[D]")
+        start = time.perf_counter()
+        discount = curve.discount_factors(dates)
+        vectorized = time.perf_counter() - start
+
+        sample = dates[:args.loop_sample]
+        start = time.perf_counter()
+        looped = np.array([float(curve.discount_factors(d)) for d in sample])
+        loop = (time.perf_counter() - start) / args.loop_sample * args.cashflows
+
+        print(f"cashflows={args.cashflows}")
+        print(f"  one call         : {vectorized:8.4f} s  {args.cashflows / vectorized:14,.0f} cash flows/s")
+        print(f"  loop (est.)      : {loop:8.4f} s  {args.cashflows / loop:14,.0f} cash flows/s "
+              f"({loop / vectorized:.0f}x)")
+        print(f"  max |one call - loop| = {np.max(np.abs(discount[:args.loop_sample] - looped)):.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Overhead of stage tracing: empty spans, and a traced LevelIndex.compute with and without memory tracing.
+
+Usage:
+    python -m benchmarks.bench_tracing --spans 100000 --components 100 --dates 5000
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import synthetic_market_data
+from src.compute.level_index import LevelIndex
+from src.profiling import Tracer
+
+
+def best_of(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--spans", type=int, default=100_000)
+    parser.add_argument("--components", type=int, default=100)
+    parser.add_argument("--dates", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for memory in (False, True):
+        tracer = Tracer(memory=memory, max_spans=args.spans)
+
+        def spans():
+            with tracer.run("bench"):
+                for _ in range(args.spans):
+                    with tracer.span("stage"):
+                        pass
+
+        elapsed = best_of(spans, 1)
+        tracer.memory = False
+        print(f"memory={memory!s:<5}  {elapsed / args.spans * 1e6:6.2f} us per span")
+
+    data = synthetic_market_data(args.dates, args.components)
+    weight = 100 / args.components
+    params = {"components": [{"ticker": t, "weight": weight} for t in data.columns[:args.components]],
+              "return_type": "Price Return"}
+    index = LevelIndex(data=data, params=params)
+    compute = LevelIndex.compute.__wrapped__  # undecorated method
+    compute(index)  # warm-up
+    untraced = best_of(lambda: compute(index), args.repeat)
+    print(f"LevelIndex.compute {args.components}x{args.dates}")
+    print(f"  untraced          : {untraced * 1e3:8.2f} ms")
+    for memory in (False, True):
+        tracer = Tracer(memory=memory)
+        traced = tracer.trace("index.compute")(compute)
+        elapsed = best_of(lambda: traced(index), args.repeat)
+        peak = tracer.spans[-1].peak_bytes
+        tracer.memory = False
+        print(f"  traced memory={memory!s:<5}: {elapsed * 1e3:8.2f} ms ({elapsed / untraced - 1:+.1%})"
+              + ("" if peak is None else f"  peak {peak / 2**20:.1f} MiB"))
+
+
+if __name__ == "__main__":
+    main()
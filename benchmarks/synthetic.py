@@ -0,0 +1,55 @@
+"""
+Synthetic market data shared by the benchmarks.
+"""
+import numpy as np
+import pandas as pd
+
+RATE_TICKER = "^IRX"
+
+
+def synthetic_prices(n_dates, n_components, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2000-01-03", periods=n_dates, name="Date")
+    tickers = [f"T{i}" for i in range(n_components)]
+    log_returns = rng.normal(0.0002, 0.015, (n_dates, n_components))
+    return pd.DataFrame(100 * np.exp(np.cumsum(log_returns, axis=0)), index=dates, columns=tickers)
+
+
+def synthetic_market_data(n_dates, n_components, seed=0):
+    """
+    LevelIndex input frame: component prices, quarterly 'dividend_{ticker}'
+    yields on staggered dates and an annual rate column (RATE_TICKER, in %).
+    """
+    rng = np.random.default_rng(seed + 1)
+    prices = synthetic_prices(n_dates, n_components, seed)
+
+    dividends = np.zeros((n_dates, n_components))
+    offsets = rng.integers(0, 63, n_components)
+    for i, offset in enumerate(offsets):
+        dividends[offset::63, i] = rng.uniform(0.002, 0.01, len(range(offset, n_dates, 63)))
+    dividend_frame = pd.DataFrame(dividends, index=prices.index, columns=[f"dividend_{t}" for t in prices.columns])
+
+    rate = pd.Series(np.clip(3 + np.cumsum(rng.normal(0, 0.02, n_dates)), 0, None), index=prices.index,
+                     name=RATE_TICKER)
+    return pd.concat([prices, dividend_frame, rate], axis=1)
+
+
+def yfinance_download_stub(prices: pd.DataFrame):
+    """
+    Replacement for `yf.download` serving `prices` in the layout yfinance
+    returns with group_by='ticker': flat OHLCV columns for one ticker,
+    (ticker, field) columns otherwise. Unknown tickers are left out.
+    """
+    fields = ["Open", "High", "Low", "Close", "Volume"]
+
+    def download(tickers, start=None, end=None, **kwargs):
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        tickers = [t for t in tickers if t in prices.columns]
+        frame = prices.loc[(prices.index >= pd.Timestamp(start)) & (prices.index < pd.Timestamp(end)), tickers]
+        if len(tickers) == 1:
+            return pd.DataFrame({field: frame[tickers[0]] for field in fields})
+        columns = pd.MultiIndex.from_product([tickers, fields])
+        values = np.repeat(frame.to_numpy()[:, :, None], len(fields), axis=2).reshape(len(frame), -1)
+        return pd.DataFrame(values, index=frame.index, columns=columns)
+
+    return download
@@ -1,10 +1,11 @@
 import streamlit as st
 import pandas as pd
-from api.yahoo_finance import YahooFinance
-from src.compute.level_index import LevelIndex
+from api.config import STRESS_WINDOWS
 from datetime import date, timedelta
 from src.utils import get_last_business_day
 from src.displayer.display_factory import DisplayFactory
+from src.profiling import PROFILER
+from src.rates.store import get_rate_store
 
 st.title("Index Structuration Simulation")
 st.markdown("Use this application to simulate and price you structured product")
@@ -13,7 +14,6 @@ params = {}
 
 today = date.today()
 start_of_year = date(today.year, 1, 1)
-last_business_day = get_last_business_day(today)
 
 st.header("1. Custom Basket Builder")
 
@@ -143,13 +143,27 @@ elif return_type == "Synthetic Dividend Total Return":
 index_currency = st.selectbox("Index Currency", ["EUR", "USD"])
 params["index_currency"] = index_currency
 
+fx_mode = st.selectbox(
+    "FX Treatment",
+    ["Unhedged", "Hedged", "Quanto"],
+    help="Unhedged: converted at spot. Hedged: local return with a rolled FX forward. Quanto: local return only."
+)
+params["fx_mode"] = fx_mode
+
 use_vol_target = st.checkbox("Enable Volatility Target")
+params["use_vol_target"] = use_vol_target
 
 if use_vol_target:
     target_vol = st.number_input("Target Volatility Level (%)", min_value=0.1, max_value=100.0, value=10.0, step=0.1)
     vol_window = st.number_input("Volatility Estimation Window (days)", min_value=1, max_value=500, value=60, step=1)
     vol_method = st.selectbox("Computation Methodology", ["Historical", "Exponential"])
-    params.update({"target_vol":target_vol,"vol_window":vol_window,"vol_method":vol_method})
+    vol_lag = st.number_input("Leverage Lag (days)", min_value=0, max_value=20, value=1, step=1)
+    leverage_floor = st.number_input("Minimum Leverage", min_value=0.0, max_value=10.0, value=0.0, step=0.1)
+    leverage_cap = st.number_input("Maximum Leverage", min_value=0.0, max_value=10.0, value=3.0, step=0.1)
+    vol_cost = st.number_input("Leverage Adjustment Cost (%)", min_value=0.0, max_value=5.0, value=0.0, step=0.01)
+    params.update({"target_vol":target_vol,"vol_window":vol_window,"vol_method":vol_method,
+                   "vol_lag":vol_lag,"leverage_floor":leverage_floor,"leverage_cap":leverage_cap,
+                   "vol_cost":vol_cost})
 
 
 st.header("2. Custom Wrapper Configuration")
@@ -189,11 +203,16 @@ if wrapper == "Note":
 elif wrapper == "ETF":
     st.markdown("### ETF Parameters")
     distributing = st.radio("Distributing or Accumulating?", ["Distributing", "Accumulating"])
+    distribution_frequency = st.selectbox("Distribution Frequency", ["Monthly", "Quarterly", "Semi-Annually", "Annually"],
+                                          index=1, disabled=distributing != "Distributing")
+    ter = st.number_input("Total Expense Ratio (%)", min_value=0.0, step=0.01)
     fx_hedged = st.checkbox("FX Hedged")
     
     params.update(
         {
             "distributing":distributing,
+            "distribution_frequency":distribution_frequency,
+            "ter":ter,
             "fx_hedged":fx_hedged,
         }
     )
@@ -204,6 +223,10 @@ elif wrapper == "Swap":
     fixed_rate = st.number_input("Fixed Rate (%)", min_value=0.0, step=0.01)
     receiver_leg = st.text_input("Receiver Leg Description")
     floating_rate_index = st.selectbox("Floating Rate Index", ["SOFR", "EURIBOR", "LIBOR", "ESTR"])
+    funding_leg = st.radio("Funding Leg", ["Floating", "Fixed"])
+    funding_spread = st.number_input("Funding Spread (bp)", step=1.0)
+    reset_frequency = st.selectbox("Reset Frequency", ["Monthly", "Quarterly", "Semi-Annually", "Annually"], index=1)
+    swap_maturity_years = st.number_input("Swap Maturity (Years)", min_value=0.25, value=5.0, step=0.25)
     fx_hedged = st.checkbox("FX Hedged")
     
     params.update(
@@ -212,6 +235,10 @@ elif wrapper == "Swap":
             "fixed_rate":fixed_rate,
             "receiver_leg":receiver_leg,
             "floating_rate_index":floating_rate_index,
+            "funding_leg":funding_leg,
+            "funding_spread":funding_spread,
+            "reset_frequency":reset_frequency,
+            "swap_maturity_years":swap_maturity_years,
             "fx_hedged":fx_hedged,
         }
     )
@@ -222,6 +249,8 @@ elif wrapper == "Fund":
     exit_fee = st.number_input("Exit Fee (%)", min_value=0.0, step=0.01)
     management_fee = st.number_input("Management Fee (%)", min_value=0.0, step=0.01)
     performance_fee = st.number_input("Performance Fee (%)", min_value=0.0, step=0.01)
+    crystallization_frequency = st.selectbox("Performance Fee Crystallization",
+                                             ["Monthly", "Quarterly", "Semi-Annually", "Annually"], index=3)
     fx_hedged = st.checkbox("FX Hedged")
     
     params.update(
@@ -230,10 +259,19 @@ elif wrapper == "Fund":
             "exit_fee":exit_fee,
             "management_fee":management_fee,
             "performance_fee":performance_fee,
+            "crystallization_frequency":crystallization_frequency,
             "fx_hedged":fx_hedged,
         }
     )
 
+if wrapper in ("Note", "Swap"):
+    st.markdown("### Discounting")
+    discount_curve = st.selectbox("Discount Curve", ["Flat"] + get_rate_store().curve_names(),
+                                  help="Curves bootstrapped from the local rates directory")
+    params["discount_curve"] = discount_curve
+    if discount_curve == "Flat":
+        params["discount_rate"] = st.number_input("Discount Rate (%)", value=3.0, step=0.05) / 100
+
 st.header("3. Client Setting")
 
 client_notional = st.number_input("Notional (€)", min_value=0.0, step=1000.0, format="%.2f")
@@ -274,6 +312,8 @@ st.header("4. Backtest setting")
 benchmark_ticker = st.text_input("Benchmark Ticker (e.g. ^GSPC, ^STOXX50E)", value="^GSPC")
 index_launch_date = st.date_input("Index Launch Date")
 act_method = st.selectbox("Calendar Day Count Convention", ["Actual/Actual", "30/360", "Actual/360", "Actual/365"])
+holiday_calendar = st.selectbox("Holiday Calendar", ["NYSE", "TARGET", "WEEKEND"])
+last_business_day = get_last_business_day(today, holiday_calendar)
 start_date = st.date_input("Backtest Start Date",value=start_of_year)
 end_date = st.date_input("Backtest End Date",value=last_business_day)
 live_start = st.date_input("Live Period Start Date (optional)",help="Used for split reporting")
@@ -284,6 +324,7 @@ params.update(
             "benchmark_ticker":benchmark_ticker,
             "index_launch_date":index_launch_date,
             "act_method":act_method,
+            "calendar":holiday_calendar,
             "start_date":start_date,
             "end_date":end_date,
             "live_start":live_start,
@@ -293,9 +334,72 @@ params.update(
 
 st.markdown("---")
 
+PROFILER.checkpoint("widgets")
+
+# The pipeline (pricing, data and compute modules) is only imported once it is first needed
+@st.cache_resource
+def get_pipeline():
+    # One fetcher (one thread pool) behind the price cache and every fetch of the pipeline
+    fetcher = PROFILER.load("api.batch_fetcher").BatchFetcher(PROFILER.load("api.providers").YahooProvider())
+    price_cache = PROFILER.load("api.price_cache").PriceCache(provider=fetcher)
+    return PROFILER.load("src.pipeline").SimulationPipeline(price_cache=price_cache, fetcher=fetcher)
+
 if st.button("Compute Simulation"):
-    data_forex = YahooFinance(**params).get_currency()
-    data = YahooFinance(**params).get_data()
-    level_index = LevelIndex(data=data, params=params).compute()
-    
-    DisplayFactory(display="DISPLAY_TEST_V1", index=level_index).render()
\ No newline at end of file
+    # Only the stages whose params changed since a previous run are recomputed
+    pipeline = get_pipeline()
+    try:
+        with PROFILER.stage("pipeline"):
+            st.session_state["simulation"] = pipeline.run(params)
+    except ValueError as e:
+        # e.g. a component whose currency could not be fetched for the FX conversion
+        st.error(f"⚠️ {e}")
+    else:
+        for stage, run in st.session_state["simulation"]["stages"].items():
+            PROFILER.record(f"pipeline.{stage}" + (" (cached)" if run["hit"] else ""), run["seconds"])
+
+# The last result stays on screen while its table pages and chart resolution are changed
+if "simulation" in st.session_state:
+    pipeline = get_pipeline()
+    with PROFILER.stage("render"):
+        for display, args in st.session_state["simulation"]["display"]:
+            DisplayFactory(display=display, **args).render()
+
+    with st.expander("Pipeline cache"):
+        stats = pd.DataFrame(pipeline.stats()).T
+        stages = st.session_state["simulation"]["stages"]
+        stats["reused"] = [stages.get(stage, {}).get("hit", False) for stage in stats.index]
+        st.dataframe(stats)
+
+st.header("5. Stress Tests")
+
+stress_windows = st.multiselect("Historical Stress Windows", list(STRESS_WINDOWS),
+                                help="Windows outside the backtest period are skipped")
+equity_shock = st.number_input("Equity Shock (%)", min_value=-100.0, max_value=100.0, value=-30.0, step=1.0)
+rates_shock = st.number_input("Rates Shock (bp)", min_value=-1000.0, max_value=1000.0, value=200.0, step=25.0)
+vol_shock = st.number_input("Volatility Shock (vol points)", min_value=-50.0, max_value=100.0, value=0.0, step=1.0)
+shock_horizon = st.number_input("Shock Horizon (days)", min_value=1, max_value=250, value=1, step=1)
+
+if st.button("Run Stress Tests"):
+    # Base data comes from the pipeline cache; only the shocked fixings are generated per scenario
+    scenarios_module = PROFILER.load("src.compute.scenarios")
+    Scenario, covered_windows = scenarios_module.Scenario, scenarios_module.covered_windows
+    windows = covered_windows([start_date, end_date], {name: STRESS_WINDOWS[name] for name in stress_windows})
+    scenarios = [Scenario.historical(name, start, end) for name, (start, end) in windows.items()]
+    scenarios.append(Scenario.hypothetical(
+        f"Equity {equity_shock:+.0f}%, Rates {rates_shock:+.0f}bp",
+        equity=equity_shock / 100, rates_bp=rates_shock, vol=vol_shock / 100, horizon=shock_horizon,
+    ))
+    skipped = [name for name in stress_windows if name not in windows]
+    if skipped:
+        st.info(f"Outside the backtest period: {', '.join(skipped)}")
+    with PROFILER.stage("stress"):
+        st.dataframe(get_pipeline().stress(params, scenarios))
+
+if wrapper == "Note" and maturity_years:
+    st.header("6. Autocall Backtest")
+    st.markdown("The note launched on every fixing of the backtest period with its full life inside it.")
+    if st.button("Run Backtest"):
+        with PROFILER.stage("backtest"):
+            st.session_state["autocall_backtest"] = get_pipeline().backtest(params)
+    if "autocall_backtest" in st.session_state:
+        DisplayFactory(display="DISPLAY_AUTOCALL_BACKTEST", result=st.session_state["autocall_backtest"]).render()
@@ -0,0 +1,379 @@
+"""
+Headless batch pricing of a book of products.
+
+Each product is a params dict with the schema built in pages/simulation.py.
+The book is a JSON list (or {"products": [...]}) or a JSON Lines file.
+
+Usage:
+    python -m src.batch_pricing book.json --output results.parquet --backend thread --workers 4
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from api.batch_fetcher import BatchFetcher
+from api.config import BATCH_FLUSH_ROWS, BATCH_PRICING_PATHS, FETCH_MAX_WORKERS, PRICE_CACHE_DIR
+from api.price_cache import PriceCache
+from api.providers import YahooProvider
+from src.compute.execution import BACKENDS
+from src.pipeline import SimulationPipeline, params_hash, stage_inputs
+from src.profiling import TRACER
+
+# Params holding dates, parsed from ISO strings when the book is loaded
+DATE_PARAMS = ("start_date", "end_date", "index_launch_date", "live_start", "client_maturity")
+
+# (name, type) of every result column, in output order
+RESULT_COLUMNS = (
+    ("product", "string"),
+    ("client_name", "string"),
+    ("wrapper", "string"),
+    ("return_type", "string"),
+    ("status", "string"),
+    ("error", "string"),
+    ("first_date", "string"),
+    ("last_date", "string"),
+    ("index_level", "float64"),
+    ("index_return", "float64"),
+    ("wrapper_price", "float64"),
+    ("wrapper_std_error", "float64"),
+    ("client_value", "float64"),
+    ("data_seconds", "float64"),
+    ("index_seconds", "float64"),
+    ("wrapper_seconds", "float64"),
+)
+
+STAGE_TIMINGS = ("data", "index", "wrapper")
+
+
+def load_book(path) -> list:
+    """
+    Reads the params dicts of a book (.json or .jsonl), parsing DATE_PARAMS.
+    """
+    with open(path) as f:
+        if str(path).endswith(".jsonl"):
+            book = [json.loads(line) for line in f if line.strip()]
+        else:
+            book = json.load(f)
+    if isinstance(book, dict):
+        book = book["products"]
+
+    for params in book:
+        for key in DATE_PARAMS:
+            if isinstance(params.get(key), str):
+                params[key] = date.fromisoformat(params[key])
+    return book
+
+
+class ResultWriter:
+    """
+    Streams result rows to a CSV or Parquet file as they arrive.
+
+    CSV rows are written and flushed one by one; Parquet rows are buffered
+    and written as row groups of `flush_rows`, so a partial book is readable
+    as soon as the writer is closed.
+
+    Attributes:
+        path (str): Output file, '.csv' or '.parquet'.
+        flush_rows (int): Rows per Parquet row group.
+        rows_written (int): Rows written so far.
+    """
+
+    def __init__(self, path, flush_rows=BATCH_FLUSH_ROWS):
+        if not str(path).endswith((".csv", ".parquet")):
+            raise ValueError(f"Unsupported output format: {path} (expected .csv or .parquet)")
+        self.path = path
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self._buffer = []
+        self._csv = None
+        self._parquet = None
+        self._schema = pa.schema([(name, pa.string() if kind == "string" else pa.float64())
+                                  for name, kind in RESULT_COLUMNS])
+
+        if str(path).endswith(".csv"):
+            self._file = open(path, "w", newline="")
+            self._csv = csv.DictWriter(self._file, fieldnames=[name for name, _ in RESULT_COLUMNS])
+            self._csv.writeheader()
+        else:
+            self._parquet = pq.ParquetWriter(path, self._schema)
+
+    def write(self, row: dict):
+        if self._csv is not None:
+            self._csv.writerow({name: row.get(name) for name, _ in RESULT_COLUMNS})
+            self._file.flush()
+            self.rows_written += 1
+            return
+        self._buffer.append(row)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        if self._parquet is None or not self._buffer:
+            return
+        columns = {name: [row.get(name) for row in self._buffer] for name, _ in RESULT_COLUMNS}
+        self._parquet.write_table(pa.table(columns, schema=self._schema))
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        if self._csv is not None:
+            self._file.close()
+        else:
+            self.flush()
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BatchPricer:
+    """
+    Prices a book of products without Streamlit.
+
+    Products sharing the same data inputs (tickers, dates, benchmark,
+    currency) are loaded once; all loads go through one coalescing
+    `BatchFetcher`, so a ticker shared by several products is fetched once
+    per book. Each product then runs `LevelIndex` and its wrapper on
+    `backend`, a product starting as soon as its data is loaded, and rows
+    are yielded in completion order. A failing product yields an 'error'
+    row instead of stopping the book.
+
+    Attributes:
+        fetcher (BatchFetcher): Shared front of the market-data provider
+            (Yahoo Finance unless `provider` is given).
+        price_cache (PriceCache or None): On-disk price cache in `cache_dir`,
+            built on the fetcher (None without `cache_dir`).
+        backend (str): 'serial', 'thread' or 'process' for the index and wrapper stages.
+        workers (int): Pool size, defaults to the number of CPUs.
+        price_args (dict): Keyword arguments of `Note.price` (n_paths, seed, ...).
+        timings (dict): Seconds spent per stage, one entry per run of the stage.
+
+    Example:
+        pricer = BatchPricer(cache_dir=PRICE_CACHE_DIR, backend="thread", workers=4)
+        with ResultWriter("book.parquet") as writer:
+            for row in pricer.run(load_book("book.json")):
+                writer.write(row)
+        print(pricer.summary())
+    """
+
+    def __init__(self, provider=None, cache_dir=None, backend="thread", workers=None,
+                 n_paths=BATCH_PRICING_PATHS, seed=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported execution backend: {backend}")
+        self.fetcher = BatchFetcher(provider or YahooProvider())
+        self.price_cache = None if cache_dir is None else PriceCache(provider=self.fetcher, cache_dir=cache_dir)
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.price_args = {"n_paths": n_paths, "seed": seed}
+        self.pipeline = SimulationPipeline(price_cache=self.price_cache, fetcher=self.fetcher)
+        self.timings = {stage: [] for stage in STAGE_TIMINGS}
+        self.elapsed = 0.0
+
+    def close(self):
+        """
+        Shuts the fetcher's thread pool down.
+        """
+        self.pipeline.close()
+
+    def run(self, book, progress=None):
+        """
+        Yields one result row (dict of RESULT_COLUMNS) per product, in
+        completion order. `progress(done, total, row)` is called after each.
+        """
+        start = time.perf_counter()
+        self.timings = {stage: [] for stage in STAGE_TIMINGS}
+        groups = {}
+        for i, params in enumerate(book):
+            key = params_hash("data", None, stage_inputs("data", params))
+            groups.setdefault(key, []).append((i, params))
+
+        done = 0
+        for row in self._run_groups(list(groups.values())):
+            done += 1
+            for stage in STAGE_TIMINGS:
+                if row.get(f"{stage}_seconds") is not None:
+                    self.timings[stage].append(row[f"{stage}_seconds"])
+            if progress is not None:
+                progress(done, len(book), row)
+            yield row
+        self.elapsed = time.perf_counter() - start
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Per-stage timing summary of the last run: runs, total, mean and max seconds.
+        """
+        rows = {}
+        for stage, times in self.timings.items():
+            times = np.asarray(times, dtype=float)
+            rows[stage] = {
+                "runs": len(times),
+                "total": times.sum(),
+                "mean": times.mean() if len(times) else np.nan,
+                "max": times.max() if len(times) else np.nan,
+            }
+        rows["wall"] = {"runs": 1, "total": self.elapsed, "mean": self.elapsed, "max": self.elapsed}
+        return pd.DataFrame(rows).T
+
+    def _run_groups(self, groups):
+        if self.backend == "serial":
+            for products in groups:
+                data, seconds, error = self._load(products[0][1])
+                for i, params in products:
+                    yield self._product_row(i, params, data, seconds, error, products[0][0] == i)
+            return
+
+        pool = ThreadPoolExecutor if self.backend == "thread" else ProcessPoolExecutor
+        # Worker threads trace into the caller's run; worker processes are not traced
+        load = TRACER.bind(self._load)
+        price = TRACER.bind(_price_product) if self.backend == "thread" else _price_product
+        with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as loader, pool(max_workers=self.workers) as executor:
+            pending = {loader.submit(load, products[0][1]): products for products in groups}
+            waiting = set(pending)
+            while waiting:
+                finished, waiting = wait(waiting, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in pending:
+                        products = pending.pop(future)
+                        data, seconds, error = future.result()
+                        for i, params in products:
+                            if error is not None:
+                                yield _result_row(i, params, error=error, timings={"data": seconds})
+                                continue
+                            waiting.add(executor.submit(
+                                price, i, params, data, self.price_args,
+                                seconds if products[0][0] == i else None,
+                            ))
+                    else:
+                        yield future.result()
+
+    def _load(self, params):
+        """
+        Data stage of one group: (data, seconds, error message or None).
+        """
+        start = time.perf_counter()
+        try:
+            data = self.pipeline.fetch(params)
+        except Exception as e:
+            return None, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        return data, time.perf_counter() - start, None
+
+    def _product_row(self, i, params, data, seconds, error, first):
+        if error is not None:
+            return _result_row(i, params, error=error, timings={"data": seconds})
+        return _price_product(i, params, data, self.price_args, seconds if first else None)
+
+
+def _price_product(i, params, data, price_args, data_seconds=None) -> dict:
+    """
+    Index and wrapper stages of one product; module level so process
+    workers can unpickle it. `data_seconds` is only set on the product
+    that triggered the load, so each load is counted once.
+    """
+    timings = {"data": data_seconds}
+    try:
+        tickers = [c["ticker"] for c in params["components"]]
+        missing = [t for t, empty in zip(tickers, np.isnan(data["prices"].matrix(tickers)).all(axis=0)) if empty]
+        if missing:
+            raise ValueError(f"No price data for: {', '.join(missing)}")
+
+        start = time.perf_counter()
+        index = SimulationPipeline.compute_index(params, data)
+        timings["index"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        wrapper = SimulationPipeline.price_wrapper(params, data, index, **price_args)
+        timings["wrapper"] = time.perf_counter() - start if wrapper is not None else None
+    except Exception as e:
+        return _result_row(i, params, error=f"{type(e).__name__}: {e}", timings=timings)
+    return _result_row(i, params, index=index, wrapper=wrapper, timings=timings)
+
+
+def _result_row(i, params, index=None, wrapper=None, error=None, timings=None) -> dict:
+    timings = timings or {}
+    row = {
+        "product": str(params.get("product_id", i)),
+        "client_name": params.get("client_name"),
+        "wrapper": params.get("wrapper"),
+        "return_type": params.get("return_type"),
+        "status": "error" if error else "ok",
+        "error": error,
+        "first_date": None,
+        "last_date": None,
+        "index_level": None,
+        "index_return": None,
+        "wrapper_price": None,
+        "wrapper_std_error": None,
+        "client_value": None,
+    }
+    row.update({f"{stage}_seconds": timings.get(stage) for stage in STAGE_TIMINGS})
+
+    if index is not None and len(index):
+        levels = index["index_value"].to_numpy()
+        row["first_date"] = str(pd.Timestamp(index["Date"].iloc[0]).date())
+        row["last_date"] = str(pd.Timestamp(index["Date"].iloc[-1]).date())
+        row["index_level"] = float(levels[-1])
+        row["index_return"] = float((levels[-1] / levels[0] - 1) * 100)
+    if wrapper is not None:
+        row["wrapper_price"] = float(wrapper["price"]) * 100
+        row["wrapper_std_error"] = float(wrapper["std_error"]) * 100
+        row["client_value"] = float(wrapper["price"]) * params.get("client_notional", 0.0)
+    return row
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("book", help="JSON or JSON Lines file of params dicts")
+    parser.add_argument("--output", required=True, help="Result file (.parquet or .csv)")
+    parser.add_argument("--backend", choices=BACKENDS, default="thread")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--n-paths", type=int, default=BATCH_PRICING_PATHS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--cache-dir", default=PRICE_CACHE_DIR, help="Price cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Fetch prices without the on-disk cache")
+    parser.add_argument("--quiet", action="store_true", help="No per-product progress lines")
+    parser.add_argument("--trace", default=None,
+                        help="JSON lines file the stage traces are appended to (serial and thread backends)")
+    parser.add_argument("--trace-memory", action="store_true", help="Record peak allocations per stage")
+    args = parser.parse_args(argv)
+
+    book = load_book(args.book)
+    pricer = BatchPricer(cache_dir=None if args.no_cache else args.cache_dir, backend=args.backend,
+                         workers=args.workers, n_paths=args.n_paths, seed=args.seed)
+
+    def progress(done, total, row):
+        if not args.quiet:
+            detail = row["error"] if row["status"] == "error" else f"price={row['wrapper_price']}"
+            print(f"[{done}/{total}] {row['product']} {row['status']} {detail}", file=sys.stderr)
+
+    TRACER.memory = args.trace_memory
+    failed = 0
+    try:
+        with TRACER.run("batch", products=len(book), backend=args.backend) as run, ResultWriter(args.output) as writer:
+            for row in pricer.run(book, progress=progress):
+                writer.write(row)
+                failed += row["status"] == "error"
+    finally:
+        pricer.close()
+    if args.trace:
+        TRACER.export_jsonl(args.trace, run=run)
+
+    print(pricer.summary().to_string(float_format=lambda x: f"{x:.3f}"))
+    print(f"{len(book) - failed} priced, {failed} failed -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import os
+
+import numpy as np
+
+HOLIDAYS_DIR = os.path.join(os.path.dirname(__file__), "holidays")
+
+# numpy roll names of each business day convention
+ROLL_CONVENTIONS = {
+    "following": "forward",
+    "preceding": "backward",
+    "modified_following": "modifiedfollowing",
+    "modified_preceding": "modifiedpreceding",
+}
+
+MONTHS_PER_PERIOD = {"Monthly": 1, "Quarterly": 3, "Semi-Annually": 6, "Annually": 12}
+
+_CALENDARS = {}
+
+
+def get_calendar(name="WEEKEND"):
+    """
+    Returns the calendar `name`, loading its holiday file once per process.
+
+    'WEEKEND' skips Saturdays and Sundays only; other names are read from
+    `holidays/<name>.csv` (columns: date, name).
+    """
+    if name not in _CALENDARS:
+        _CALENDARS[name] = BusinessCalendar.load(name)
+    return _CALENDARS[name]
+
+
+class BusinessCalendar:
+    """
+    Business-day calendar backed by NumPy's busday machinery.
+
+    Holidays are held in a precomputed `np.busdaycalendar`, so rolls, offsets
+    and counts are vectorized over whole datetime64 arrays with O(log n)
+    holiday lookups. Business-day arrays over a date range are memoized per
+    range.
+
+    Attributes:
+        name (str): Calendar identifier (e.g. 'NYSE', 'TARGET').
+        holidays (np.ndarray): Sorted datetime64[D] holidays falling on weekdays.
+
+    Example:
+        get_calendar("NYSE").offset(np.datetime64("2025-12-24"), 1)  # 2025-12-26
+    """
+
+    def __init__(self, name="WEEKEND", holidays=()):
+        self.name = name
+        self.holidays = np.unique(np.asarray(holidays, dtype="datetime64[D]"))
+        self.busdaycal = np.busdaycalendar(weekmask="1111100", holidays=self.holidays)
+        self._ranges = {}
+
+    @classmethod
+    def load(cls, name):
+        if name == "WEEKEND":
+            return cls(name)
+
+        path = os.path.join(HOLIDAYS_DIR, f"{name}.csv")
+        if not os.path.exists(path):
+            raise ValueError(f"Unknown holiday calendar: {name}")
+        holidays = np.loadtxt(path, dtype=str, delimiter=",", skiprows=1, usecols=0, ndmin=1)
+        return cls(name, holidays.astype("datetime64[D]"))
+
+    def is_business_day(self, dates):
+        return np.is_busday(_as_days(dates), busdaycal=self.busdaycal)
+
+    def roll(self, dates, convention="following"):
+        """
+        Moves non-business days to a business day according to `convention`.
+        """
+        return self.offset(dates, 0, convention)
+
+    def offset(self, dates, n, convention="following"):
+        """
+        Rolls `dates` with `convention`, then moves them by `n` business days.
+        """
+        if convention not in ROLL_CONVENTIONS:
+            raise ValueError(f"Unsupported business day convention: {convention}")
+        return np.busday_offset(_as_days(dates), n, roll=ROLL_CONVENTIONS[convention], busdaycal=self.busdaycal)
+
+    def count(self, start, end):
+        """
+        Number of business days in [start, end).
+        """
+        return np.busday_count(_as_days(start), _as_days(end), busdaycal=self.busdaycal)
+
+    def business_days(self, start, end):
+        """
+        All business days in [start, end], memoized per range.
+        """
+        key = (_as_days(start), _as_days(end))
+        if key not in self._ranges:
+            days = np.arange(key[0], key[1] + np.timedelta64(1, "D"), dtype="datetime64[D]")
+            days = days[np.is_busday(days, busdaycal=self.busdaycal)]
+            days.flags.writeable = False
+            self._ranges[key] = days
+        return self._ranges[key]
+
+    def schedule(self, start, end, frequency, convention="modified_following"):
+        """
+        Regular schedule stepping `frequency` from `start` up to `end`
+        (start excluded, end included), rolled to business days.
+
+        Arguments:
+            frequency (str): 'Daily', 'Weekly', 'Monthly', 'Quarterly',
+                'Semi-Annually' or 'Annually'.
+        """
+        start, end = _as_days(start), _as_days(end)
+        if frequency == "Daily":
+            return self.business_days(start + np.timedelta64(1, "D"), end)
+        if frequency == "Weekly":
+            dates = np.arange(start + np.timedelta64(7, "D"), end + np.timedelta64(1, "D"), 7)
+        elif frequency in MONTHS_PER_PERIOD:
+            step = MONTHS_PER_PERIOD[frequency]
+            months = (end.astype("datetime64[M]") - start.astype("datetime64[M]")).astype(int)
+            dates = add_months(start, np.arange(step, months + step, step))
+            dates = dates[dates <= end]
+        else:
+            raise ValueError(f"Unsupported schedule frequency: {frequency}")
+        return np.unique(self.roll(dates, convention))
+
+
+def period_ends(dates, frequency):
+    """
+    Boolean mask of the dates that are the last of their week (Monday to
+    Sunday), month or quarter within sorted `dates`; the final date is
+    excluded as its period may still be open. 'Daily' marks every date.
+    """
+    days = _as_days(dates)
+    if frequency == "Daily":
+        return np.ones(len(days), dtype=bool)
+    if frequency == "Weekly":
+        # 1970-01-01 was a Thursday: shift so that weeks start on Monday
+        periods = (days.astype(np.int64) + 3) // 7
+    elif frequency in MONTHS_PER_PERIOD:
+        periods = days.astype("datetime64[M]").astype(np.int64) // MONTHS_PER_PERIOD[frequency]
+    else:
+        raise ValueError(f"Unsupported schedule frequency: {frequency}")
+    mask = np.zeros(len(days), dtype=bool)
+    mask[:-1] = periods[1:] != periods[:-1]
+    return mask
+
+
+def add_months(dates, months):
+    """
+    Adds whole months to dates, clipping the day to the end of the target month.
+    """
+    days = _as_days(dates)
+    month_start = days.astype("datetime64[M]")
+    day_of_month = (days - month_start.astype("datetime64[D]")).astype(int)
+    target = month_start + np.asarray(months).astype("timedelta64[M]")
+    month_length = ((target + np.timedelta64(1, "M")).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(int)
+    return target.astype("datetime64[D]") + np.minimum(day_of_month, month_length - 1).astype("timedelta64[D]")
+
+
+def _as_days(dates):
+    return np.asarray(dates, dtype="datetime64[D]") if not isinstance(dates, np.datetime64) else dates.astype("datetime64[D]")
@@ -0,0 +1,73 @@
+import numpy as np
+
+DAY_COUNT_CONVENTIONS = ("Actual/Actual", "30/360", "Actual/360", "Actual/365")
+
+
+def year_fraction(start, end, convention="Actual/365"):
+    """
+    Year fraction between `start` and `end` under a day count convention,
+    vectorized over arrays of dates.
+
+    Arguments:
+        start, end (datetime64 or array): Period bounds (broadcastable).
+        convention (str): 'Actual/Actual' (ISDA), '30/360' (bond basis),
+            'Actual/360' or 'Actual/365' (fixed).
+
+    Returns:
+        np.ndarray or float: Year fraction of each period.
+    """
+    start = np.asarray(start, dtype="datetime64[D]")
+    end = np.asarray(end, dtype="datetime64[D]")
+    days = (end - start).astype(np.int64)
+
+    if convention == "Actual/360":
+        return days / 360.0
+    if convention == "Actual/365":
+        return days / 365.0
+    if convention == "30/360":
+        y1, m1, d1 = _ymd(start)
+        y2, m2, d2 = _ymd(end)
+        d1 = np.minimum(d1, 30)
+        d2 = np.where(d1 == 30, np.minimum(d2, 30), d2)
+        return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360.0
+    if convention == "Actual/Actual":
+        y1 = start.astype("datetime64[Y]")
+        y2 = end.astype("datetime64[Y]")
+        next_year = (y1 + np.timedelta64(1, "Y")).astype("datetime64[D]")
+        same_year = days / _days_in_year(y1)
+        first = (next_year - start).astype(np.int64) / _days_in_year(y1)
+        last = (end - y2.astype("datetime64[D]")).astype(np.int64) / _days_in_year(y2)
+        whole = (y2 - y1).astype(np.int64) - 1
+        return np.where(y1 == y2, same_year, first + whole + last)
+    raise ValueError(f"Unsupported day count convention: {convention}")
+
+
+def accrual_factors(dates, convention="Actual/365", calendar=None):
+    """
+    Year fraction accrued on each date since the previous one. The first date
+    accrues from the preceding business day of `calendar` (weekends only by
+    default).
+    """
+    from src.calendars.business_calendar import get_calendar
+
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    if len(dates) == 0:
+        return np.zeros(0)
+    calendar = calendar or get_calendar()
+    previous = np.empty_like(dates)
+    previous[0] = calendar.offset(dates[0], -1, "preceding")
+    previous[1:] = dates[:-1]
+    return year_fraction(previous, dates, convention)
+
+
+def _days_in_year(years):
+    return ((years + np.timedelta64(1, "Y")).astype("datetime64[D]") - years.astype("datetime64[D]")).astype(np.int64)
+
+
+def _ymd(dates):
+    years = dates.astype("datetime64[Y]")
+    months = dates.astype("datetime64[M]")
+    y = years.astype(np.int64) + 1970
+    m = (months - years.astype("datetime64[M]")).astype(np.int64) + 1
+    d = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+    return y, m, d
@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+
+from api.config import ANALYTICS_ROLLING_WINDOW
+
+# Fixings per year used to annualize daily statistics
+TRADING_DAYS = 252
+
+
+class PerformanceAnalytics:
+    """
+    Performance and risk statistics of an index level series and of its
+    benchmark, computed together.
+
+    Daily returns of both series are demeaned once and accumulated into one
+    prefix-sum array of their first and second moments (x, y, x², y², xy),
+    so the mean, variance and covariance of any range of fixings are two
+    row lookups: the full / backtest / live periods and every rolling window
+    are all read from the same cumulative arrays in one vectorized call.
+    Levels give total return and CAGR, and their running maxima the
+    drawdowns. Tracking error and beta follow from the variances and the
+    covariance (active variance = var(x) + var(y) - 2 cov(x, y)).
+
+    The backtest period runs up to the last fixing before `live_start` and
+    the live period from that fixing on (both are skipped when `live_start`
+    falls outside the history). A benchmark quoted later than the index
+    starts the common history at its first quote; one with no quote at all
+    is dropped.
+
+    Attributes:
+        dates (np.ndarray): Fixing dates (datetime64[ns]).
+        levels (np.ndarray): (dates × series) levels, index first.
+        names (list of str): 'Index' and, with a benchmark, 'Benchmark'.
+        live (int or None): Position of the first live fixing.
+        window (int): Rolling window in fixings.
+        risk_free (float): Annual rate subtracted in the Sharpe ratio.
+        expected_return, max_drawdown (float or None): Client targets in %.
+
+    Example:
+        analytics = PerformanceAnalytics.from_params(params, level_index, data["prices"]).compute()
+        analytics["summary"].loc["Live", ["cagr", "tracking_error", "beta"]]
+    """
+
+    def __init__(self, levels, dates, benchmark=None, live_start=None, window=ANALYTICS_ROLLING_WINDOW,
+                 risk_free=0.0, expected_return=None, max_drawdown=None):
+        frame = pd.DataFrame({"Index": np.asarray(levels, dtype=float)}, index=pd.DatetimeIndex(dates))
+        if benchmark is not None and np.isfinite(benchmark).any():
+            frame["Benchmark"] = np.asarray(benchmark, dtype=float)
+        frame = frame.ffill().dropna()
+        if len(frame) < 2:
+            raise ValueError("Performance analytics need at least two fixings.")
+
+        self.dates = frame.index.to_numpy()
+        self.levels = frame.to_numpy()
+        self.names = list(frame.columns)
+        self.window = window
+        self.risk_free = risk_free
+        self.expected_return = expected_return or None
+        self.max_drawdown = max_drawdown or None
+
+        self.live = None
+        if live_start is not None:
+            position = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(live_start)), side="left"))
+            if 2 <= position < len(self.dates):
+                self.live = position
+
+    @classmethod
+    def from_params(cls, params: dict, level_index: pd.DataFrame, prices=None):
+        """
+        Analytics of the index stage output against params['benchmark_ticker']
+        read from the fetched `prices` (index alone when it is not there).
+        """
+        ticker = params.get("benchmark_ticker")
+        dates = level_index["Date"].to_numpy()
+        benchmark = None
+        if prices is not None and ticker and ticker in prices:
+            benchmark = prices[ticker].reindex(pd.DatetimeIndex(dates)).to_numpy()
+        return cls(level_index["index_value"].to_numpy(), dates, benchmark, live_start=params.get("live_start"),
+                   expected_return=params.get("expected_return"), max_drawdown=params.get("max_drawdown"))
+
+    def compute(self) -> dict:
+        """
+        Returns:
+            dict: 'summary' (one row per period: dates, total return, CAGR,
+            volatility, Sharpe, max drawdown and its duration per series,
+            then tracking error, beta, correlation and information ratio,
+            and the client target checks), 'rolling' (rolling volatility,
+            Sharpe, tracking error and beta), 'drawdown' (drawdown of each
+            series from its running peak) and 'levels' (series rebased to
+            100).
+        """
+        n = len(self.dates)
+        returns = np.zeros_like(self.levels)
+        returns[1:] = self.levels[1:] / self.levels[:-1] - 1
+        mean = returns[1:].mean(axis=0)
+        cumulative = self._moments(returns - mean)
+
+        periods = {"Full": (0, n - 1)}
+        if self.live is not None:
+            periods["Backtest"] = (0, self.live - 1)
+            periods["Live"] = (self.live - 1, n - 1)
+        starts, ends = np.array(list(periods.values())).T
+
+        statistics = {"start": self.dates[starts], "end": self.dates[ends],
+                      **self._statistics(cumulative, mean, starts, ends), **self._level_statistics(starts, ends)}
+        summary = pd.DataFrame(statistics, index=list(periods))
+        if self.expected_return is not None:
+            summary["meets_expected_return"] = summary["cagr"] >= self.expected_return
+        if self.max_drawdown is not None:
+            summary["within_max_drawdown"] = -summary["max_drawdown"] <= self.max_drawdown
+
+        rolling_ends = np.arange(self.window, n)
+        rolling = pd.DataFrame(self._statistics(cumulative, mean, rolling_ends - self.window, rolling_ends))
+        rolling.insert(0, "Date", self.dates[rolling_ends])
+
+        drawdown, _ = self._drawdown(0, n - 1)
+        return {
+            "summary": summary,
+            "rolling": rolling,
+            "drawdown": self._frame(drawdown * 100),
+            "levels": self._frame(self.levels / self.levels[0] * 100),
+        }
+
+    def _frame(self, values):
+        return pd.DataFrame({"Date": self.dates, **dict(zip(self.names, values.T))})
+
+    def _prefixes(self):
+        return ["", "benchmark_"][:len(self.names)]
+
+    @staticmethod
+    def _moments(centred):
+        """
+        Prefix sums of x, x² (and y, y², xy with a benchmark) of the demeaned
+        returns; row j sums fixings 1..j.
+        """
+        centred[0] = 0.0
+        columns = [centred, centred ** 2]
+        if centred.shape[1] > 1:
+            columns.append(centred[:, :1] * centred[:, 1:])
+        return np.cumsum(np.hstack(columns), axis=0)
+
+    def _statistics(self, cumulative, offset, starts, ends) -> dict:
+        """
+        Annualized return statistics of the returns in (start, end] for each
+        pair of `starts` and `ends`, from two rows of the prefix sums of the
+        returns demeaned by `offset`.
+        """
+        k = len(self.names)
+        count = (ends - starts).astype(float)
+        sums = cumulative[ends] - cumulative[starts]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = sums[:, :k] / count[:, None]
+            variance = (sums[:, k:2 * k] - count[:, None] * mean ** 2) / (count[:, None] - 1)
+            volatility = np.sqrt(np.maximum(variance, 0.0) * TRADING_DAYS)
+            annual_return = (mean + offset) * TRADING_DAYS
+            sharpe = (annual_return - self.risk_free) / volatility
+
+            statistics = {}
+            for i, prefix in enumerate(self._prefixes()):
+                statistics[f"{prefix}volatility"] = volatility[:, i] * 100
+                statistics[f"{prefix}sharpe"] = sharpe[:, i]
+            if k > 1:
+                covariance = (sums[:, 2 * k] - count * mean[:, 0] * mean[:, 1]) / (count - 1)
+                active_variance = np.maximum(variance[:, 0] + variance[:, 1] - 2 * covariance, 0.0)
+                tracking_error = np.sqrt(active_variance * TRADING_DAYS)
+                statistics["tracking_error"] = tracking_error * 100
+                statistics["beta"] = covariance / variance[:, 1]
+                statistics["correlation"] = covariance / np.sqrt(variance[:, 0] * variance[:, 1])
+                statistics["information_ratio"] = (annual_return[:, 0] - annual_return[:, 1]) / tracking_error
+        return statistics
+
+    def _level_statistics(self, starts, ends) -> dict:
+        """
+        Total return, CAGR and max drawdown (depth and duration) of each
+        series from fixing `start` to fixing `end`, per pair of `starts` and
+        `ends`.
+        """
+        growth = self.levels[ends] / self.levels[starts]
+        years = (self.dates[ends] - self.dates[starts]) / np.timedelta64(1, "D") / 365.25
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr = np.where(years[:, None] > 0, growth ** (1 / years[:, None]) - 1, np.nan)
+        drawdowns = [self._drawdown(start, end) for start, end in zip(starts, ends)]
+        depth = np.array([drawdown.min(axis=0) for drawdown, _ in drawdowns])
+        duration = np.array([days for _, days in drawdowns])
+
+        statistics = {}
+        for i, prefix in enumerate(self._prefixes()):
+            statistics[f"{prefix}total_return"] = (growth[:, i] - 1) * 100
+            statistics[f"{prefix}cagr"] = cagr[:, i] * 100
+            statistics[f"{prefix}max_drawdown"] = depth[:, i] * 100
+            statistics[f"{prefix}max_drawdown_days"] = duration[:, i]
+        return statistics
+
+    def _drawdown(self, start, end):
+        """
+        Drawdown of each series from its running peak since fixing `start`,
+        and the longest time spent below a peak, in calendar days.
+        """
+        levels = self.levels[start:end + 1]
+        peaks = np.maximum.accumulate(levels, axis=0)
+        positions = np.arange(len(levels))[:, None]
+        last_peak = np.maximum.accumulate(np.where(levels >= peaks, positions, 0), axis=0)
+        dates = self.dates[start:end + 1]
+        underwater = (dates[:, None] - dates[last_peak]) / np.timedelta64(1, "D")
+        return levels / peaks - 1, underwater.max(axis=0).astype(int)
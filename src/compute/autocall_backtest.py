@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.compute.path_simulator import MAX_CHUNK_ELEMENTS
+from src.wrapper.note import OBSERVATIONS_PER_YEAR, TRADING_DAYS, autocall_cashflows
+
+# Percentiles of the payoff and annualized return reported in the summary
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+class AutocallBacktest:
+    """
+    Autocallable note launched on every fixing of a price history, every
+    launch evaluated at once.
+
+    Launches are rows of a sliding window view of the (dates × underlyings)
+    price matrix, each window spanning one note life: observations fall
+    every 252 / frequency fixings after the launch, as on the undated
+    `Note` grid, and the lifecycle (autocall, coupons with memory,
+    redemption) is `autocall_cashflows` on the (launches × observations)
+    basket performances. Continuous barriers take the minimum over each
+    window: for worst-of and single underlying notes the minimum over
+    assets and over time commute, so a rolling minimum per asset is
+    enough; best-of notes build the basket path of a bounded chunk of
+    launches at a time. Only launches whose whole life is in the history
+    are evaluated.
+
+    Attributes:
+        prices (pd.DataFrame): Fixings of the underlyings (one column for
+            'Single Underlying', e.g. the index level).
+        autocall_barrier, redemption_barrier, coupon_barrier (float):
+            Barriers as fractions of the launch fixing.
+        coupon (float): Coupon per observation period as a fraction.
+        n_observations (int): Observations per note life.
+        step (int): Fixings between two observations.
+
+    Example:
+        result = AutocallBacktest.from_params(params, prices).run()
+        result["summary"]["autocall_rate"], result["launches"].head()
+    """
+
+    def __init__(self, prices: pd.DataFrame, autocall_barrier=100.0, redemption_barrier=60.0, coupon=0.0,
+                 maturity_years=1.0, observation_frequency="Quarterly", effet_memoire=False,
+                 barrier_type="European", option_type="Worst of", capital_guaranteed=False, coupon_barrier=None):
+        if observation_frequency not in OBSERVATIONS_PER_YEAR:
+            raise ValueError(f"Unsupported observation frequency: {observation_frequency}")
+        if barrier_type not in ("European", "American", "Continuous"):
+            raise ValueError(f"Unsupported barrier type: {barrier_type}")
+        if option_type not in ("Worst of", "Best of", "Single Underlying"):
+            raise ValueError(f"Unsupported option type: {option_type}")
+
+        prices = prices.ffill().dropna()
+        self.prices = prices.iloc[:, :1] if option_type == "Single Underlying" else prices
+        self.autocall_barrier = autocall_barrier / 100
+        self.redemption_barrier = redemption_barrier / 100
+        self.coupon_barrier = self.redemption_barrier if coupon_barrier is None else coupon_barrier / 100
+        self.effet_memoire = effet_memoire
+        self.barrier_type = barrier_type
+        self.option_type = option_type
+        self.capital_guaranteed = capital_guaranteed
+
+        self.per_year = OBSERVATIONS_PER_YEAR[observation_frequency]
+        self.n_observations = int(round(maturity_years * self.per_year))
+        if self.n_observations < 1:
+            raise ValueError("maturity_years must cover at least one observation period.")
+        self.coupon = coupon / 100 / self.per_year
+        self.step = TRADING_DAYS // self.per_year
+
+    @classmethod
+    def from_params(cls, params: dict, prices: pd.DataFrame):
+        keys = ("autocall_barrier", "redemption_barrier", "coupon", "maturity_years", "observation_frequency",
+                "effet_memoire", "barrier_type", "option_type", "capital_guaranteed", "coupon_barrier")
+        return cls(prices, **{k: params[k] for k in keys if k in params})
+
+    def run(self, chunk_size=None) -> dict:
+        """
+        Lifecycle of the note launched on every fixing with a full life ahead.
+
+        Returns:
+            dict: 'launches' (one row per launch: dates, exit observation,
+            autocalled / knocked-in flags, coupons, redemption, payoff, life
+            and annualized return), 'exits' (share of launches redeemed on
+            each observation), 'summary' (distribution statistics) and
+            'elapsed' (seconds).
+        """
+        start = time.perf_counter()
+        matrix = self.prices.to_numpy(dtype=float)
+        window = self.n_observations * self.step
+        n_launches = len(matrix) - window
+        if n_launches < 1:
+            raise ValueError("The price history is shorter than one note life.")
+
+        # (launches × assets × window + 1) view: windows[l, a, j] = matrix[l + j, a], no copy
+        windows = sliding_window_view(matrix, window + 1, axis=0)
+        launch = matrix[:n_launches]
+        offsets = np.arange(1, self.n_observations + 1) * self.step
+        observed = self._basket(windows[:, :, offsets] / launch[:, :, None], axis=1)
+
+        if self.barrier_type == "European":
+            knocked_in = observed[:, -1] < self.redemption_barrier
+        elif self.barrier_type == "American":
+            knocked_in = observed.min(axis=-1) < self.redemption_barrier
+        else:
+            knocked_in = self._window_minimum(windows, launch, chunk_size) < self.redemption_barrier
+
+        coupons, redemption, exit_index = autocall_cashflows(
+            observed, knocked_in, self.autocall_barrier, self.coupon_barrier, self.coupon,
+            self.effet_memoire, self.capital_guaranteed,
+        )
+        elapsed = time.perf_counter() - start
+        return self._report(coupons, redemption, exit_index, knocked_in, offsets, elapsed)
+
+    def _basket(self, performances, axis=-1):
+        if self.option_type == "Best of":
+            return performances.max(axis=axis)
+        return performances.min(axis=axis)
+
+    def _window_minimum(self, windows, launch, chunk_size=None):
+        """
+        Lowest basket performance of each launch over its whole life.
+        """
+        if self.option_type != "Best of":
+            return (windows[:, :, 1:].min(axis=-1) / launch).min(axis=-1)
+
+        n_launches, n_assets, length = windows.shape
+        chunk_size = chunk_size or max(1, MAX_CHUNK_ELEMENTS // (n_assets * length))
+        minimum = np.empty(n_launches)
+        for first in range(0, n_launches, chunk_size):
+            block = slice(first, first + chunk_size)
+            minimum[block] = (windows[block, :, 1:] / launch[block, :, None]).max(axis=1).min(axis=-1)
+        return minimum
+
+    def _report(self, coupons, redemption, exit_index, knocked_in, offsets, elapsed):
+        dates = self.prices.index
+        n_launches = len(redemption)
+        autocalled = exit_index < self.n_observations - 1
+        payoff = coupons.sum(axis=-1) + redemption
+        life = (exit_index + 1) / self.per_year
+        annualized = np.maximum(payoff, 0.0) ** (1 / life) - 1
+
+        launches = pd.DataFrame({
+            "launch_date": dates[:n_launches],
+            "exit_date": dates[np.arange(n_launches) + offsets[exit_index]],
+            "exit_observation": exit_index + 1,
+            "autocalled": autocalled,
+            "knocked_in": knocked_in,
+            "coupons": coupons.sum(axis=-1) * 100,
+            "redemption": redemption * 100,
+            "payoff": payoff * 100,
+            "life_years": life,
+            "annualized_return": annualized * 100,
+        })
+
+        exits = np.bincount(exit_index, minlength=self.n_observations) / n_launches
+        labels = [f"Obs {k}" for k in range(1, self.n_observations)] + ["Maturity"]
+        summary = {
+            "launches": n_launches,
+            "first_launch": dates[0],
+            "last_launch": dates[n_launches - 1],
+            "autocall_rate": float(autocalled.mean()) * 100,
+            "knock_in_rate": float(knocked_in.mean()) * 100,
+            "capital_loss_rate": float((redemption < 1).mean()) * 100,
+            "mean_payoff": float(payoff.mean()) * 100,
+            "mean_annualized_return": float(annualized.mean()) * 100,
+            "mean_life_years": float(life.mean()),
+            "elapsed": elapsed,
+            "launches_per_second": n_launches / elapsed if elapsed > 0 else float("inf"),
+        }
+        for q, p, r in zip(PERCENTILES, np.percentile(payoff, PERCENTILES), np.percentile(annualized, PERCENTILES)):
+            summary[f"payoff_p{q}"] = float(p) * 100
+            summary[f"annualized_return_p{q}"] = float(r) * 100
+
+        return {
+            "launches": launches,
+            "exits": pd.DataFrame({"exit": labels, "probability": exits * 100}),
+            "summary": summary,
+            "elapsed": elapsed,
+        }
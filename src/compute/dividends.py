@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+from api.market_data import MarketData, pad
+
+
+def withholding_rates(tickers, default=0.0, by_ticker=None, jurisdictions=None, by_jurisdiction=None) -> np.ndarray:
+    """
+    Withholding rate of each ticker as a fraction.
+
+    Arguments:
+        tickers (list of str): Component tickers.
+        default (float): Rate in % applied when nothing more specific is set.
+        by_ticker (dict): Ticker to rate in %, takes precedence.
+        jurisdictions (dict): Ticker to jurisdiction code (e.g. 'US', 'FR').
+        by_jurisdiction (dict): Jurisdiction code to rate in %.
+    """
+    by_ticker = by_ticker or {}
+    jurisdictions = jurisdictions or {}
+    by_jurisdiction = by_jurisdiction or {}
+
+    rates = []
+    for ticker in tickers:
+        if ticker in by_ticker:
+            rates.append(by_ticker[ticker])
+        elif jurisdictions.get(ticker) in by_jurisdiction:
+            rates.append(by_jurisdiction[jurisdictions[ticker]])
+        else:
+            rates.append(default)
+    return np.asarray(rates, dtype=float) / 100
+
+
+def dividend_events(cash) -> pd.DataFrame:
+    """
+    Converts a wide frame (or MarketData block) of cash dividends (ex-date ×
+    ticker, 0 or NaN when none, as returned by `YahooFinance.get_dividends`)
+    into a (date, ticker, amount) table.
+    """
+    values = cash.matrix() if isinstance(cash, MarketData) else cash.to_numpy(dtype=float)
+    rows, cols = np.nonzero(np.nan_to_num(values))
+    return pd.DataFrame({
+        "date": pd.DatetimeIndex(cash.index)[rows],
+        "ticker": cash.columns.to_numpy()[cols],
+        "amount": values[rows, cols],
+    })
+
+
+class DividendSchedule:
+    """
+    Dividend yields aligned to a price grid, stored sparsely.
+
+    Events are held as coordinate arrays (date row, ticker column, yield as a
+    fraction of the previous close), sorted by date then ticker, so a grid of
+    decades × hundreds of tickers costs memory only for the dividends actually
+    paid. The weighted daily dividend return of a basket, gross or net of
+    withholding, is one sparse matrix-vector product.
+
+    Attributes:
+        dates (pd.DatetimeIndex): Price grid.
+        tickers (list of str): Component tickers (matrix columns).
+        rows, cols (np.ndarray): Grid coordinates of each event.
+        values (np.ndarray): Dividend yield of each event.
+
+    Example:
+        schedule = DividendSchedule.from_events(events, prices)
+        schedule.aggregate(weights, withholding_rates(tickers, 15.0))
+    """
+
+    def __init__(self, dates, tickers, rows, cols, values):
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = list(tickers)
+        order = np.lexsort((cols, rows))
+        self.rows = np.asarray(rows, dtype=np.int64)[order]
+        self.cols = np.asarray(cols, dtype=np.int64)[order]
+        self.values = np.asarray(values, dtype=float)[order]
+
+    @classmethod
+    def from_columns(cls, data: pd.DataFrame, tickers):
+        """
+        Reads the 'dividend_{ticker}' yield columns of a LevelIndex input frame;
+        tickers without a column pay nothing.
+        """
+        tickers = list(tickers)
+        rows, cols, values = [], [], []
+        # Column by column, so no dense (dates × tickers) block is materialized
+        for i, ticker in enumerate(tickers):
+            col = f"dividend_{ticker}"
+            if col in data.columns:
+                column = data[col].to_numpy(dtype=float)
+                nonzero = np.flatnonzero(np.nan_to_num(column))
+                rows.append(nonzero)
+                cols.append(np.full(len(nonzero), i))
+                values.append(column[nonzero])
+
+        if not rows:
+            return cls(data.index, tickers, [], [], [])
+        return cls(data.index, tickers, np.concatenate(rows), np.concatenate(cols), np.concatenate(values))
+
+    @classmethod
+    def from_events(cls, events: pd.DataFrame, prices: pd.DataFrame):
+        """
+        Aligns cash dividend events to the price grid.
+
+        Arguments:
+            events (pd.DataFrame): Columns 'date' (ex-date), 'ticker' and
+                'amount' (cash per share).
+            prices (pd.DataFrame or MarketData): Close prices indexed by date,
+                one column per ticker.
+
+        Ex-dates falling on a non-trading day are moved to the next date of the
+        grid; each amount is divided by the previous close. Events outside the
+        grid, on unknown tickers or without a previous close are dropped.
+        """
+        dates = pd.DatetimeIndex(prices.index)
+        tickers = list(prices.columns)
+        values = prices.matrix() if isinstance(prices, MarketData) else prices.to_numpy(dtype=float)
+        col_of = {t: i for i, t in enumerate(tickers)}
+
+        cols = events["ticker"].map(col_of).to_numpy(dtype=float)
+        rows = dates.searchsorted(pd.DatetimeIndex(events["date"]), side="left")
+        amounts = events["amount"].to_numpy(dtype=float)
+        keep = ~np.isnan(cols) & (rows >= 1) & (rows < len(dates))
+        rows, cols, amounts = rows[keep], cols[keep].astype(np.int64), amounts[keep]
+
+        previous_close = pad(values)[rows - 1, cols]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = amounts / previous_close
+        keep = np.isfinite(values) & (values != 0)
+        return cls(dates, tickers, rows[keep], cols[keep], values[keep])
+
+    @classmethod
+    def from_cash(cls, cash, prices):
+        """
+        Aligns a wide frame (or MarketData block) of cash dividends to `prices`.
+        """
+        return cls.from_events(dividend_events(cash), prices)
+
+    def aggregate(self, weights, withholding=None) -> np.ndarray:
+        """
+        Weighted dividend return of each date.
+
+        Arguments:
+            weights (np.ndarray): Basket weights as fractions, one per ticker.
+            withholding (np.ndarray or None): Withholding fraction per ticker
+                (see `withholding_rates`); None for gross dividends.
+        """
+        weights = np.asarray(weights, dtype=float)
+        values = self.values
+        if withholding is not None:
+            values = values * (1 - np.asarray(withholding, dtype=float))[self.cols]
+        return np.bincount(self.rows, weights=values * weights[self.cols], minlength=len(self.dates))
+
+    def matrix(self) -> np.ndarray:
+        """
+        Dense (dates × tickers) yield matrix.
+        """
+        dense = np.zeros((len(self.dates), len(self.tickers)))
+        np.add.at(dense, (self.rows, self.cols), self.values)
+        return dense
@@ -0,0 +1,172 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+BACKENDS = ("serial", "thread", "process")
+
+
+def run_tasks(func, tasks, backend="serial", workers=None):
+    """
+    Applies `func` to every task and returns the results in task order.
+
+    Arguments:
+        func (callable): Module-level function (it must be picklable for the
+            'process' backend), called as func(*task).
+        tasks (list of tuple): Positional arguments of each call.
+        backend (str): 'serial', 'thread' or 'process'.
+        workers (int): Pool size, defaults to the number of CPUs.
+
+    Returns:
+        list: One result per task, in order, whatever the backend.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported execution backend: {backend}")
+
+    if backend == "serial" or len(tasks) <= 1:
+        return [func(*task) for task in tasks]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    pool = ThreadPoolExecutor if backend == "thread" else ProcessPoolExecutor
+    with pool(max_workers=workers) as executor:
+        return list(executor.map(func, *zip(*tasks)))
+
+
+def split(n, parts):
+    """
+    Splits range(n) into at most `parts` contiguous, near-equal slices.
+    """
+    bounds = np.linspace(0, n, min(parts, n) + 1).astype(int)
+    return [slice(a, b) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+class SharedArray:
+    """
+    NumPy array placed in shared memory, so process workers can read it
+    without it being pickled to each of them.
+
+    The creating process owns the block: use it as a context manager, or call
+    `release()`, once the workers are done. Workers receive `spec` and call
+    `SharedArray.attach(spec)`.
+
+    Example:
+        with SharedArray(prices) as shared:
+            run_tasks(work, [(shared.spec, i) for i in range(4)], backend="process")
+    """
+
+    def __init__(self, array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self.array = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf)
+        self.array[...] = array
+        self.spec = (self._shm.name, array.shape, array.dtype.str)
+
+    @staticmethod
+    def attach(spec):
+        """
+        Maps a shared block from its spec; returns (handle, array). Keep the
+        handle alive while using the array and close it afterwards.
+        """
+        name, shape, dtype = spec
+        shm = shared_memory.SharedMemory(name=name)
+        return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    def release(self):
+        self.array = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class MeanEstimator:
+    """
+    Running sample mean and sum of squared deviations (Welford), so
+    estimates computed on separate chunks or workers can be merged exactly
+    with Chan's pairwise update, without the cancellation of a raw sum of
+    squares. Samples run along the first axis; trailing axes (e.g. one entry
+    per underlying) are estimated independently.
+
+    Attributes:
+        mean (float or np.ndarray): Mean of the samples.
+        m2 (float or np.ndarray): Sum of the squared deviations from the mean.
+        count (int): Number of samples.
+    """
+
+    def __init__(self, mean=0.0, m2=0.0, count=0):
+        self.mean = mean
+        self.m2 = m2
+        self.count = count
+
+    @classmethod
+    def from_samples(cls, samples):
+        samples = np.asarray(samples, dtype=float)
+        if samples.shape[0] == 0:
+            zeros = np.zeros(samples.shape[1:])[()]
+            return cls(zeros, zeros, 0)
+        mean = samples.mean(axis=0)
+        return cls(mean, ((samples - mean) ** 2).sum(axis=0), samples.shape[0])
+
+    def merge(self, other):
+        if not other.count:
+            return MeanEstimator(self.mean, self.m2, self.count)
+        if not self.count:
+            return MeanEstimator(other.mean, other.m2, other.count)
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.count / count)
+        m2 = self.m2 + other.m2 + delta ** 2 * (self.count * other.count / count)
+        return MeanEstimator(mean, m2, count)
+
+    @property
+    def std_error(self):
+        if self.count < 2:
+            return np.full(np.shape(self.mean), np.nan)[()]
+        return np.sqrt(self.m2 / (self.count - 1) / self.count)
+
+
+class ReplicatedMeanEstimator:
+    """
+    Mean of samples split into independent replications (e.g. randomized
+    quasi-Monte Carlo shifts), with the standard error taken from the spread
+    of the replication means rather than from the samples themselves, which
+    are not independent within a replication.
+
+    Attributes:
+        replications (list of MeanEstimator): Partial sums of each replication.
+    """
+
+    def __init__(self, replications):
+        self.replications = list(replications)
+
+    @classmethod
+    def from_samples(cls, samples, labels, n_replications):
+        """
+        Splits the samples (first axis) by replication `labels` in 0..n_replications-1.
+        """
+        samples = np.asarray(samples, dtype=float)
+        labels = np.asarray(labels)
+        return cls(MeanEstimator.from_samples(samples[labels == r]) for r in range(n_replications))
+
+    def merge(self, other):
+        return ReplicatedMeanEstimator(a.merge(b) for a, b in zip(self.replications, other.replications))
+
+    @property
+    def count(self):
+        return sum(r.count for r in self.replications)
+
+    @property
+    def mean(self):
+        return sum(r.mean * r.count for r in self.replications if r.count) / self.count
+
+    @property
+    def std_error(self):
+        means = np.array([r.mean for r in self.replications if r.count])
+        if len(means) < 2:
+            return np.full(np.shape(self.mean), np.nan)[()]
+        return np.std(means, axis=0, ddof=1) / np.sqrt(len(means))
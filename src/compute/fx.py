@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+FX_MODES = ("Unhedged", "Hedged", "Quanto")
+
+# Minor-unit quotes (e.g. London prices in pence) mapped to (currency, scale)
+MINOR_UNITS = {"GBp": ("GBP", 0.01), "GBX": ("GBP", 0.01), "ZAc": ("ZAR", 0.01), "ILA": ("ILS", 0.01)}
+
+
+def fx_ticker(currency: str, index_currency: str) -> str:
+    """
+    Yahoo Finance ticker quoting one unit of `currency` in `index_currency`.
+    """
+    return f"{currency}{index_currency}=X"
+
+
+def fx_tickers(currencies, index_currency):
+    """
+    FX tickers needed to convert `currencies` (minor units included) into `index_currency`.
+    """
+    majors = {MINOR_UNITS.get(c, (c, 1.0))[0] for c in currencies if c}
+    return sorted(fx_ticker(c, index_currency) for c in majors if c != index_currency)
+
+
+class FXMatrix:
+    """
+    Dense (dates × currencies) matrix of FX rates into the index currency.
+
+    Built once per run from the FX closes, aligned to the price grid, with one
+    column per quote currency (the index currency column holds ones). Each
+    component is mapped to its currency column by integer index, so a whole
+    (dates × components) price matrix converts in one broadcasted multiply.
+
+    Attributes:
+        dates (pd.DatetimeIndex): Price grid.
+        currencies (list of str): Quote currencies, as reported per ticker
+            (minor units such as 'GBp' have their own scaled column).
+        rates (np.ndarray): (dates × currencies) value of one unit of each
+            currency in the index currency.
+        index_currency (str): Currency of the index.
+        ticker_currencies (dict): Quote currency of each ticker.
+
+    Example:
+        fx = FXMatrix.from_prices(fx_closes, {"AAPL": "USD", "MC.PA": "EUR"}, "EUR", prices.index)
+        fx.convert(prices.to_numpy(), fx.columns(["AAPL", "MC.PA"]))
+    """
+
+    def __init__(self, dates, currencies, rates, index_currency, ticker_currencies=None):
+        self.dates = pd.DatetimeIndex(dates)
+        self.currencies = list(currencies)
+        self.rates = np.asarray(rates, dtype=float)
+        self.index_currency = index_currency
+        self.ticker_currencies = dict(ticker_currencies or {})
+        self._column_of = {c: i for i, c in enumerate(self.currencies)}
+
+        if self.rates.shape != (len(self.dates), len(self.currencies)):
+            raise ValueError("rates must have one row per date and one column per currency.")
+
+    @classmethod
+    def from_prices(cls, fx_prices: pd.DataFrame, ticker_currencies: dict, index_currency: str, dates):
+        """
+        Builds the matrix from FX closes (columns named by `fx_ticker`).
+
+        Rates are aligned to `dates`, padded over FX holidays and back-filled
+        before the first quote. Every ticker needs a known currency: an
+        unknown one (None, a failed lookup) raises rather than being taken
+        as the index currency.
+        """
+        unknown = [t for t, c in ticker_currencies.items() if not c]
+        if unknown:
+            raise ValueError(f"Unknown quote currency for {', '.join(unknown)}")
+        dates = pd.DatetimeIndex(dates)
+        currencies = list(dict.fromkeys([index_currency, *ticker_currencies.values()]))
+
+        aligned = fx_prices.reindex(fx_prices.index.union(dates)).ffill().bfill().reindex(dates)
+        rates = np.ones((len(dates), len(currencies)))
+        for j, currency in enumerate(currencies):
+            major, scale = MINOR_UNITS.get(currency, (currency, 1.0))
+            if major == index_currency:
+                rates[:, j] = scale
+                continue
+            ticker = fx_ticker(major, index_currency)
+            if ticker not in aligned.columns or aligned[ticker].isna().all():
+                raise ValueError(f"Missing FX rates for {major}/{index_currency} ({ticker})")
+            rates[:, j] = aligned[ticker].to_numpy(dtype=float) * scale
+
+        return cls(dates, currencies, rates, index_currency, ticker_currencies)
+
+    def columns(self, tickers) -> np.ndarray:
+        """
+        Currency column of each ticker.
+        """
+        return np.array([self._column_of[self.ticker_currencies.get(t, self.index_currency)] for t in tickers])
+
+    def component_rates(self, columns) -> np.ndarray:
+        """
+        (dates × components) FX rate of each component's currency.
+        """
+        return self.rates[:, columns]
+
+    def convert(self, prices: np.ndarray, columns) -> np.ndarray:
+        """
+        Converts a (dates × components) local price matrix into the index currency.
+        """
+        return prices * self.rates[:, columns]
+
+    def returns(self, columns) -> np.ndarray:
+        """
+        Daily FX returns of each component's currency (0 on the first date).
+        """
+        rates = self.rates[:, columns]
+        returns = np.zeros(rates.shape)
+        returns[1:] = rates[1:] / rates[:-1] - 1
+        return returns
+
+    def forward_premium(self, columns, deposit_rates=None, accrual=None) -> np.ndarray:
+        """
+        (dates × components) forward points F/S - 1 of a hedge rolled every
+        fixing: the deposit rate differential (index currency minus component
+        currency, annual % from `deposit_rates`, 0 when unknown) times the
+        year fraction `accrual` of each fixing (1/252 by default).
+        """
+        deposit_rates = deposit_rates or {}
+        accrual = np.full(len(self.dates), 1 / 252) if accrual is None else np.asarray(accrual, dtype=float)
+        base = deposit_rates.get(self.index_currency, 0.0)
+        differential = np.array([
+            base - deposit_rates.get(MINOR_UNITS.get(self.currencies[j], (self.currencies[j],))[0], 0.0)
+            for j in columns
+        ]) / 100
+        premium = accrual[:, None] * differential[None, :]
+        premium[0] = 0.0
+        return premium
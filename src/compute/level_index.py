@@ -1,37 +1,90 @@
 import numpy as np
 import pandas as pd
-import yfinance as yf
+
+from api.market_data import MarketData, pad_returns
+from src.calendars.business_calendar import get_calendar
+from src.calendars.day_count import accrual_factors
+from src.compute.dividends import DividendSchedule, withholding_rates
+from src.compute.fx import FX_MODES, FXMatrix
+from src.compute.rebalancing import RebalancingEngine
+from src.compute.vol_control import VolTarget
+from src.profiling import TRACER
+from src.rates.store import get_rate_store
+
+
+def weighted_sum(returns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Row-wise weighted sum of a (dates × components) return matrix.
+
+    Components are accumulated left to right rather than through a BLAS
+    product, so the result of a row does not depend on how many rows are
+    computed together: a single streamed row matches the full history bit for bit.
+    """
+    total = np.zeros(returns.shape[0])
+    for i, weight in enumerate(weights):
+        total += returns[:, i] * weight
+    return total
+
 
 class LevelIndex:
-    def __init__(self, data: pd.DataFrame, params: dict):
+    def __init__(self, data: pd.DataFrame, params: dict, dividends: DividendSchedule = None, fx: FXMatrix = None):
         """
-        data: DataFrame with all necessary columns:
+        data: DataFrame (or compact MarketData block) with all necessary columns:
               - component close prices (e.g., 'AAPL', 'MSFT', ...)
               - optional 'dividend_{ticker}', 'benchmark', 'fx_{ticker}', etc.
+              It is read, never modified, so it is not copied.
         params: configuration dictionary
+        dividends: optional DividendSchedule aligned to `data`; by default the
+              'dividend_{ticker}' yield columns are used
+        fx: optional FXMatrix aligned to `data`; without it component prices
+              are used as quoted (as in 'Quanto')
         """
-        self.data = data.copy()
+        self.data = data
+        self.dividends = dividends
+        self.fx = fx
         self.params = params
         self.components = params["components"]
         self.weights = np.array([c["weight"] for c in self.components]) / 100
         self.return_type = params["return_type"]
         self.base_level = 100.0
 
+    @TRACER.trace("index.compute")
     def compute(self):
-        tickers = [c["ticker"] for c in self.components]
-        prices = self.data[tickers].copy()
+        total_return = self.total_returns()
+
+        # Apply volatility targeting if enable
+        # d
+        if self.params.get("use_vol_target", False):
+            total_return = self._apply_volatility_targeting(total_return)
 
-        # FX conversion if needed
-        # if "index_currency" in self.params:
-        #     index_ccy = self.params["index_currency"]
-        #     for ticker in tickers:
-        #         fx_col = f"fx_{ticker}"
-        #         if fx_col in self.data.columns:
-        #             prices[ticker] *= self.data[fx_col]  # Convert to index currency
+        # Compute index level
+        index_level = (1 + total_return).cumprod() * self.base_level
+        df = pd.DataFrame({"index_value": index_level}).reset_index()
+        return df
 
-        # Price returns
-        price_returns = prices.pct_change().fillna(0)
-        weighted_price_return = price_returns.dot(self.weights)
+    def total_returns(self) -> pd.Series:
+        """
+        Daily total return of the index before the volatility-target overlay.
+        """
+        tickers = [c["ticker"] for c in self.components]
+        dates = self.data.index
+        prices = self._price_matrix(tickers)
+
+        # FX: index-currency prices (Unhedged), local prices (Quanto) or
+        # local prices with a rolled forward hedge (Hedged)
+        if self.fx is not None:
+            prices = self._fx_adjusted(prices, tickers)
+
+        # Price returns: drifting holdings between rebalance dates if rebalancing is set,
+        # otherwise constant weights applied to daily returns
+        if "rebalancing_freq" in self.params:
+            engine = RebalancingEngine(
+                prices, self.weights, self.params["rebalancing_freq"], self.params.get("transaction_cost", 0.0),
+                dates=dates,
+            )
+            weighted_price_return = pd.Series(engine.compute(), index=dates)
+        else:
+            weighted_price_return = pd.Series(weighted_sum(pad_returns(prices), self.weights), index=dates)
 
         # Adjust return type
         total_return = weighted_price_return.copy()
@@ -40,65 +93,124 @@ class LevelIndex:
             pass
 
         elif self.return_type == "Excess Return":
-            benchmark_col = self.params["excess_return_benchmark"]
-            if benchmark_col not in self.data.columns:
-                raise ValueError(f"Missing benchmark column: {benchmark_col}")
-            benchmark_daily_rate = self.data[benchmark_col] / 100 / 252  # annual to daily
+            benchmark_daily_rate = self._accrue(self._benchmark_rates())  # annual to daily
             total_return -= benchmark_daily_rate.fillna(0)
 
-        elif self.return_type == "Total Return":
-            total_return += self._aggregate_dividends(gross=True)
+        elif self.return_type in ("Total Return", "Net Total Return", "Gross Return",
+                                  "Synthetic Dividend Total Return"):
+            total_return += self.income_returns()
 
-        elif self.return_type == "Net Total Return":
-            withholding = self.params.get("withholding_rate", 15.0) / 100
-            total_return += self._aggregate_dividends(gross=False, withholding=withholding)
+        else:
+            raise ValueError(f"Unsupported return type: {self.return_type}")
 
-        elif self.return_type == "Gross Return":
-            total_return += self._aggregate_dividends(gross=True)
+        return total_return
 
-        elif self.return_type == "Synthetic Dividend Total Return":
+    def income_returns(self) -> pd.Series:
+        """
+        Daily income (dividend) part of `total_returns`: the weighted
+        dividends of the total return types, the synthetic dividend, and 0
+        for price and excess return indices.
+        """
+        if self.return_type in ("Total Return", "Gross Return"):
+            return self._aggregate_dividends(gross=True)
+        if self.return_type == "Net Total Return":
+            return self._aggregate_dividends(gross=False, withholding=self._withholding())
+        if self.return_type == "Synthetic Dividend Total Return":
             level = self.params.get("synthetic_dividend_level", 2.0) / 100  # % per year
-            daily_dividend = level / 252
-            total_return += daily_dividend
+            return self._accrue(level)
+        return pd.Series(0.0, index=self.data.index)
 
-        else:
-            raise ValueError(f"Unsupported return type: {self.return_type}")
+    def _benchmark_rates(self) -> pd.Series:
+        """
+        Annual rate of params['excess_return_benchmark'] on each date: the
+        local fixings of the rate store where published, otherwise the
+        downloaded benchmark column (quoted in %).
+        """
+        benchmark_col = self.params["excess_return_benchmark"]
+        published = self.data[benchmark_col] / 100 if benchmark_col in self.data.columns else None
+        return pd.Series(get_rate_store().with_fixings(benchmark_col, self.data.index, published), index=self.data.index)
 
-        # Apply volatility targeting if enable
-        # d
-        if self.params.get("use_vol_target", False):
-            total_return = self._apply_volatility_targeting(total_return)
+    def _accrue(self, annual_rate):
+        """
+        Amount of an annual rate earned on each fixing: the year fraction since
+        the previous fixing under params['act_method'] (and the holiday
+        calendar params['calendar']), or 1/252 when no convention is set.
+        """
+        if "act_method" not in self.params:
+            return annual_rate / 252
+        calendar = get_calendar(self.params.get("calendar", "WEEKEND"))
+        accrual = accrual_factors(self.data.index, self.params["act_method"], calendar)
+        return annual_rate * pd.Series(accrual, index=self.data.index)
 
-        # Compute index level
-        index_level = (1 + total_return).cumprod() * self.base_level
-        df = pd.DataFrame({"index_value": index_level}).reset_index()
-        return df
+    def _fx_mode(self):
+        """
+        params['fx_mode'] ('Unhedged' by default), forced to 'Hedged' when params['fx_hedged'] is set.
+        """
+        mode = "Hedged" if self.params.get("fx_hedged") else self.params.get("fx_mode", "Unhedged")
+        if mode not in FX_MODES:
+            raise ValueError(f"Unsupported FX mode: {mode}")
+        return mode
+
+    def _price_matrix(self, tickers) -> np.ndarray:
+        """
+        (dates × components) float64 prices, read straight from the block
+        when `data` is a MarketData.
+        """
+        if isinstance(self.data, MarketData):
+            return self.data.matrix(tickers)
+        return self.data[tickers].to_numpy(dtype=float)
+
+    def _fx_adjusted(self, prices: np.ndarray, tickers) -> np.ndarray:
+        """
+        Component price levels in index-currency terms under the FX mode.
+
+        Hedged levels compound the local return plus the hedge P&L of a
+        forward rolled every fixing: r_local * (1 + r_fx) + (F/S - 1), the
+        forward points coming from params['deposit_rates'] (currency →
+        annual %) accrued like the other rates.
+        """
+        mode = self._fx_mode()
+        if mode == "Quanto":
+            return prices
+
+        columns = self.fx.columns(tickers)
+        if mode == "Unhedged":
+            return self.fx.convert(prices, columns)
+
+        accrual = self._accrue(pd.Series(1.0, index=self.data.index)).to_numpy()
+        premium = self.fx.forward_premium(columns, self.params.get("deposit_rates"), accrual)
+        hedged = pad_returns(prices) * (1 + self.fx.returns(columns)) + premium
+        return np.cumprod(1 + hedged, axis=0)
 
     def _aggregate_dividends(self, gross=True, withholding=0.15):
+        """
+        Weighted dividend return of each date, net of `withholding` (a
+        fraction, or one fraction per component) unless `gross`.
+        """
         tickers = [c["ticker"] for c in self.components]
-        total_div = pd.Series(0, index=self.data.index)
+        if self.dividends is None:
+            self.dividends = DividendSchedule.from_columns(self.data, tickers)
 
-        for i, ticker in enumerate(tickers):
-            col = f"dividend_{ticker}"
-            if col in self.data.columns:
-                div = self.data[col].fillna(0)
-                if not gross:
-                    div *= (1 - withholding)
-                total_div += div * self.weights[i]
+        withholding = None if gross else np.broadcast_to(withholding, self.weights.shape)
+        return pd.Series(self.dividends.aggregate(self.weights, withholding), index=self.data.index)
 
-        return total_div
+    def _withholding(self):
+        """
+        Withholding fraction of each component: params['withholding_rates']
+        (ticker → %), else params['jurisdiction_withholding'] (jurisdiction →
+        %) through params['jurisdictions'], else params['withholding_rate'].
+        """
+        return withholding_rates(
+            [c["ticker"] for c in self.components],
+            default=self.params.get("withholding_rate", 15.0),
+            by_ticker=self.params.get("withholding_rates"),
+            jurisdictions=self.params.get("jurisdictions"),
+            by_jurisdiction=self.params.get("jurisdiction_withholding"),
+        )
 
     def _apply_volatility_targeting(self, returns: pd.Series):
-        target = self.params["target_vol"] / 100
-        window = self.params["vol_window"]
-        method = self.params["vol_method"]
-
-        if method == "Historical":
-            vol = returns.rolling(window).std()
-        elif method == "Exponential":
-            vol = returns.ewm(span=window).std()
-        else:
-            raise ValueError(f"Unsupported vol method: {method}")
-
-        leverage = (target / vol).clip(upper=3.0)
-        return returns * leverage.shift(1).fillna(1.0)
\ No newline at end of file
+        """
+        Levers `returns` with the overlay of params (see `VolTarget.from_params`).
+        """
+        overlay = VolTarget.from_params(self.params)
+        return pd.Series(overlay.apply(returns.to_numpy()), index=returns.index)
@@ -0,0 +1,249 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.calendars.business_calendar import get_calendar
+from src.calendars.day_count import accrual_factors
+from src.compute.dividends import DividendSchedule, withholding_rates
+from src.compute.execution import SharedArray, run_tasks, split
+from src.compute.vol_control import VolTarget
+from src.rates.store import get_rate_store
+
+DIVIDEND_RETURN_TYPES = ("Total Return", "Net Total Return", "Gross Return")
+RETURN_TYPES = ("Price Return", "Excess Return", "Synthetic Dividend Total Return") + DIVIDEND_RETURN_TYPES
+
+
+class LevelIndexBatch:
+    """
+    Vectorized LevelIndex over many parameter sets at once.
+
+    Every scenario shares the same components and price history; scenarios
+    differ by their weights, return type and volatility-target overlay. The
+    price returns are computed once and all index paths are produced as a
+    single (dates × scenarios) NumPy array, using the same methodology as
+    `LevelIndex.compute` for each column.
+
+    Attributes
+    ----------
+    data : pd.DataFrame
+        Same layout as the `LevelIndex` input (prices, 'dividend_{ticker}',
+        excess return benchmark column).
+    tickers : list of str
+        Component tickers, in the column order of `weights`.
+    weights : np.ndarray
+        (scenarios × components) weight matrix, in percent.
+    return_types : str or sequence of str
+        One return type for all scenarios or one per scenario.
+    excess_return_benchmark : str or None
+        Benchmark column used by 'Excess Return' scenarios.
+    withholding_rate : float or array
+        Percent withholding of 'Net Total Return' scenarios: scalar, one per
+        scenario, or a (scenarios × components) matrix.
+    synthetic_dividend_level : float or array
+        Percent level of 'Synthetic Dividend Total Return' scenarios (scalar
+        or one per scenario).
+    use_vol_target : bool or array of bool
+        Scenarios on which the volatility-target overlay is applied.
+    target_vol, vol_window, vol_method : scalar or array
+        Overlay parameters, as in `LevelIndex` params.
+    vol_lag, leverage_cap, leverage_floor, vol_cost : scalar or array
+        Lag, leverage bounds and cost of the overlay (see `VolTarget`).
+    act_method : str, None or array
+        Day count convention accruing the benchmark rate and the synthetic
+        dividend (None: 1/252 per fixing), as in `LevelIndex` params.
+    calendar : str
+        Holiday calendar used to accrue the first fixing.
+
+    Methods
+    -------
+    compute()
+        Returns the (dates × scenarios) array of index levels.
+    from_params(data, params_list)
+        Builds a batch from a list of `LevelIndex` params dicts.
+    """
+
+    def __init__(self, data: pd.DataFrame, tickers, weights, return_types="Price Return",
+                 excess_return_benchmark=None, withholding_rate=15.0, synthetic_dividend_level=2.0,
+                 use_vol_target=False, target_vol=10.0, vol_window=60, vol_method="Historical",
+                 vol_lag=1, leverage_cap=3.0, leverage_floor=0.0, vol_cost=0.0,
+                 act_method=None, calendar="WEEKEND"):
+        self.data = data
+        self.tickers = list(tickers)
+        self.weights = np.atleast_2d(np.asarray(weights, dtype=float)) / 100
+        self.n_scenarios = self.weights.shape[0]
+
+        if self.weights.shape[1] != len(self.tickers):
+            raise ValueError("weights must have one column per ticker.")
+
+        self.return_types = self._per_scenario(return_types, object)
+        self.excess_return_benchmark = excess_return_benchmark
+        if np.ndim(withholding_rate) == 2:
+            self.withholding_rate = np.asarray(withholding_rate, dtype=float)
+            if self.withholding_rate.shape != self.weights.shape:
+                raise ValueError("withholding_rate matrix must have the shape of weights.")
+        else:
+            self.withholding_rate = np.repeat(self._per_scenario(withholding_rate, float)[:, None],
+                                              len(self.tickers), axis=1)
+        self.synthetic_dividend_level = self._per_scenario(synthetic_dividend_level, float)
+        self.use_vol_target = self._per_scenario(use_vol_target, bool)
+        self.target_vol = self._per_scenario(target_vol, float)
+        self.vol_window = self._per_scenario(vol_window, int)
+        self.vol_method = self._per_scenario(vol_method, object)
+        self.vol_lag = self._per_scenario(vol_lag, int)
+        self.leverage_cap = self._per_scenario(leverage_cap, float)
+        self.leverage_floor = self._per_scenario(leverage_floor, float)
+        self.vol_cost = self._per_scenario(vol_cost, float)
+        self.act_method = self._per_scenario(act_method, object)
+        self.calendar = calendar
+        self.base_level = 100.0
+        self.dates = data.index
+
+        unsupported = set(self.return_types) - set(RETURN_TYPES)
+        if unsupported:
+            raise ValueError(f"Unsupported return type: {sorted(unsupported)[0]}")
+
+    @classmethod
+    def from_params(cls, data: pd.DataFrame, params_list):
+        """
+        Builds a batch from `LevelIndex` params dicts sharing the same tickers.
+        """
+        tickers = [c["ticker"] for c in params_list[0]["components"]]
+        for params in params_list:
+            if [c["ticker"] for c in params["components"]] != tickers:
+                raise ValueError("All scenarios must share the same component tickers.")
+            if "rebalancing_freq" in params:
+                raise ValueError("LevelIndexBatch does not support periodic rebalancing; use LevelIndex.compute.")
+
+        def column(key, default):
+            return [p.get(key, default) for p in params_list]
+
+        return cls(
+            data,
+            tickers,
+            weights=[[c["weight"] for c in p["components"]] for p in params_list],
+            return_types=column("return_type", "Price Return"),
+            excess_return_benchmark=next((p["excess_return_benchmark"] for p in params_list
+                                          if p.get("excess_return_benchmark")), None),
+            withholding_rate=[
+                withholding_rates(tickers, p.get("withholding_rate", 15.0), p.get("withholding_rates"),
+                                  p.get("jurisdictions"), p.get("jurisdiction_withholding")) * 100
+                for p in params_list
+            ],
+            synthetic_dividend_level=column("synthetic_dividend_level", 2.0),
+            use_vol_target=column("use_vol_target", False),
+            target_vol=column("target_vol", 10.0),
+            vol_window=column("vol_window", 60),
+            vol_method=column("vol_method", "Historical"),
+            vol_lag=column("vol_lag", 1),
+            leverage_cap=column("leverage_cap", 3.0),
+            leverage_floor=column("leverage_floor", 0.0),
+            vol_cost=column("vol_cost", 0.0),
+            act_method=column("act_method", None),
+            calendar=params_list[0].get("calendar", "WEEKEND"),
+        )
+
+    def compute(self) -> np.ndarray:
+        # Price returns are shared by every scenario
+        price_returns = self.data[self.tickers].pct_change().fillna(0).to_numpy(dtype=float)
+        total_return = price_returns @ self.weights.T
+
+        excess = self.return_types == "Excess Return"
+        if excess.any():
+            benchmark_col = self.excess_return_benchmark
+            published = self.data[benchmark_col] / 100 if benchmark_col in self.data.columns else None
+            benchmark_rate = np.nan_to_num(get_rate_store().with_fixings(benchmark_col, self.data.index, published))
+            total_return[:, excess] -= self._accrue(benchmark_rate[:, None], excess)
+
+        # (scenarios × components) share of each dividend kept by each scenario
+        dividend_factor = np.zeros(self.weights.shape)
+        dividend_factor[np.isin(self.return_types, DIVIDEND_RETURN_TYPES)] = 1.0
+        net = self.return_types == "Net Total Return"
+        dividend_factor[net] = 1 - self.withholding_rate[net] / 100
+        if dividend_factor.any():
+            dividends = DividendSchedule.from_columns(self.data, self.tickers).matrix()
+            total_return += dividends @ (self.weights * dividend_factor).T
+
+        synthetic = self.return_types == "Synthetic Dividend Total Return"
+        if synthetic.any():
+            total_return[:, synthetic] += self._accrue(self.synthetic_dividend_level[synthetic] / 100, synthetic)
+
+        if self.use_vol_target.any():
+            self._apply_volatility_targeting(total_return)
+
+        return np.cumprod(1 + total_return, axis=0) * self.base_level
+
+    def to_frame(self, levels: np.ndarray = None) -> pd.DataFrame:
+        """
+        Wraps computed levels in a DataFrame indexed by date, one column per scenario.
+        """
+        levels = self.compute() if levels is None else levels
+        return pd.DataFrame(levels, index=self.dates)
+
+    def _accrue(self, annual_rate, mask):
+        """
+        (dates × selected scenarios) amounts of `annual_rate` earned on each
+        fixing, under each scenario's day count convention as in `LevelIndex._accrue`.
+        """
+        methods = self.act_method[mask]
+        rates = np.broadcast_to(annual_rate, (len(self.dates), len(methods)))
+        amounts = np.empty(rates.shape)
+        for method in set(methods):
+            cols = methods == method
+            if method is None:
+                amounts[:, cols] = rates[:, cols] / 252
+            else:
+                accrual = accrual_factors(self.dates, method, get_calendar(self.calendar))
+                amounts[:, cols] = rates[:, cols] * accrual[:, None]
+        return amounts
+
+    def _apply_volatility_targeting(self, total_return: np.ndarray):
+        """
+        Applies the overlay in place, one 2-D pass per (method, window, lag) group.
+        """
+        targeted = np.flatnonzero(self.use_vol_target)
+        groups = {}
+        for s in targeted:
+            groups.setdefault((self.vol_method[s], self.vol_window[s], self.vol_lag[s]), []).append(s)
+
+        for (method, window, lag), cols in groups.items():
+            overlay = VolTarget(self.target_vol[cols], window, method, lag=lag, cap=self.leverage_cap[cols],
+                                floor=self.leverage_floor[cols], cost=self.vol_cost[cols])
+            total_return[:, cols] = overlay.apply(total_return[:, cols])
+
+    def _per_scenario(self, value, dtype):
+        if np.ndim(value) == 0:
+            return np.full(self.n_scenarios, value, dtype=dtype)
+        value = np.asarray(value, dtype=dtype)
+        if value.shape != (self.n_scenarios,):
+            raise ValueError(f"Expected one value per scenario ({self.n_scenarios}), got shape {value.shape}.")
+        return value
+
+
+def compute_scenario_grid(data: pd.DataFrame, params_list, backend="serial", workers=None) -> np.ndarray:
+    """
+    Computes a large scenario grid split across workers.
+
+    The input frame is placed once in shared memory; each worker attaches to
+    it, builds a `LevelIndexBatch` over its slice of `params_list` and returns
+    its (dates × scenarios) block. Blocks are concatenated in scenario order.
+    """
+    workers = workers or os.cpu_count() or 1
+    slices = split(len(params_list), workers if backend != "serial" else 1)
+
+    with SharedArray(data.to_numpy(dtype=float)) as shared:
+        tasks = [(shared.spec, data.index, list(data.columns), params_list[s]) for s in slices]
+        blocks = run_tasks(_compute_grid_slice, tasks, backend=backend, workers=workers)
+    return np.concatenate(blocks, axis=1)
+
+
+def _compute_grid_slice(spec, index, columns, params_list):
+    handle, values = SharedArray.attach(spec)
+    try:
+        data = pd.DataFrame(values, index=index, columns=columns, copy=False)
+        levels = LevelIndexBatch.from_params(data, params_list).compute()
+        del data
+    finally:
+        del values
+        handle.close()
+    return levels
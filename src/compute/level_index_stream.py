@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from src.calendars.business_calendar import get_calendar
+from src.calendars.day_count import year_fraction
+from src.compute.level_index import LevelIndex, weighted_sum
+from src.compute.vol_control import VolTarget
+from src.rates.store import get_rate_store
+
+
+class LevelIndexStream:
+    """
+    Incremental LevelIndex for live publication.
+
+    Holds the last prices, the cumulative level, the volatility accumulators
+    and the lagged leverage of the vol-target overlay, so that each new daily
+    fixing is processed in O(components) instead of recomputing the whole
+    history. Levels are bit-for-bit identical to `LevelIndex.compute` over
+    the same rows.
+
+    Attributes
+    ----------
+    params : dict
+        Same configuration dictionary as `LevelIndex`.
+    dates : list
+        Dates processed so far.
+
+    Methods
+    -------
+    from_history(data, params)
+        Builds a stream and replays an existing history through it.
+    update(rows)
+        Processes new rows (one or a small batch) and returns their levels.
+    update_row(date, row)
+        Processes a single fixing and returns the new level.
+    """
+
+    def __init__(self, params: dict):
+        # Reuse LevelIndex parameter parsing so both paths read params identically
+        spec = LevelIndex(pd.DataFrame(), params)
+        self.params = params
+        self.tickers = [c["ticker"] for c in spec.components]
+        self.weights = spec.weights
+        self.return_type = spec.return_type
+        self.base_level = spec.base_level
+        self.withholding = spec._withholding()
+
+        if self.return_type not in ("Price Return", "Excess Return", "Total Return", "Net Total Return",
+                                    "Gross Return", "Synthetic Dividend Total Return"):
+            raise ValueError(f"Unsupported return type: {self.return_type}")
+
+        if "rebalancing_freq" in params:
+            raise ValueError("LevelIndexStream does not support periodic rebalancing; use LevelIndex.compute.")
+
+        self.use_vol_target = params.get("use_vol_target", False)
+        if self.use_vol_target:
+            self.overlay = VolTarget.from_params(params).online()
+
+        self.last_prices = np.full(len(self.tickers), np.nan)
+        self.cumulative = 1.0
+        self.dates = []
+
+    @classmethod
+    def from_history(cls, data: pd.DataFrame, params: dict):
+        stream = cls(params)
+        stream.update(data)
+        return stream
+
+    @property
+    def level(self) -> float:
+        return self.cumulative * self.base_level
+
+    def update(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Processes `rows` in date order and returns their index levels in the
+        same layout as `LevelIndex.compute`.
+        """
+        levels = [self.update_row(date, row) for date, row in rows.iterrows()]
+        return pd.DataFrame({rows.index.name or "index": rows.index, "index_value": levels})
+
+    def update_row(self, date, row) -> float:
+        """
+        Processes one fixing. `row` maps column names (component tickers,
+        'dividend_{ticker}', excess return benchmark) to their values.
+        """
+        if self.dates and date <= self.dates[-1]:
+            raise ValueError(f"Fixing for {date} is not after the last processed date {self.dates[-1]}.")
+
+        total_return = self._price_return(row) + self._overlay_return(row, date)
+
+        if self.use_vol_target:
+            total_return = self.overlay.update(total_return)
+
+        self.cumulative *= 1 + total_return
+        self.dates.append(date)
+        return self.cumulative * self.base_level
+
+    def _price_return(self, row) -> float:
+        prices = np.array([row.get(t, np.nan) for t in self.tickers], dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = prices / self.last_prices - 1
+        # Missing prices are padded forward, as pct_change does
+        self.last_prices = np.where(np.isnan(prices), self.last_prices, prices)
+        returns = np.where(np.isnan(returns), 0.0, returns)
+        return weighted_sum(returns[None, :], self.weights)[0]
+
+    def _accrue(self, annual_rate, date) -> float:
+        """
+        Amount of an annual rate earned on the fixing `date`, accrued from the
+        previous fixing as in `LevelIndex._accrue`.
+        """
+        if "act_method" not in self.params:
+            return annual_rate / 252
+        if self.dates:
+            previous = self.dates[-1]
+        else:
+            previous = get_calendar(self.params.get("calendar", "WEEKEND")).offset(date, -1, "preceding")
+        return annual_rate * float(year_fraction(previous, date, self.params["act_method"]))
+
+    def _overlay_return(self, row, date) -> float:
+        if self.return_type == "Excess Return":
+            benchmark_col = self.params["excess_return_benchmark"]
+            published = [row[benchmark_col] / 100] if benchmark_col in row else None
+            rate = self._accrue(float(get_rate_store().with_fixings(benchmark_col, [date], published)[0]), date)
+            return -(0.0 if rate != rate else rate)
+
+        if self.return_type in ("Total Return", "Gross Return"):
+            return self._aggregate_dividends(row, gross=True)
+
+        if self.return_type == "Net Total Return":
+            return self._aggregate_dividends(row, gross=False)
+
+        if self.return_type == "Synthetic Dividend Total Return":
+            level = self.params.get("synthetic_dividend_level", 2.0) / 100
+            return self._accrue(level, date)
+
+        return 0.0
+
+    def _aggregate_dividends(self, row, gross=True) -> float:
+        total_div = 0
+        for i, ticker in enumerate(self.tickers):
+            col = f"dividend_{ticker}"
+            if col in row:
+                div = row[col]
+                div = 0.0 if div != div else div
+                if not gross:
+                    div *= (1 - self.withholding[i])
+                total_div += div * self.weights[i]
+        return total_div
@@ -0,0 +1,243 @@
+import numpy as np
+
+from src.compute.execution import MeanEstimator, ReplicatedMeanEstimator
+
+# Upper bound on normal draws held in memory per chunk (paths × steps × assets)
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+# Independently shifted Halton sequences of a quasi-random run (its standard error comes from their spread)
+REPLICATIONS = 16
+
+_PRIMES = None
+
+
+class GBMPathSimulator:
+    """
+    Correlated multi-asset geometric Brownian motion on a fixed time grid.
+
+    Paths are produced in chunks as (paths × steps × assets) arrays of
+    performances S_t / S_0, so memory stays bounded whatever the total number
+    of paths. Chunks are generated from independent RNG streams spawned from
+    one seed, which makes the result reproducible for a given chunk size.
+
+    Attributes
+    ----------
+    vols : np.ndarray
+        Annualized volatilities, one per asset.
+    corr : np.ndarray
+        (assets × assets) correlation matrix.
+    rate : float
+        Continuously compounded risk-free rate.
+    div_yields : np.ndarray
+        Continuous dividend yields, one per asset.
+    times : np.ndarray
+        Increasing simulation times in years (the initial time 0 excluded).
+    antithetic : bool
+        Pairs every draw with its negation; chunks then hold both halves.
+    sampling : str
+        'pseudo' for PCG64 normals, 'quasi' for randomized Halton normals.
+        Quasi-random sampling is only effective for short grids (a few dozen
+        dimensions, e.g. annual or quarterly observation schedules).
+    replications : int
+        Quasi-random runs interleave this many copies of one Halton sequence,
+        each with its own random shift drawn from the run seed (sample g uses
+        point g // replications with shift g % replications), so that
+        `estimator` can measure the error across replications.
+
+    Methods
+    -------
+    plan(n_paths, chunk_size, seed)
+        Splits a run into independently seeded chunks.
+    chunks(n_paths, chunk_size, seed)
+        Yields (paths × steps × assets) performance arrays.
+    normals(n, seed_sequence, offset)
+        Draws the (n × steps × assets) standard normals used for one chunk.
+    estimator(samples, offset)
+        Mean estimator of one chunk's samples, merged across chunks.
+    """
+
+    def __init__(self, vols, corr, rate, div_yields, times, antithetic=True, sampling="pseudo",
+                 replications=REPLICATIONS):
+        self.vols = np.asarray(vols, dtype=float)
+        self.corr = np.atleast_2d(np.asarray(corr, dtype=float))
+        self.rate = rate
+        self.div_yields = np.broadcast_to(np.asarray(div_yields, dtype=float), self.vols.shape)
+        self.times = np.asarray(times, dtype=float)
+        self.antithetic = antithetic
+        self.sampling = sampling
+        self.replications = replications
+
+        if sampling not in ("pseudo", "quasi"):
+            raise ValueError(f"Unsupported sampling: {sampling}")
+        if self.corr.shape != (len(self.vols), len(self.vols)):
+            raise ValueError("corr must be a square matrix with one row per asset.")
+
+        self.cholesky = np.linalg.cholesky(self.corr)
+        self.dt = np.diff(self.times, prepend=0.0)
+
+    @property
+    def n_steps(self):
+        return len(self.times)
+
+    @property
+    def n_assets(self):
+        return len(self.vols)
+
+    def default_chunk_size(self):
+        chunk = max(1, MAX_CHUNK_ELEMENTS // (self.n_steps * self.n_assets))
+        return chunk + chunk % 2 if self.antithetic else chunk
+
+    def plan(self, n_paths, chunk_size=None, seed=None):
+        """
+        Splits `n_paths` into chunks, each with its own spawned seed stream.
+
+        Returns:
+            list of tuple: (n, seed_sequence, offset) per chunk. The plan only
+            depends on `n_paths`, `chunk_size` and `seed`, so chunks can be
+            simulated in any order or on any worker with identical results.
+        """
+        chunk_size = chunk_size or self.default_chunk_size()
+        if self.antithetic and chunk_size % 2:
+            raise ValueError("chunk_size must be even with antithetic sampling.")
+
+        n_chunks = -(-n_paths // chunk_size)
+        streams = np.random.SeedSequence(seed).spawn(n_chunks)
+        plan = []
+        for i, stream in enumerate(streams):
+            n = min(chunk_size, n_paths - i * chunk_size)
+            plan.append((n + n % 2 if self.antithetic else n, stream, i * chunk_size))
+        return plan
+
+    def chunks(self, n_paths, chunk_size=None, seed=None):
+        """
+        Yields performance arrays covering `n_paths` paths in total.
+        """
+        for n, stream, offset in self.plan(n_paths, chunk_size, seed):
+            yield self.performances(self.normals(n, stream, offset))
+
+    def normals(self, n, seed_sequence, offset=0):
+        """
+        Draws (n × steps × assets) independent standard normals.
+        """
+        half = n // 2 if self.antithetic else n
+        shape = (half, self.n_steps, self.n_assets)
+        rng = np.random.default_rng(seed_sequence)
+
+        if self.sampling == "pseudo":
+            z = rng.standard_normal(shape)
+        else:
+            # Cranley-Patterson shifts of the Halton points, one per replication
+            dim = self.n_steps * self.n_assets
+            samples = self._sample_index(half, offset)
+            u = (halton_at(samples // self.replications + 1, dim)
+                 + self._shifts(seed_sequence, dim)[samples % self.replications]) % 1.0
+            z = norm_ppf(np.clip(u, 1e-12, 1 - 1e-12)).reshape(shape)
+
+        if self.antithetic:
+            z = np.concatenate([z, -z], axis=0)
+        return z
+
+    def estimator(self, samples, offset=0):
+        """
+        Mean estimator of one chunk's samples (one per path, or per
+        antithetic pair): plain for pseudo-random draws, split by
+        replication for quasi-random ones.
+        """
+        if self.sampling == "pseudo":
+            return MeanEstimator.from_samples(samples)
+        labels = self._sample_index(len(samples), offset) % self.replications
+        return ReplicatedMeanEstimator.from_samples(samples, labels, self.replications)
+
+    def _sample_index(self, n, offset):
+        # Position of each independent sample of a chunk in the whole run (antithetic pairs count once)
+        return np.arange(n) + offset // (2 if self.antithetic else 1)
+
+    def _shifts(self, seed_sequence, dim):
+        """
+        (replications × dim) uniform shifts, drawn from the root seed shared
+        by every chunk stream spawned from it.
+        """
+        root = np.random.SeedSequence(seed_sequence.entropy)
+        return np.random.default_rng(root).random((self.replications, dim))
+
+    def performances(self, z, vols=None, rate=None):
+        """
+        Maps standard normals to S_t / S_0 paths, optionally with bumped
+        `vols` / `rate` (broadcast over a leading scenario axis).
+        """
+        vols = self.vols if vols is None else np.asarray(vols, dtype=float)
+        rate = self.rate if rate is None else np.asarray(rate, dtype=float)[..., None]
+
+        drift = (rate - self.div_yields - 0.5 * vols ** 2)[..., None, None, :] * self.dt[:, None]
+        shocks = (z @ self.cholesky.T) * np.sqrt(self.dt)[:, None]
+        log_paths = np.cumsum(drift + shocks * vols[..., None, None, :], axis=-2)
+        return np.exp(log_paths)
+
+
+def halton(n, dim, skip=0):
+    """
+    First `n` points (after `skip`) of the `dim`-dimensional Halton sequence.
+    """
+    return halton_at(np.arange(skip + 1, skip + n + 1, dtype=np.int64), dim)
+
+
+def halton_at(index, dim):
+    """
+    Points number `index` (array of positive integers) of the `dim`-dimensional Halton sequence.
+    """
+    bases = _first_primes(dim)
+    index = np.asarray(index, dtype=np.int64)
+    points = np.empty((len(index), dim))
+    for d, base in enumerate(bases):
+        result = np.zeros(len(index))
+        fraction = 1.0 / base
+        i = index.copy()
+        while i.any():
+            result += (i % base) * fraction
+            i //= base
+            fraction /= base
+        points[:, d] = result
+    return points
+
+
+def norm_ppf(p):
+    """
+    Inverse standard normal CDF (Acklam's rational approximation, |rel err| < 1.2e-9).
+    """
+    a = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+    b = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01)
+    c = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+    d = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+         3.754408661907416e+00)
+
+    p = np.asarray(p, dtype=float)
+    x = np.empty_like(p)
+    low, high = p < 0.02425, p > 1 - 0.02425
+    mid = ~(low | high)
+
+    q = p[mid] - 0.5
+    r = q * q
+    x[mid] = ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q
+              / (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1))
+
+    for mask, sign in ((low, 1.0), (high, -1.0)):
+        q = np.sqrt(-2 * np.log(np.where(sign > 0, p[mask], 1 - p[mask])))
+        x[mask] = sign * ((((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5])
+                          / ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1))
+    return x
+
+
+def _first_primes(n):
+    global _PRIMES
+    if _PRIMES is None or len(_PRIMES) < n:
+        limit = max(16, int(n * (np.log(n + 1) + np.log(np.log(n + 2)) + 2)))
+        sieve = np.ones(limit + 1, dtype=bool)
+        sieve[:2] = False
+        for i in range(2, int(limit ** 0.5) + 1):
+            if sieve[i]:
+                sieve[i * i::i] = False
+        _PRIMES = np.flatnonzero(sieve)
+    return _PRIMES[:n]
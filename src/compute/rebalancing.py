@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from api.market_data import pad_returns
+from src.calendars.business_calendar import period_ends
+
+REBALANCING_FREQUENCIES = ("Daily", "Weekly", "Monthly", "Quarterly")
+
+
+class RebalancingEngine:
+    """
+    Basket returns with drifting holdings between rebalance dates.
+
+    Holdings are reset to the target weights at the close of each rebalance
+    date (the last trading day of every week, month or quarter) and drift
+    with prices in between. Each rebalance is charged `transaction_cost`
+    on the two-way turnover (buys plus sells, the sum of the absolute
+    weight changes) between the drifted and target weights. Any
+    weight left unallocated (weights summing below 100%) is held in cash at
+    a zero return.
+
+    Everything is computed with array operations over the whole history: the
+    per-component growth is cumulated once, each date is mapped to the
+    rebalance date anchoring its period, and the portfolio value is chained
+    across periods with a single cumulative product.
+
+    Attributes:
+        prices (pd.DataFrame or np.ndarray): Component prices, one column per
+            component; a (dates × components) array needs `dates`.
+        weights (np.ndarray): Target weights as fractions.
+        frequency (str): 'Daily', 'Weekly', 'Monthly' or 'Quarterly'.
+        transaction_cost (float): Cost in % of traded notional.
+        dates (array): Dates of the rows, defaults to the index of `prices`.
+
+    Example:
+        RebalancingEngine(prices, np.array([0.5, 0.5]), "Monthly", 0.05).compute()
+    """
+
+    def __init__(self, prices, weights, frequency="Daily", transaction_cost=0.0, dates=None):
+        if frequency not in REBALANCING_FREQUENCIES:
+            raise ValueError(f"Unsupported rebalancing frequency: {frequency}")
+
+        self.prices = prices
+        self.dates = prices.index if dates is None else dates
+        self.weights = np.asarray(weights, dtype=float)
+        self.frequency = frequency
+        self.transaction_cost = transaction_cost / 100
+
+    def rebalance_mask(self) -> np.ndarray:
+        """
+        True on the dates at whose close the basket is rebalanced.
+        """
+        return period_ends(self.dates, self.frequency)
+
+    def compute(self) -> np.ndarray:
+        """
+        Daily returns of the rebalanced basket, net of transaction costs.
+        """
+        prices = self.prices.to_numpy(dtype=float) if isinstance(self.prices, pd.DataFrame) else self.prices
+        returns = pad_returns(prices)
+        n = len(returns)
+        if n == 0:
+            return np.zeros(0)
+
+        growth = np.cumprod(1 + returns, axis=0)
+
+        # Rebalance dates (inception included) and the one anchoring each date's period
+        rebalance = np.union1d([0], np.flatnonzero(self.rebalance_mask()))
+        anchor = rebalance[np.maximum(np.searchsorted(rebalance, np.arange(n), side="left") - 1, 0)]
+
+        # Value of one unit invested at the anchor, held without trading
+        relative = growth / growth[anchor]
+        cash = 1.0 - self.weights.sum()
+        period_value = relative @ self.weights + cash
+
+        # Two-way turnover at each rebalance date, from drifted back to target weights
+        ends = rebalance[1:]
+        drifted = relative[ends] * self.weights / period_value[ends, None]
+        turnover = np.abs(drifted - self.weights).sum(axis=1)
+        cost_factor = np.ones(n)
+        cost_factor[ends] = 1 - self.transaction_cost * turnover
+
+        # Chain the value at rebalance dates, then scale each period from its anchor
+        anchor_value = np.ones(n)
+        anchor_value[ends] = np.cumprod(period_value[ends] * cost_factor[ends])
+        value = anchor_value[anchor] * period_value * cost_factor
+        value[0] = 1.0
+
+        daily = np.zeros(n)
+        daily[1:] = value[1:] / value[:-1] - 1
+        return daily
@@ -0,0 +1,349 @@
+import numpy as np
+import pandas as pd
+
+from api.config import STRESS_WINDOWS
+from api.market_data import MarketData, pad, pad_returns
+from src.calendars.business_calendar import get_calendar, period_ends
+from src.calendars.day_count import year_fraction
+from src.compute.level_index import LevelIndex
+from src.compute.rebalancing import RebalancingEngine
+from src.compute.vol_control import VolTarget
+from src.rates.store import get_rate_store
+from src.wrapper.note import Note
+
+SCENARIO_KINDS = ("Historical", "Hypothetical")
+
+
+def covered_windows(dates, windows=None) -> dict:
+    """
+    Stress windows (default: STRESS_WINDOWS) lying within `dates`.
+    """
+    windows = STRESS_WINDOWS if windows is None else windows
+    first, last = pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])
+    return {name: (start, end) for name, (start, end) in windows.items()
+            if first <= pd.Timestamp(start) and pd.Timestamp(end) <= last}
+
+
+class Scenario:
+    """
+    Stress scenario on the basket, replayed as shocked fixings after the last
+    date of history.
+
+    A 'Historical' scenario replays the component returns and the change of
+    the rate column between the closes of `start` and `end`. A
+    'Hypothetical' scenario moves every component by `equity` (a fraction,
+    or ticker → fraction) spread geometrically over `horizon` fixings and
+    shifts rates by `rates_bp` from the first of them. `vol` shifts the
+    volatilities used to revalue the wrapper.
+
+    Only the parameters are stored; the shocked fixings are generated when
+    the scenario is revalued.
+
+    Attributes:
+        name (str): Label of the scenario in the results.
+        kind (str): 'Historical' or 'Hypothetical'.
+        start, end (date): Historical window.
+        equity (float or dict): Hypothetical equity move.
+        rates_bp (float): Hypothetical rate shift in basis points.
+        vol (float): Additive volatility shift (0.05 = +5 vol points).
+        horizon (int): Hypothetical fixings over which the move is spread.
+
+    Example:
+        Scenario.historical("COVID Crash", "2020-02-19", "2020-03-23")
+        Scenario.hypothetical("Equity -30%, rates +200bp", equity=-0.30, rates_bp=200)
+    """
+
+    def __init__(self, name, kind="Hypothetical", start=None, end=None, equity=0.0, rates_bp=0.0, vol=0.0,
+                 horizon=1):
+        if kind not in SCENARIO_KINDS:
+            raise ValueError(f"Unsupported scenario kind: {kind}")
+        if kind == "Historical" and (start is None or end is None):
+            raise ValueError("Historical scenarios need a start and an end date.")
+        if horizon < 1:
+            raise ValueError("horizon must be at least one fixing.")
+        self.name = name
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.equity = equity
+        self.rates_bp = rates_bp
+        self.vol = vol
+        self.horizon = horizon
+
+    @classmethod
+    def historical(cls, name, start, end, vol=0.0):
+        return cls(name, "Historical", start=start, end=end, vol=vol)
+
+    @classmethod
+    def hypothetical(cls, name, equity=0.0, rates_bp=0.0, vol=0.0, horizon=1):
+        return cls(name, "Hypothetical", equity=equity, rates_bp=rates_bp, vol=vol, horizon=horizon)
+
+    def window(self, dates) -> tuple:
+        """
+        Positions in `dates` of the closes starting and ending the historical window.
+        """
+        dates = pd.DatetimeIndex(dates)
+        first = dates.searchsorted(pd.Timestamp(self.start))
+        last = dates.searchsorted(pd.Timestamp(self.end), side="right") - 1
+        if pd.Timestamp(self.start) < dates[0] or pd.Timestamp(self.end) > dates[-1] or last <= first:
+            raise ValueError(f"Stress window {self.name} ({self.start} to {self.end}) "
+                             f"is not covered by the price history.")
+        return first, last
+
+    def shocks(self, prices: np.ndarray, rates, dates, tickers) -> tuple:
+        """
+        Shocked fixings: (horizon × components) returns and the (horizon,)
+        shift of the rate column in percentage points.
+
+        Arguments:
+            prices (np.ndarray): (dates × components) history.
+            rates (np.ndarray or None): Rate column history (annual %).
+        """
+        if self.kind == "Historical":
+            first, last = self.window(dates)
+            returns = pad_returns(prices[first:last + 1])[1:]
+            if rates is None:
+                return returns, np.zeros(len(returns))
+            return returns, rates[first + 1:last + 1] - rates[first]
+
+        if isinstance(self.equity, dict):
+            moves = np.array([self.equity.get(t, 0.0) for t in tickers], dtype=float)
+        else:
+            moves = np.full(len(tickers), float(self.equity))
+        daily = (1 + moves) ** (1 / self.horizon) - 1
+        returns = np.broadcast_to(daily, (self.horizon, len(tickers)))
+        return returns, np.full(self.horizon, self.rates_bp / 100)
+
+
+class ScenarioEngine:
+    """
+    Revalues the index, with its volatility-target overlay, and its Note
+    wrapper under many stress scenarios at once.
+
+    The base history is processed once: its index returns and final level
+    are kept, and each scenario only adds its own shocked fixings after the
+    last date. Scenarios are padded to the longest horizon and valued
+    together as (fixings × scenarios) arrays; the volatility-target overlay
+    levers all of them in one `VolTarget.apply` call, seeded with the tail
+    of the unlevered history it depends on (`VolTarget.lookback`), so no
+    scenario copies the history. No dividend is assumed
+    during the shocked fixings; the rate column (params
+    'excess_return_benchmark') is shifted from its last value. The wrapper
+    is revalued at the end of each scenario, the shock being applied
+    instantaneously to today's spots, in one common-random-number
+    simulation (`Note.scenario_prices`).
+
+    Attributes:
+        data (pd.DataFrame or MarketData): History, as for `LevelIndex`.
+        params (dict): Simulation params of the basket and its wrapper.
+        dividends (DividendSchedule): Optional, as for `LevelIndex`.
+        fx (FXMatrix): Optional, as for `LevelIndex`.
+
+    Example:
+        engine = ScenarioEngine(prices, params)
+        table = engine.run([Scenario.historical("COVID Crash", "2020-02-19", "2020-03-23"),
+                            Scenario.hypothetical("Equity -30%", equity=-0.30)])
+    """
+
+    def __init__(self, data, params: dict, dividends=None, fx=None):
+        self.data = data
+        self.params = params
+        self.index = LevelIndex(data, params, dividends=dividends, fx=fx)
+        self.tickers = [c["ticker"] for c in self.index.components]
+        self.rate_column = params.get("excess_return_benchmark")
+        self._base = None
+
+    def base(self) -> dict:
+        """
+        Base history, computed on first use: 'levels' (pd.Series), 'prices'
+        (as seen by the index), 'rates' (or None), the vol-target 'overlay'
+        (or None) and the 'tail' of unlevered returns it needs to lever the
+        following fixings.
+        """
+        if self._base is None:
+            unlevered = self.index.total_returns().to_numpy()
+            returns, overlay, tail = unlevered, None, None
+            if self.params.get("use_vol_target", False):
+                overlay = VolTarget.from_params(self.params)
+                returns = overlay.apply(unlevered)
+                tail = unlevered[-overlay.lookback():]
+
+            prices = self.index._price_matrix(self.tickers)
+            if self.index.fx is not None:
+                prices = self.index._fx_adjusted(prices, self.tickers)
+
+            rates = None
+            if self.rate_column and (self.rate_column in self.data.columns
+                                     or get_rate_store().has_fixings(self.rate_column)):
+                rates = pd.Series(self.index._benchmark_rates().to_numpy() * 100).ffill().fillna(0).to_numpy()
+
+            self._base = {
+                "levels": pd.Series(np.cumprod(1 + returns) * self.index.base_level, index=self.data.index),
+                "prices": prices,
+                "rates": rates,
+                "overlay": overlay,
+                "tail": tail,
+            }
+        return self._base
+
+    def run(self, scenarios, n_paths=20_000, seed=None) -> pd.DataFrame:
+        """
+        Tidy results, one row per scenario after a 'Base' row:
+        'scenario', 'kind', 'start', 'end', 'fixings', 'basket_move' (%),
+        'rate_shift_bp', 'vol_shift', 'index_level', 'index_return' (%),
+        'index_drawdown' (%), and for Note wrappers 'wrapper_price',
+        'wrapper_pnl' (% of notional) and 'wrapper_std_error'.
+        """
+        paths, basket, moves, shifts = self.index_paths(scenarios)
+        base_level = self.base()["levels"].iloc[-1]
+        final = np.array([paths[np.flatnonzero(~np.isnan(paths[:, j]))[-1], j] for j in range(len(scenarios))])
+        fixings = (~np.isnan(paths)).sum(axis=0)
+        final_shift = np.array([s[-1] for s in shifts])
+
+        table = pd.DataFrame({
+            "scenario": ["Base"] + [s.name for s in scenarios],
+            "kind": ["Base"] + [s.kind for s in scenarios],
+            "start": [None] + [s.start for s in scenarios],
+            "end": [None] + [s.end for s in scenarios],
+            "fixings": np.concatenate([[0], fixings]),
+            "basket_move": np.concatenate([[0.0], basket * 100]),
+            "rate_shift_bp": np.concatenate([[0.0], final_shift * 100]),
+            "vol_shift": [0.0] + [s.vol for s in scenarios],
+            "index_level": np.concatenate([[base_level], final]),
+            "index_return": np.concatenate([[0.0], (final / base_level - 1) * 100]),
+            "index_drawdown": np.concatenate([[0.0], np.minimum(np.nanmin(paths, axis=0) / base_level - 1, 0) * 100]),
+        })
+
+        wrapper = self.wrapper_prices(scenarios, moves, final / base_level, final_shift, n_paths, seed)
+        if wrapper is not None:
+            table["wrapper_price"] = wrapper["price"] * 100
+            table["wrapper_pnl"] = (wrapper["price"] - wrapper["price"][0]) * 100
+            table["wrapper_std_error"] = wrapper["std_error"] * 100
+        return table
+
+    def index_paths(self, scenarios) -> tuple:
+        """
+        Index levels over the shocked fixings of every scenario.
+
+        Returns:
+            tuple: (fixings × scenarios) levels, NaN past each horizon; the
+            cumulative basket price move of each scenario; the (scenarios ×
+            components) cumulative component moves; the rate shifts of each
+            scenario (percentage points).
+        """
+        base = self.base()
+        shocks = [s.shocks(base["prices"], base["rates"], self.data.index, self.tickers) for s in scenarios]
+        horizon = max(len(returns) for returns, _ in shocks)
+        n_scenarios = len(scenarios)
+
+        moves = np.zeros((horizon, n_scenarios, len(self.tickers)))
+        shifts = np.zeros((horizon, n_scenarios))
+        valid = np.zeros((horizon, n_scenarios), dtype=bool)
+        for j, (returns, shift) in enumerate(shocks):
+            moves[:len(returns), j] = returns
+            shifts[:len(returns), j] = shift
+            valid[:len(returns), j] = True
+
+        price_return = self._price_returns(moves, valid)
+        total_return = price_return + self._overlay_returns(shifts, horizon)
+        total_return[~valid] = 0.0
+
+        if base["overlay"] is not None:
+            # Every scenario continues the same history: lever them side by side after its tail
+            tail = np.broadcast_to(base["tail"][:, None], (len(base["tail"]), n_scenarios))
+            total_return = base["overlay"].apply(np.vstack([tail, total_return]))[len(tail):]
+
+        levels = np.cumprod(1 + total_return, axis=0) * base["levels"].iloc[-1]
+        levels[~valid] = np.nan
+        basket = np.prod(1 + price_return, axis=0) - 1
+        return levels, basket, np.prod(1 + moves, axis=0), [shift for _, shift in shocks]
+
+    def wrapper_prices(self, scenarios, moves, index_moves, rate_shifts, n_paths=20_000, seed=None):
+        """
+        Note prices (fractions of notional) for the base and every scenario,
+        or None when the wrapper is not a priced Note.
+        """
+        if self.params.get("wrapper") != "Note" or not self.params.get("maturity_years"):
+            return None
+
+        if self.params.get("option_type") == "Single Underlying":
+            underlyings = self.base()["levels"].to_frame("index_value")
+            spot_moves = np.asarray(index_moves)[:, None]
+        else:
+            if isinstance(self.data, MarketData):
+                underlyings = self.data.select(self.tickers).to_frame()
+            else:
+                underlyings = self.data[self.tickers]
+            spot_moves = moves
+
+        note = Note.from_params(self.params, underlyings)
+        n_assets = spot_moves.shape[1]
+        return note.scenario_prices(
+            np.vstack([np.ones(n_assets), spot_moves]),
+            rate_shifts=np.concatenate([[0.0], np.asarray(rate_shifts) / 100]),
+            vol_shifts=np.array([0.0] + [s.vol for s in scenarios]),
+            n_paths=n_paths,
+            seed=seed,
+        )
+
+    def _price_returns(self, moves, valid) -> np.ndarray:
+        """
+        (fixings × scenarios) basket price returns of the (fixings ×
+        scenarios × components) shocked component returns over the `valid`
+        fixings of each scenario: constant weights, or with
+        params['rebalancing_freq'] the drifting holdings and costs of
+        `RebalancingEngine`, continued from the last rebalance of the history
+        (the only part of it the holdings depend on).
+        """
+        if "rebalancing_freq" not in self.params:
+            return moves @ self.index.weights
+
+        prices = self.base()["prices"]
+        dates = np.concatenate([self.data.index.to_numpy().astype("datetime64[D]"), self._shock_dates(len(moves))])
+        rebalances = np.flatnonzero(period_ends(dates, self.params["rebalancing_freq"])[:len(prices)])
+        start = rebalances[-1] if len(rebalances) else 0
+        tail = pad(prices[start:])
+
+        returns = np.zeros(moves.shape[:2])
+        for j in range(moves.shape[1]):
+            fixings = int(valid[:, j].sum())
+            shocked = tail[-1] * np.cumprod(1 + moves[:fixings, j], axis=0)
+            engine = RebalancingEngine(np.vstack([tail, shocked]), self.index.weights, self.params["rebalancing_freq"],
+                                       self.params.get("transaction_cost", 0.0), dates=dates[start:len(prices) + fixings])
+            returns[:fixings, j] = engine.compute()[len(tail):]
+        return returns
+
+    def _overlay_returns(self, shifts, horizon) -> np.ndarray:
+        """
+        (fixings × scenarios) returns added by the return type over the
+        shocked fixings, accrued on the business days following the last date.
+        """
+        return_type = self.index.return_type
+        if return_type == "Excess Return":
+            rates = self.base()["rates"]
+            if rates is None:
+                raise ValueError(f"Missing benchmark column: {self.rate_column}")
+            return -(rates[-1] + shifts) / 100 * self._accrual(horizon)[:, None]
+        if return_type == "Synthetic Dividend Total Return":
+            level = self.params.get("synthetic_dividend_level", 2.0) / 100
+            return np.broadcast_to(level * self._accrual(horizon)[:, None], shifts.shape)
+        return np.zeros(shifts.shape)
+
+    def _accrual(self, horizon) -> np.ndarray:
+        """
+        Accrual factor of each shocked fixing, as in `LevelIndex._accrue`.
+        """
+        if "act_method" not in self.params:
+            return np.full(horizon, 1 / 252)
+        last = np.datetime64(self.data.index[-1], "D")
+        dates = self._shock_dates(horizon)
+        previous = np.concatenate([[last], dates[:-1]])
+        return year_fraction(previous, dates, self.params["act_method"])
+
+    def _shock_dates(self, horizon) -> np.ndarray:
+        """
+        Business days (params['calendar']) of the shocked fixings after the last date.
+        """
+        last = np.datetime64(self.data.index[-1], "D")
+        calendar = get_calendar(self.params.get("calendar", "WEEKEND"))
+        return calendar.offset(last, np.arange(1, horizon + 1), "preceding")
@@ -0,0 +1,342 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+VOL_METHODS = ("Historical", "Exponential")
+
+
+def rolling_variance(returns, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Fixed-window sample variance of each column of a (dates × series) array
+    (or of a single series).
+
+    Delegates to pandas: the array is wrapped in a DataFrame without a copy
+    and all columns go through one `rolling(window).var()` call; NaN until
+    `window` observations are available. `RollingVariance` reproduces the
+    same result one value at a time.
+    """
+    values = np.asarray(returns, dtype=float)
+    frame = pd.DataFrame(values.reshape(len(values), -1), copy=False)
+    return frame.rolling(window).var(ddof=ddof).to_numpy().reshape(values.shape)
+
+
+def ewm_variance(returns, span: float) -> np.ndarray:
+    """
+    Exponentially weighted sample variance (adjust=True, bias=False) of each
+    column of a (dates × series) array (or of a single series).
+
+    Delegates to pandas: all columns go through one `ewm(span=span).var()`
+    call. `EwmVariance` reproduces the same result one value at a time.
+    """
+    values = np.asarray(returns, dtype=float)
+    frame = pd.DataFrame(values.reshape(len(values), -1), copy=False)
+    return frame.ewm(span=span).var().to_numpy().reshape(values.shape)
+
+
+def volatility(returns, method: str, window: int) -> np.ndarray:
+    """
+    Daily volatility estimate of each series: rolling ('Historical') or
+    exponentially weighted ('Exponential') standard deviation over `window`.
+    """
+    if method == "Historical":
+        variance = rolling_variance(returns, window)
+    elif method == "Exponential":
+        variance = ewm_variance(returns, window)
+    else:
+        raise ValueError(f"Unsupported vol method: {method}")
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+class RollingVariance:
+    """
+    Online fixed-window sample variance.
+
+    Reimplements the Welford updates with Kahan-compensated means that
+    pandas' `rolling(window).var()` uses, step by step (same operations in the same order), so that streaming one
+    value at a time reproduces the vectorized result exactly.
+    """
+
+    def __init__(self, window: int, ddof: int = 1):
+        self.window = window
+        self.ddof = ddof
+        self.values = deque()
+        self._reset()
+
+    def _reset(self):
+        self.nobs = 0.0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_same = 0
+        self.prev_value = None
+
+    def update(self, value: float) -> float:
+        """
+        Adds `value` to the window and returns the variance of the window.
+        """
+        if self.window == 1:
+            # Consecutive windows do not overlap: pandas restarts the accumulators
+            self._reset()
+        else:
+            self.values.append(value)
+            if len(self.values) > self.window:
+                self._remove(self.values.popleft())
+        if self.prev_value is None:
+            self.prev_value = value
+        self._add(value)
+
+        if self.nobs >= self.window and self.nobs > self.ddof:
+            if self.nobs == 1 or self.num_same >= self.nobs:
+                return 0.0
+            return self.ssqdm / (self.nobs - self.ddof)
+        return math.nan
+
+    def _add(self, value):
+        if value != value:
+            return
+        self.nobs += 1
+        self.num_same = self.num_same + 1 if value == self.prev_value else 1
+        self.prev_value = value
+
+        prev_mean = self.mean - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean
+        self.compensation_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs
+        self.ssqdm = self.ssqdm + (value - prev_mean) * (value - self.mean)
+
+    def _remove(self, value):
+        if value != value:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            prev_mean = self.mean - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean
+            self.compensation_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm = self.ssqdm - (value - prev_mean) * (value - self.mean)
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+
+
+class EwmVariance:
+    """
+    Online exponentially weighted sample variance.
+
+    Mirrors pandas' `ewm(span=window).var()` (adjust=True, bias=False)
+    step by step, so streaming reproduces the vectorized result exactly.
+    """
+
+    def __init__(self, span: float):
+        com = (span - 1) / 2
+        alpha = 1.0 / (1.0 + com)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = 1.0
+        self.started = False
+        self.nobs = 0
+        self.mean = math.nan
+        self.cov = 0.0
+        self.sum_wt = 1.0
+        self.sum_wt2 = 1.0
+        self.old_wt = 1.0
+
+    def update(self, value: float) -> float:
+        """
+        Adds `value` and returns the bias-corrected weighted variance.
+        """
+        is_observation = value == value
+        self.nobs += is_observation
+        if not self.started:
+            self.started = True
+            self.mean = value if is_observation else math.nan
+            return math.nan
+
+        if self.mean == self.mean:
+            # Weights decay on missing values too (ignore_na=False)
+            self.sum_wt *= self.old_wt_factor
+            self.sum_wt2 *= self.old_wt_factor * self.old_wt_factor
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                old_mean = self.mean
+                if self.mean != value:
+                    self.mean = ((self.old_wt * old_mean) + (self.new_wt * value)) / (self.old_wt + self.new_wt)
+                self.cov = ((self.old_wt * (self.cov + ((old_mean - self.mean) * (old_mean - self.mean))))
+                            + (self.new_wt * ((value - self.mean) * (value - self.mean)))) / (self.old_wt + self.new_wt)
+                self.sum_wt += self.new_wt
+                self.sum_wt2 += self.new_wt * self.new_wt
+                self.old_wt += self.new_wt
+        elif is_observation:
+            self.mean = value
+
+        if self.nobs < 1:
+            return math.nan
+        numerator = self.sum_wt * self.sum_wt
+        denominator = numerator - self.sum_wt2
+        return (numerator / denominator) * self.cov if denominator > 0 else math.nan
+
+
+class VolTarget:
+    """
+    Volatility-target overlay.
+
+    The leverage of each fixing is target_vol / vol, bounded by [floor, cap],
+    where vol is the volatility estimate of the unlevered returns known
+    `lag` fixings earlier (a leverage of 1 applies before the estimate is
+    available). Each change of leverage is charged `cost` percent of the
+    change, the exposure before the first fixing being 1.
+
+    Attributes:
+        target_vol (float or array): Target volatility in %, compared with the daily estimate.
+        window (int): Estimation window (span of the 'Exponential' method).
+        method (str): 'Historical' or 'Exponential'.
+        lag (int): Fixings between the estimate and the fixing it levers.
+        cap (float or array): Maximum leverage.
+        floor (float or array): Minimum leverage.
+        cost (float or array): Cost in % of each change of leverage.
+
+    Scalar attributes apply to every series; arrays give one value per
+    column of the (dates × series) returns.
+
+    Example:
+        overlay = VolTarget(10.0, 60, "Historical", cap=2.0)
+        levered = overlay.apply(returns)          # full history
+        online = overlay.online()
+        levered_today = online.update(today_return)
+    """
+
+    def __init__(self, target_vol, window: int, method: str = "Historical", lag: int = 1,
+                 cap=3.0, floor=0.0, cost=0.0):
+        if method not in VOL_METHODS:
+            raise ValueError(f"Unsupported vol method: {method}")
+        if lag < 0:
+            raise ValueError("lag must be non-negative.")
+        if np.any(np.asarray(floor) > np.asarray(cap)):
+            raise ValueError("Leverage floor must not exceed the cap.")
+        self.target_vol = target_vol
+        self.window = window
+        self.method = method
+        self.lag = int(lag)
+        self.cap = cap
+        self.floor = floor
+        self.cost = cost
+
+    @classmethod
+    def from_params(cls, params: dict):
+        """
+        Overlay described by `LevelIndex` params: 'target_vol', 'vol_window',
+        'vol_method', 'vol_lag' (1), 'leverage_cap' (3.0), 'leverage_floor'
+        (0.0) and 'vol_cost' (0.0).
+        """
+        return cls(
+            params["target_vol"],
+            params["vol_window"],
+            params["vol_method"],
+            lag=params.get("vol_lag", 1),
+            cap=params.get("leverage_cap", 3.0),
+            floor=params.get("leverage_floor", 0.0),
+            cost=params.get("vol_cost", 0.0),
+        )
+
+    def lookback(self, tolerance: float = 1e-12) -> int:
+        """
+        Fixings of history the next levered return depends on: the
+        estimation window ('Exponential': the fixings weighing more than
+        `tolerance`), the lag and the fixing of the previous leverage.
+        """
+        window = self.window
+        if self.method == "Exponential":
+            decay = 1 - 2 / (self.window + 1)
+            window = math.ceil(math.log(tolerance) / math.log(decay)) if decay > 0 else 1
+        return window + self.lag + 1
+
+    def leverage(self, vol) -> np.ndarray:
+        """
+        Unlagged leverage of each volatility estimate (NaN while unknown).
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.minimum(np.maximum(np.asarray(self.target_vol) / 100 / vol, self.floor), self.cap)
+
+    def apply(self, returns) -> np.ndarray:
+        """
+        Levered returns of a series or of each column of a (dates × series) array.
+        """
+        returns = np.asarray(returns, dtype=float)
+        leverage = self.leverage(volatility(returns, self.method, self.window))
+
+        lagged = np.ones_like(leverage)
+        if self.lag < len(leverage):
+            known = leverage[:len(leverage) - self.lag]
+            lagged[self.lag:] = np.where(np.isnan(known), 1.0, known)
+
+        levered = returns * lagged
+        if np.any(self.cost):
+            turnover = np.abs(np.diff(lagged, axis=0, prepend=np.ones_like(lagged[:1])))
+            levered -= np.asarray(self.cost) / 100 * turnover
+        return levered
+
+    def online(self):
+        """
+        Streaming form of `apply` for a single series.
+        """
+        return OnlineVolTarget(self)
+
+
+class OnlineVolTarget:
+    """
+    One-series `VolTarget` updated one fixing at a time.
+
+    Holds the variance accumulator, the leverages waiting for their lag and
+    the last applied leverage; `update` reproduces `VolTarget.apply` over
+    the same returns exactly.
+    """
+
+    def __init__(self, overlay: VolTarget):
+        if any(np.ndim(v) for v in (overlay.target_vol, overlay.cap, overlay.floor, overlay.cost)):
+            raise ValueError("OnlineVolTarget requires scalar overlay parameters.")
+        self.target = overlay.target_vol / 100
+        self.lag = overlay.lag
+        self.cap = float(overlay.cap)
+        self.floor = float(overlay.floor)
+        self.cost = overlay.cost / 100
+        if overlay.method == "Historical":
+            self.variance = RollingVariance(overlay.window)
+        else:
+            self.variance = EwmVariance(overlay.window)
+        self.pending = deque([1.0] * self.lag)
+        self.applied = 1.0
+
+    def update(self, value: float) -> float:
+        """
+        Adds the unlevered return of a new fixing and returns it levered.
+        """
+        if self.lag:
+            leverage = self.pending.popleft()
+            self.pending.append(self.leverage(self.variance.update(value)))
+        else:
+            leverage = self.leverage(self.variance.update(value))
+
+        levered = value * leverage
+        if self.cost:
+            levered -= self.cost * abs(leverage - self.applied)
+        self.applied = leverage
+        return levered
+
+    def leverage(self, variance: float) -> float:
+        """
+        Leverage implied by a variance estimate, 1 while it is unknown.
+        """
+        if variance != variance:
+            return 1.0
+        vol = math.sqrt(max(variance, 0.0))
+        if vol:
+            leverage = self.target / vol
+        elif self.target:
+            leverage = math.inf
+        else:
+            return 1.0
+        return min(max(leverage, self.floor), self.cap)
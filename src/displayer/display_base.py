@@ -1,8 +1,16 @@
 from abc import ABC, abstractmethod
 from datetime import date, datetime
 import pandas as pd
+import streamlit as st
 from dateutil.relativedelta import relativedelta
 
+from api.config import CHART_MAX_POINTS, TABLE_PAGE_ROWS
+from src.displayer.downsampling import downsample
+from src.profiling import PROFILER
+
+# Chart resolutions offered to the user, in points per series (0 = every point)
+CHART_RESOLUTIONS = (500, 1000, CHART_MAX_POINTS, 5000, 0)
+
 class DisplayBase(ABC):
     
     def __init__(self):
@@ -10,4 +18,36 @@ class DisplayBase(ABC):
 
     @abstractmethod  
     def render(self):
-        pass
\ No newline at end of file
+        pass
+
+    def render_table(self, dtf: pd.DataFrame, key: str, page_rows: int = TABLE_PAGE_ROWS):
+        """
+        Shows `dtf` one page of `page_rows` rows at a time, so only the visible
+        page is sent to the browser.
+        """
+        n_pages = max(1, -(-len(dtf) // page_rows))
+        page = 1
+        if n_pages > 1:
+            page = st.number_input(f"Page (1-{n_pages}, {len(dtf):,} rows)", min_value=1, max_value=n_pages,
+                                   value=1, step=1, key=f"{key}_page")
+        st.dataframe(dtf.iloc[(page - 1) * page_rows:page * page_rows])
+
+    def render_line_chart(self, series: dict, title: str, labels: dict, key: str):
+        """
+        WebGL line chart of `series` (name → (x, y)), each downsampled with
+        LTTB to the resolution picked by the user (cached per series and
+        resolution, so reruns do not recompute it).
+        """
+        resolution = st.select_slider(
+            "Chart resolution (points)", options=CHART_RESOLUTIONS, value=CHART_MAX_POINTS,
+            format_func=lambda n: "Full" if n == 0 else f"{n:,}", key=f"{key}_resolution",
+        )
+        go = PROFILER.load("plotly.graph_objects")
+        fig = go.Figure()
+        for name, (x, y) in series.items():
+            if resolution:
+                x, y = downsample(x, y, resolution)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode="lines", name=name))
+        fig.update_layout(title=title, xaxis_title=labels.get("x"), yaxis_title=labels.get("y"),
+                          showlegend=len(series) > 1)
+        st.plotly_chart(fig, use_container_width=True)
@@ -1,4 +1,12 @@
-from src.displayer.displayer_manager import *
+from src.displayer.displayer_manager import (
+    DisplayAutocallBacktest,
+    DisplayIndexLevel,
+    DisplayIndexLevelVsBenchmark,
+    DisplayNotePrice,
+    DisplayProfiling,
+    DisplayWrapperValue,
+)
+from src.profiling import TRACER
 
 class DisplayFactory:
     def __init__(self, display: str = None, **args):
@@ -7,11 +15,27 @@ class DisplayFactory:
 
     def render(self):
         """Crée et affiche la bonne visualisation selon la valeur de display."""
+        with TRACER.span(f"render.{(self.display or 'none').lower()}"):
+            self._render()
+
+    def _render(self):
         if self.display == "DISPLAY_TEST_V1":
             DisplayIndexLevel(**self.args).render()
 
         elif self.display == "DISPLAY_TEST_V2":
             DisplayIndexLevelVsBenchmark(**self.args).render()
 
+        elif self.display == "DISPLAY_NOTE_PRICE":
+            DisplayNotePrice(**self.args).render()
+
+        elif self.display == "DISPLAY_WRAPPER_VALUE":
+            DisplayWrapperValue(**self.args).render()
+
+        elif self.display == "DISPLAY_AUTOCALL_BACKTEST":
+            DisplayAutocallBacktest(**self.args).render()
+
+        elif self.display == "DISPLAY_PROFILING":
+            DisplayProfiling(**self.args).render()
+
         else:
             raise ValueError(f"DisplayFactory: Unknown display type '{self.display}'")
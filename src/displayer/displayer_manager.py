@@ -1,12 +1,14 @@
+import pandas as pd
 import streamlit as st
-import plotly.express as px
 from src.displayer.display_base import DisplayBase
+from src.profiling import PROFILER
 
 class DisplayIndexLevel(DisplayBase):
     
     def __init__(self, **kwargs):
         super().__init__()
         self.dtf = kwargs.get("index")
+        self.analytics = kwargs.get("analytics")
 
     def render(self):
         st.subheader("Index Level Results")
@@ -15,49 +17,269 @@ class DisplayIndexLevel(DisplayBase):
             st.warning("No data provided.")
             return
 
-        # Show raw data table
-        st.dataframe(self.dtf)
+        if self.analytics is not None:
+            full = self.analytics["summary"].loc["Full"]
+            cols = st.columns(4)
+            cols[0].metric("CAGR", f"{full['cagr']:.2f}%")
+            cols[1].metric("Volatility", f"{full['volatility']:.2f}%")
+            cols[2].metric("Sharpe ratio", f"{full['sharpe']:.2f}")
+            cols[3].metric("Max drawdown", f"{full['max_drawdown']:.2f}%")
+
+        # Show raw data table, one page at a time
+        self.render_table(self.dtf, key="index_level")
 
         # Make sure 'Date' and 'index_value' are in your DataFrame
         if "Date" in self.dtf.columns and "index_value" in self.dtf.columns:
-            fig = px.line(
-                self.dtf,
-                x="Date",
-                y="index_value",
+            self.render_line_chart(
+                {"Index": (self.dtf["Date"].to_numpy(), self.dtf["index_value"].to_numpy())},
                 title="Index Level Evolution",
-                labels={"Date": "Date", "index_value": "Index Value"},
-                markers=True,
+                labels={"x": "Date", "y": "Index Value"},
+                key="index_level",
             )
-            st.plotly_chart(fig, use_container_width=True)
         else:
             st.warning("The columns 'Date' and 'index_value' are required to display the chart.")
             
 class DisplayIndexLevelVsBenchmark(DisplayBase):
-    
+
+    # Summary rows shown per period: column → label
+    METRICS = {
+        "total_return": "Total return (%)", "cagr": "CAGR (%)", "volatility": "Volatility (%)",
+        "sharpe": "Sharpe ratio", "max_drawdown": "Max drawdown (%)", "max_drawdown_days": "Max drawdown duration (days)",
+    }
+    RELATIVE = {
+        "tracking_error": "Tracking error (%)", "beta": "Beta", "correlation": "Correlation",
+        "information_ratio": "Information ratio",
+    }
+
     def __init__(self, **kwargs):
         super().__init__()
         self.dtf = kwargs.get("index")
+        self.analytics = kwargs.get("analytics")
+        self.benchmark = kwargs.get("benchmark") or "Benchmark"
 
     def render(self):
-        st.subheader("Index Level Results")
+        st.subheader("Index Level vs Benchmark")
 
-        if self.dtf is None:
+        if self.dtf is None or self.analytics is None:
             st.warning("No data provided.")
             return
 
-        # Show raw data table
-        st.dataframe(self.dtf)
+        summary = self.analytics["summary"]
+        full = summary.loc["Full"]
+        cols = st.columns(4)
+        cols[0].metric("CAGR", f"{full['cagr']:.2f}%", f"{full['cagr'] - full['benchmark_cagr']:+.2f}% vs {self.benchmark}")
+        cols[1].metric("Volatility", f"{full['volatility']:.2f}%")
+        cols[2].metric("Tracking error", f"{full['tracking_error']:.2f}%")
+        cols[3].metric("Beta", f"{full['beta']:.2f}")
 
-        # Make sure 'Date' and 'index_value' are in your DataFrame
-        if "Date" in self.dtf.columns and "index_value" in self.dtf.columns:
-            fig = px.line(
-                self.dtf,
-                x="Date",
-                y="index_value",
-                title="Index Level Evolution",
-                labels={"Date": "Date", "index_value": "Index Value"},
-                markers=True,
+        # Index vs benchmark statistics, one column per period and series
+        table = {}
+        for period, row in summary.iterrows():
+            table[f"{period} - Index"] = [row[m] for m in self.METRICS] + [row[m] for m in self.RELATIVE]
+            table[f"{period} - {self.benchmark}"] = [row[f"benchmark_{m}"] for m in self.METRICS] + [None] * len(self.RELATIVE)
+        st.dataframe(pd.DataFrame(table, index=list(self.METRICS.values()) + list(self.RELATIVE.values())))
+
+        checks = [c for c in ("meets_expected_return", "within_max_drawdown") if c in summary]
+        if checks:
+            st.markdown("**Client targets**")
+            st.dataframe(summary[checks].rename(columns={"meets_expected_return": "CAGR ≥ expected return",
+                                                         "within_max_drawdown": "Drawdown within tolerance"}))
+
+        levels = self.analytics["levels"]
+        self.render_line_chart(
+            {"Index": (levels["Date"].to_numpy(), levels["Index"].to_numpy()),
+             self.benchmark: (levels["Date"].to_numpy(), levels["Benchmark"].to_numpy())},
+            title="Index vs Benchmark (rebased to 100)",
+            labels={"x": "Date", "y": "Level"},
+            key="index_vs_benchmark",
+        )
+        drawdown = self.analytics["drawdown"]
+        self.render_line_chart(
+            {"Index": (drawdown["Date"].to_numpy(), drawdown["Index"].to_numpy()),
+             self.benchmark: (drawdown["Date"].to_numpy(), drawdown["Benchmark"].to_numpy())},
+            title="Drawdown",
+            labels={"x": "Date", "y": "Drawdown (%)"},
+            key="index_vs_benchmark_drawdown",
+        )
+        rolling = self.analytics["rolling"]
+        if len(rolling):
+            dates = rolling["Date"].to_numpy()
+            self.render_line_chart(
+                {"Index volatility": (dates, rolling["volatility"].to_numpy()),
+                 f"{self.benchmark} volatility": (dates, rolling["benchmark_volatility"].to_numpy()),
+                 "Tracking error": (dates, rolling["tracking_error"].to_numpy())},
+                title="Rolling Volatility and Tracking Error",
+                labels={"x": "Date", "y": "Annualized (%)"},
+                key="index_vs_benchmark_rolling",
+            )
+            self.render_line_chart(
+                {"Beta": (dates, rolling["beta"].to_numpy()), "Sharpe ratio": (dates, rolling["sharpe"].to_numpy())},
+                title="Rolling Beta and Sharpe Ratio",
+                labels={"x": "Date", "y": "Ratio"},
+                key="index_vs_benchmark_rolling_ratios",
+            )
+
+        # Show raw data table, one page at a time
+        self.render_table(self.dtf, key="index_vs_benchmark")
+
+class DisplayNotePrice(DisplayBase):
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.result = kwargs.get("result")
+        self.notional = kwargs.get("notional") or 0.0
+
+    def render(self):
+        st.subheader("Note Pricing")
+
+        if self.result is None:
+            st.warning("No pricing result provided.")
+            return
+
+        cols = st.columns(3)
+        cols[0].metric("Price (% of notional)", f"{self.result['price'] * 100:.2f}%")
+        cols[1].metric("Standard Error", f"{self.result['std_error'] * 100:.3f}%")
+        cols[2].metric("Paths / second", f"{self.result['paths_per_second']:,.0f}")
+        if self.notional:
+            st.markdown(f"**Present value on notional:** {self.result['price'] * self.notional:,.2f}")
+
+        probabilities = self.result.get("autocall_probability")
+        if probabilities is not None and len(probabilities):
+            px = PROFILER.load("plotly.express")
+            fig = px.bar(
+                x=list(range(1, len(probabilities) + 1)),
+                y=probabilities,
+                title="Autocall Probability per Observation",
+                labels={"x": "Observation", "y": "Probability"},
             )
             st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.warning("The columns 'Date' and 'index_value' are required to display the chart.")
\ No newline at end of file
+
+class DisplayWrapperValue(DisplayBase):
+
+    # Series charted per wrapper: result key → (chart title, axis label)
+    SERIES = {
+        "Swap": {"mtm": ("Swap Mark-to-Market", "MtM (% of notional)"), "pnl": ("Swap Cumulative P&L", "P&L (% of notional)")},
+        "ETF": {"nav": ("ETF NAV", "NAV (% of issue)")},
+        "Fund": {"nav": ("Fund NAV", "NAV (% of issue)"), "high_water_mark": ("Fund High-Water Mark", "HWM (% of issue)")},
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.result = kwargs.get("result")
+        self.wrapper = kwargs.get("wrapper")
+        self.notional = kwargs.get("notional") or 0.0
+
+    def render(self):
+        st.subheader(f"{self.wrapper} Valuation")
+
+        if self.result is None:
+            st.warning("No valuation result provided.")
+            return
+
+        label = "Mark-to-market (% of notional)" if self.wrapper == "Swap" else "Value of 1 invested (% of notional)"
+        cols = st.columns(2)
+        cols[0].metric(label, f"{float(self.result['price']) * 100:.2f}%")
+        if "pnl" in self.result:
+            cols[1].metric("Cumulative P&L (% of notional)", f"{float(self.result['pnl'][..., -1]) * 100:.2f}%")
+        if self.notional:
+            st.markdown(f"**Value on notional:** {float(self.result['price']) * self.notional:,.2f}")
+
+        for key, (title, axis) in self.SERIES.get(self.wrapper, {}).items():
+            self.render_line_chart(
+                {self.wrapper: (self.result["dates"], self.result[key] * 100)},
+                title=title,
+                labels={"x": "Date", "y": axis},
+                key=f"wrapper_{key}",
+            )
+
+class DisplayAutocallBacktest(DisplayBase):
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.result = kwargs.get("result")
+
+    def render(self):
+        st.subheader("Autocall Backtest")
+
+        if self.result is None:
+            st.warning("No backtest result provided.")
+            return
+
+        summary = self.result["summary"]
+        st.caption(f"{summary['launches']:,} launches from {summary['first_launch']:%Y-%m-%d} to "
+                   f"{summary['last_launch']:%Y-%m-%d}, evaluated in {summary['elapsed'] * 1000:,.1f} ms")
+        cols = st.columns(4)
+        cols[0].metric("Autocalled", f"{summary['autocall_rate']:.1f}%")
+        cols[1].metric("Capital loss", f"{summary['capital_loss_rate']:.1f}%")
+        cols[2].metric("Mean annualized return", f"{summary['mean_annualized_return']:.2f}%")
+        cols[3].metric("Mean life (years)", f"{summary['mean_life_years']:.2f}")
+
+        px = PROFILER.load("plotly.express")
+        exits = self.result["exits"]
+        st.plotly_chart(px.bar(exits, x="exit", y="probability", title="Redemption Observation",
+                               labels={"exit": "Observation", "probability": "Launches (%)"}),
+                        use_container_width=True)
+
+        launches = self.result["launches"]
+        st.plotly_chart(px.histogram(launches, x="annualized_return", nbins=60, title="Annualized Return per Launch",
+                                     labels={"annualized_return": "Annualized return (%)"}),
+                        use_container_width=True)
+        self.render_line_chart(
+            {"Payoff": (launches["launch_date"].to_numpy(), launches["payoff"].to_numpy())},
+            title="Payoff by Launch Date",
+            labels={"x": "Launch Date", "y": "Payoff (% of notional)"},
+            key="autocall_backtest",
+        )
+        self.render_table(launches, key="autocall_backtest")
+
+class DisplayProfiling(DisplayBase):
+
+    def __init__(self, **kwargs):
+        super().__init__()
+        self.profiler = kwargs.get("profiler")
+        self.tracer = kwargs.get("tracer")
+        self.run = kwargs.get("run")
+
+    def render(self):
+        with st.expander("Debug: timings"):
+            if self.profiler is None:
+                st.warning("No profiler provided.")
+                return
+
+            st.markdown("**Runs** (the cold run includes process startup)")
+            runs = self.profiler.run_table()
+            if runs:
+                table = {}
+                for row in runs:
+                    label = f"{row['run']} (cold)" if row["cold"] else str(row["run"])
+                    table.setdefault(row["stage"], {})[label] = row["seconds"]
+                st.dataframe(table)
+
+            st.markdown("**Lazy imports** (first import in this process)")
+            imports = self.profiler.import_table()
+            if imports:
+                st.dataframe({"module": [m for m, _ in imports], "seconds": [s for _, s in imports]})
+            else:
+                st.caption("No heavy module imported yet.")
+
+            if self.tracer is not None and self.tracer.runs:
+                self.render_trace()
+
+    def render_trace(self):
+        # Run of this session; other sessions may have finished runs since
+        run = self.run or self.tracer.runs[-1]
+        st.markdown(f"**Stages of the last run** (run {run['run']})")
+        cols = st.columns(4)
+        cols[0].metric("Wall time", f"{run['wall']:.3f} s")
+        cols[1].metric("CPU time", f"{run['cpu']:.3f} s")
+        cols[2].metric("Peak allocations", "off" if run["peak_bytes"] is None else f"{run['peak_bytes'] / 2**20:,.1f} MiB")
+        cols[3].metric("Cache hit rate", "-" if run["cache_hit_rate"] is None else f"{run['cache_hit_rate']:.0%}")
+
+        stages = pd.DataFrame(self.tracer.stage_table(run["run"]))
+        stages["stage"] = ["  " * depth + name for depth, name in zip(stages["depth"], stages["name"])]
+        stages["peak_mib"] = stages["peak_bytes"] / 2**20
+        st.dataframe(stages[["stage", "wall", "cpu", "peak_mib", "rows", "cache_hits", "cache_misses"]],
+                     hide_index=True)
+
+        st.download_button("Download traces (JSON lines)", self.tracer.to_jsonl(run["run"]), file_name="traces.jsonl",
+                           mime="application/jsonl")
@@ -0,0 +1,82 @@
+import hashlib
+import threading
+
+import numpy as np
+from cachetools import LRUCache
+
+from api.config import CHART_CACHE_ENTRIES
+
+_CACHE = LRUCache(maxsize=CHART_CACHE_ENTRIES)
+_LOCK = threading.Lock()
+
+
+def lttb(x, y, n_out: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the point kept in the previous
+    bucket and the mean of the next bucket, which preserves peaks, troughs
+    and the visual shape of the series.
+
+    Arguments:
+        x (array): Increasing abscissae (numeric or datetime64).
+        y (array): Finite values, same length as `x`.
+        n_out (int): Number of points to keep (everything when >= len(y)).
+    """
+    x = np.asarray(x)
+    x = x.astype("datetime64[ns]").astype(np.int64).astype(float) if x.dtype.kind == "M" else x.astype(float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Bucket b spans [edges[b], edges[b + 1]); the first and last points are buckets of their own
+    edges = np.floor(np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    counts = np.diff(np.append(edges, n))
+    mean_x = np.add.reduceat(x, edges) / counts
+    mean_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        area = np.abs((x[a] - mean_x[b + 1]) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (mean_y[b + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def downsample(x, y, resolution: int) -> tuple:
+    """
+    (x, y) reduced to at most `resolution` points with `lttb`, NaN values
+    dropped. Results are cached per (content hash, resolution), so
+    re-rendering the same series is a dictionary lookup.
+    """
+    x, y = np.asarray(x), np.asarray(y, dtype=float)
+    key = (series_hash(x, y), resolution)
+    with _LOCK:
+        cached = _CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    finite = ~np.isnan(y)
+    x, y = x[finite], y[finite]
+    keep = lttb(x, y, resolution)
+    result = (x[keep], y[keep])
+    with _LOCK:
+        _CACHE[key] = result
+    return result
+
+
+def series_hash(x, y) -> str:
+    """
+    BLAKE2 digest of the values of a series (x and y), independent of the containing frame.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (x, y):
+        values = np.ascontiguousarray(values)
+        digest.update(str(values.dtype).encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
@@ -0,0 +1,393 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from datetime import date, datetime
+
+import numpy as np
+from cachetools import TTLCache
+
+from api.batch_fetcher import BatchFetcher
+from api.config import PIPELINE_CACHE_DIR, PIPELINE_CACHE_MAX_AGE, PIPELINE_CACHE_MAX_ENTRIES
+from api.providers import YahooProvider
+from api.yahoo_finance import YahooFinance
+from src.compute.analytics import PerformanceAnalytics
+from src.compute.autocall_backtest import AutocallBacktest
+from src.compute.dividends import DividendSchedule, dividend_events
+from src.compute.fx import FXMatrix, fx_tickers
+from src.compute.level_index import LevelIndex
+from src.compute.level_index_batch import DIVIDEND_RETURN_TYPES
+from src.compute.scenarios import ScenarioEngine
+from src.profiling import TRACER
+from src.wrapper.etf import ETF
+from src.wrapper.fund import Fund
+from src.wrapper.note import Note
+from src.wrapper.swap import Swap
+
+STAGES = ("data", "index", "wrapper", "analytics", "display")
+
+# Params read by each stage; a stage is recomputed only when these or an upstream stage change
+STAGE_PARAMS = {
+    "data": ("excess_return_benchmark", "benchmark_ticker", "start_date", "end_date", "index_currency"),
+    "index": ("components", "return_type", "excess_return_benchmark", "withholding_rate",
+              "synthetic_dividend_level", "use_vol_target", "target_vol", "vol_window", "vol_method",
+              "vol_lag", "leverage_cap", "leverage_floor", "vol_cost",
+              "rebalancing_freq", "transaction_cost", "act_method", "calendar", "fx_mode", "fx_hedged",
+              "deposit_rates"),
+    "wrapper": ("wrapper", "components", "autocall_barrier", "redemption_barrier", "coupon", "coupon_barrier",
+                "maturity_years", "observation_frequency", "effet_memoire", "barrier_type", "option_type",
+                "capital_guaranteed", "discount_rate", "act_method", "calendar", "ter", "distributing",
+                "distribution_frequency", "management_fee", "performance_fee", "entry_fee", "exit_fee",
+                "crystallization_frequency", "funding_leg", "fixed_rate", "funding_spread", "reset_frequency",
+                "swap_maturity_years", "discount_curve", "floating_rate_index"),
+    "analytics": ("benchmark_ticker", "live_start", "expected_return", "max_drawdown"),
+    "display": ("client_notional",),
+}
+
+
+def params_hash(*parts) -> str:
+    """
+    SHA-256 of the canonical JSON form of `parts` (sorted keys, dates in ISO
+    format), stable across runs and processes.
+    """
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=_canonical)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def stage_inputs(stage: str, params: dict) -> dict:
+    """
+    Subset of `params` a stage depends on (for the data stage: component
+    tickers only, and whether dividends are needed).
+    """
+    inputs = {key: params[key] for key in STAGE_PARAMS[stage] if key in params}
+    if stage == "data":
+        inputs["tickers"] = [c["ticker"] for c in params.get("components", [])]
+        inputs["dividends"] = params.get("return_type") in DIVIDEND_RETURN_TYPES
+    return inputs
+
+
+def _canonical(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot hash params value of type {type(value).__name__}")
+
+
+# Marks a key absent from the in-memory cache (None is a valid stage result)
+_MISSING = object()
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except FileNotFoundError:
+        return 0.0
+
+
+class StageCache:
+    """
+    Bounded LRU of stage results with expiry, optionally backed by pickles on disk.
+
+    Shared by concurrent sessions: lookups, inserts and counters are taken
+    under a lock, while results are computed outside it (two sessions
+    missing the same key at once may both compute it).
+
+    Attributes:
+        max_entries (int): Results kept in memory (least recently used evicted first).
+        max_age (timedelta): Results older than this are recomputed.
+        cache_dir (str or None): Directory of the on-disk copy, shared across
+            sessions; also bounded to `max_entries` files.
+        hits (int), misses (int): Lookup counters.
+    """
+
+    def __init__(self, max_entries=PIPELINE_CACHE_MAX_ENTRIES, max_age=PIPELINE_CACHE_MAX_AGE, cache_dir=None):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.cache_dir = cache_dir
+        self.memory = TTLCache(maxsize=max_entries, ttl=max_age.total_seconds())
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get_or_compute(self, key: str, func) -> tuple:
+        """
+        (result, hit) for `key`: the cached result, or `func()` computed and
+        stored on a miss.
+        """
+        with self._lock:
+            value = self.memory.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value, True
+
+        found, value = self._load(key)
+        if not found:
+            value = func()
+            self._store(key, value)
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+            self.memory[key] = value
+        return value, found
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+        if self.cache_dir:
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return False, None
+        path = self._path(key)
+        # Another session may expire or evict the file in between: treat it as a miss
+        try:
+            if time.time() - os.path.getmtime(path) > self.max_age.total_seconds():
+                os.remove(path)
+                return False, None
+            with open(path, "rb") as f:
+                return True, pickle.load(f)
+        except FileNotFoundError:
+            return False, None
+
+    def _store(self, key, value):
+        if not self.cache_dir:
+            return
+        # Written aside then renamed, so a concurrent reader never sees a partial pickle
+        path = self._path(key)
+        partial = f"{path}.{threading.get_ident()}.tmp"
+        with open(partial, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, path)
+
+        files = [os.path.join(self.cache_dir, n) for n in os.listdir(self.cache_dir) if n.endswith(".pkl")]
+        files.sort(key=_mtime)
+        for path in files[:max(len(files) - self.max_entries, 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+class SimulationPipeline:
+    """
+    Memoized fetch → index → wrapper → display chain behind the simulation page.
+
+    Params are split into stages; each stage's key is the canonical hash of
+    its own inputs and of its upstream stage's key, so editing a field only
+    recomputes the stages that read it and those downstream of them (a client
+    setting only rebuilds the display plan, a weight change skips the fetch).
+
+    The uncached stage functions `fetch`, `compute_index` and
+    `price_wrapper` are public, so other drivers (`BatchPricer`) can
+    schedule them themselves.
+
+    Every fetch goes through one `BatchFetcher` (one thread pool) held for
+    the lifetime of the pipeline; a price cache should read through the
+    same fetcher, so that prices, currencies and dividends share its pool.
+
+    Attributes:
+        fetcher (BatchFetcher): Front of the market-data provider (Yahoo
+            Finance unless `provider` is given), shared by every run.
+        price_cache (PriceCache or None): Forwarded to `YahooFinance`.
+        caches (dict): One `StageCache` per stage.
+
+    The pipeline is shared by concurrent sessions, so it keeps no per-run
+    state: `run` returns the key, hit/miss outcome and seconds of each stage
+    with its results.
+
+    Example:
+        fetcher = BatchFetcher(YahooProvider())
+        pipeline = SimulationPipeline(price_cache=PriceCache(provider=fetcher), fetcher=fetcher)
+        result = pipeline.run(params)
+        for display, args in result["display"]:
+            DisplayFactory(display=display, **args).render()
+        pipeline.close()
+    """
+
+    def __init__(self, price_cache=None, max_entries=PIPELINE_CACHE_MAX_ENTRIES, max_age=PIPELINE_CACHE_MAX_AGE,
+                 cache_dir=PIPELINE_CACHE_DIR, provider=None, fetcher=None):
+        self.price_cache = price_cache
+        self.fetcher = fetcher or BatchFetcher(provider or YahooProvider())
+        self.caches = {
+            stage: StageCache(max_entries, max_age, os.path.join(cache_dir, stage) if cache_dir else None)
+            for stage in STAGES
+        }
+
+    def run(self, params: dict) -> dict:
+        """
+        Runs every stage, reusing cached results, and returns them by stage:
+        'data' (dict of 'prices' as MarketData, 'currencies', the 'fx'
+        FXMatrix or None and dividend 'events' or None),
+        'index' (level frame), 'wrapper' (note price result or None),
+        'analytics' (index vs benchmark statistics, see
+        `PerformanceAnalytics.compute`), 'display' (list of (display, args)
+        to render) and 'stages' (stage → 'key', 'hit' and 'seconds' of this
+        run).
+        """
+        stages = {}
+        data = self._stage(stages, "data", params, None, lambda: self.fetch(params))
+        index = self._stage(stages, "index", params, "data", lambda: self.compute_index(params, data))
+        wrapper = self._stage(stages, "wrapper", params, "index", lambda: self.price_wrapper(params, data, index))
+        analytics = self._stage(stages, "analytics", params, "index",
+                                lambda: PerformanceAnalytics.from_params(params, index, data["prices"]).compute())
+        display = self._stage(stages, "display", params, ("wrapper", "analytics"),
+                              lambda: self._display_plan(params, index, wrapper, analytics))
+        return {"data": data, "index": index, "wrapper": wrapper, "analytics": analytics, "display": display,
+                "stages": stages}
+
+    def stress(self, params: dict, scenarios, n_paths=20_000, seed=None):
+        """
+        Stress-test table of the basket and its wrapper (see
+        `ScenarioEngine.run`), reusing the cached data stage.
+        """
+        data = self._stage({}, "data", params, None, lambda: self.fetch(params))
+        engine = ScenarioEngine(data["prices"], params, dividends=self._dividends(params, data), fx=data["fx"])
+        return engine.run(scenarios, n_paths=n_paths, seed=seed)
+
+    def backtest(self, params: dict, chunk_size=None):
+        """
+        Note launched on every fixing of the backtest period (see
+        `AutocallBacktest.run`), on the cached data stage, or on the cached
+        index stage for 'Single Underlying' notes.
+        """
+        stages = {}
+        data = self._stage(stages, "data", params, None, lambda: self.fetch(params))
+        if params.get("option_type") == "Single Underlying":
+            index = self._stage(stages, "index", params, "data", lambda: self.compute_index(params, data))
+            underlyings = index.set_index("Date")[["index_value"]]
+        else:
+            underlyings = data["prices"].select([c["ticker"] for c in params["components"]]).to_frame()
+        return AutocallBacktest.from_params(params, underlyings).run(chunk_size)
+
+    def stats(self) -> dict:
+        """
+        Hit/miss counters and current size of each stage cache.
+        """
+        return {stage: {"hits": c.hits, "misses": c.misses, "entries": len(c.memory)}
+                for stage, c in self.caches.items()}
+
+    def clear(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    def close(self):
+        """
+        Shuts the fetcher's thread pool down.
+        """
+        self.fetcher.shutdown()
+
+    def _stage(self, stages, stage, params, upstream, func):
+        """
+        Cached result of `stage`, keyed on its inputs and on the keys of its
+        `upstream` stages recorded in `stages` (this run's record, which the
+        stage is added to).
+        """
+        if isinstance(upstream, tuple):
+            upstream_key = [stages[name]["key"] for name in upstream]
+        else:
+            upstream_key = stages[upstream]["key"] if upstream else None
+        key = params_hash(stage, upstream_key, stage_inputs(stage, params))
+        cache = self.caches[stage]
+        start = time.perf_counter()
+        with TRACER.span(f"pipeline.{stage}") as span:
+            value, hit = cache.get_or_compute(key, func)
+            span.annotate(cache_hits=int(hit), cache_misses=int(not hit))
+        stages[stage] = {"key": key, "hit": hit, "seconds": time.perf_counter() - start}
+        return value
+
+    def fetch(self, params):
+        """
+        Data stage, uncached: prices, currencies, FX and dividend events of
+        `params` through the pipeline's fetcher and price cache.
+        """
+        # The total return types add cash dividends to the price return: they need unadjusted closes
+        dividends = stage_inputs("data", params)["dividends"]
+        market_data = YahooFinance(cache=self.price_cache, provider=self.fetcher.provider, fetcher=self.fetcher,
+                                   adjusted=not dividends, **params)
+        prices = market_data.get_market_data()
+        currencies = market_data.get_currency()
+        data = {"prices": prices, "currencies": currencies, "fx": None, "events": None}
+
+        # FX matrix into the index currency, cached with the prices it is aligned to
+        index_currency = params.get("index_currency")
+        if index_currency:
+            ticker_currencies = dict(zip(market_data.final_tickers, currencies))
+            component_currencies = {c["ticker"]: ticker_currencies.get(c["ticker"]) for c in params["components"]}
+            failed = {t: market_data.currency_errors[t] for t in component_currencies if t in market_data.currency_errors}
+            if failed:
+                raise ValueError("Currency lookup failed for " + ", ".join(f"{t} ({e})" for t, e in failed.items()))
+            fx_prices = market_data.get_fx_data(fx_tickers(component_currencies.values(), index_currency))
+            data["fx"] = FXMatrix.from_prices(fx_prices, component_currencies, index_currency, prices.index)
+
+        if dividends:
+            data["events"] = dividend_events(market_data.get_dividends())
+        return data
+
+    @staticmethod
+    def _dividends(params, data):
+        if data["events"] is None:
+            return None
+        tickers = [c["ticker"] for c in params["components"]]
+        return DividendSchedule.from_events(data["events"], data["prices"].select(tickers))
+
+    @classmethod
+    def compute_index(cls, params, data):
+        """
+        Index stage, uncached: the `LevelIndex` level frame on the data stage output.
+        """
+        dividends = cls._dividends(params, data)
+        return LevelIndex(data=data["prices"], params=params, dividends=dividends, fx=data["fx"]).compute()
+
+    @classmethod
+    @TRACER.trace("wrapper.price")
+    def price_wrapper(cls, params, data, level_index, **price_args):
+        """
+        Wrapper stage, uncached: prices the wrapper on the index; `price_args` (paths, seed, backend)
+        only apply to the Monte Carlo Note, the other wrappers are closed form.
+        """
+        wrapper = params.get("wrapper")
+        if wrapper == "Swap":
+            return Swap.from_params(params, level_index).price()
+        if wrapper == "Fund":
+            return Fund.from_params(params, level_index).price()
+        if wrapper == "ETF":
+            income = None
+            if params.get("distributing") == "Distributing":
+                income = LevelIndex(data=data["prices"], params=params, dividends=cls._dividends(params, data),
+                                    fx=data["fx"]).income_returns().to_numpy()
+            return ETF.from_params(params, level_index, income=income).price()
+        if wrapper != "Note" or not params.get("maturity_years"):
+            return None
+        if params.get("option_type") == "Single Underlying":
+            underlyings = level_index.set_index("Date")[["index_value"]]
+        else:
+            underlyings = data["prices"].select([c["ticker"] for c in params["components"]]).to_frame()
+        return Note.from_params(params, underlyings).price(**price_args)
+
+    @staticmethod
+    def _display_plan(params, level_index, wrapper_result, analytics=None):
+        if analytics is not None and "Benchmark" in analytics["levels"]:
+            plan = [("DISPLAY_TEST_V2", {"index": level_index, "analytics": analytics,
+                                         "benchmark": params.get("benchmark_ticker")})]
+        else:
+            plan = [("DISPLAY_TEST_V1", {"index": level_index, "analytics": analytics})]
+        if wrapper_result is not None:
+            display = "DISPLAY_NOTE_PRICE" if params.get("wrapper") == "Note" else "DISPLAY_WRAPPER_VALUE"
+            plan.append((display, {"result": wrapper_result, "wrapper": params.get("wrapper"),
+                                   "notional": params.get("client_notional", 0.0)}))
+        return plan
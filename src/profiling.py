@@ -0,0 +1,461 @@
+import functools
+import importlib
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from api.config import TRACE_EXPORT_PATH, TRACE_MAX_SPANS, TRACE_MEMORY
+
+
+class Profiler:
+    """
+    Wall-clock timings of lazy imports and of the stages of each script run.
+
+    Heavy modules are imported through `load`, which times their first
+    import in the process. A run (one Streamlit execution of the app
+    script) is opened by `start_run`; its stages are timed with `stage`
+    blocks or `checkpoint` marks, and the last `max_runs` runs are kept so
+    that a cold start can be compared with the following reruns.
+
+    Attributes:
+        started (float): perf_counter value when the profiler was created
+            (first import of this module for PROFILER).
+        imports (dict): Module name → seconds taken by its first import.
+        runs (list of dict): 'run' number, 'cold' flag, 'stages' (name →
+            seconds) and 'total' seconds of each run, oldest first.
+        max_runs (int): Runs retained.
+
+    Example:
+        PROFILER.start_run()
+        px = PROFILER.load("plotly.express")
+        with PROFILER.stage("pipeline"):
+            pipeline.run(params)
+        PROFILER.end_run()
+    """
+
+    def __init__(self, max_runs=20):
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.runs = []
+        self.max_runs = max_runs
+        self._count = 0
+        self._run_start = None
+        self._mark = None
+        self._lock = threading.Lock()
+
+    def load(self, name: str):
+        """
+        Imports module `name`, timing the import the first time it happens.
+        """
+        module = sys.modules.get(name)
+        if module is not None:
+            return module
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        with self._lock:
+            self.imports.setdefault(name, time.perf_counter() - start)
+        return module
+
+    def start_run(self):
+        """
+        Opens a new run; the first run of the process is timed from the creation of the profiler.
+        """
+        with self._lock:
+            self._count += 1
+            cold = self._count == 1
+            self._run_start = self.started if cold else time.perf_counter()
+            self._mark = time.perf_counter()
+            self.runs.append({"run": self._count, "cold": cold, "stages": {}, "total": None})
+            del self.runs[:-self.max_runs]
+            if cold:
+                self.runs[-1]["stages"]["startup"] = self._mark - self.started
+
+    def end_run(self):
+        if self.runs and self.runs[-1]["total"] is None:
+            self.runs[-1]["total"] = time.perf_counter() - self._run_start
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times the enclosed block as stage `name` of the current run.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+            self._mark = time.perf_counter()
+
+    def checkpoint(self, name: str):
+        """
+        Records the time since the previous checkpoint (or run start) as stage `name`.
+        """
+        now = time.perf_counter()
+        if self._mark is not None:
+            self.record(name, now - self._mark)
+        self._mark = now
+
+    def import_table(self) -> list:
+        """
+        (module, seconds) of every timed import, slowest first.
+        """
+        return sorted(self.imports.items(), key=lambda item: -item[1])
+
+    def run_table(self) -> list:
+        """
+        One dict per (run, stage): 'run', 'cold', 'stage', 'seconds', plus
+        a 'total' stage per finished run.
+        """
+        rows = []
+        for run in self.runs:
+            for stage, seconds in run["stages"].items():
+                rows.append({"run": run["run"], "cold": run["cold"], "stage": stage, "seconds": seconds})
+            if run["total"] is not None:
+                rows.append({"run": run["run"], "cold": run["cold"], "stage": "total", "seconds": run["total"]})
+        return rows
+
+    def record(self, name: str, seconds: float):
+        """
+        Adds `seconds` to stage `name` of the current run (e.g. timings measured elsewhere).
+        """
+        with self._lock:
+            if self.runs:
+                stages = self.runs[-1]["stages"]
+                stages[name] = stages.get(name, 0.0) + seconds
+
+
+class Span:
+    """
+    One traced block: timings, allocations and counters of a stage.
+
+    Attributes:
+        name (str): Stage name ('fetch.prices', 'pipeline.index', ...).
+        run (int or None): Run the block belongs to.
+        parent (str or None): Name of the enclosing span.
+        depth (int): Nesting level (0 for a top-level span).
+        wall, cpu (float): Wall-clock and process CPU seconds (CPU time
+            includes worker threads busy during the block).
+        peak_bytes (int or None): Peak traced allocations above the memory
+            in use at entry; None when memory tracing is off.
+        rows (int or None): Rows produced, when the stage reports them.
+        cache_hits, cache_misses (int or None): Cache lookups of the stage.
+        attrs (dict): Other annotations.
+    """
+
+    def __init__(self, name, run=None, parent=None, depth=0, attrs=None):
+        self.name = name
+        self.run = run
+        self.parent = parent
+        self.depth = depth
+        self.wall = None
+        self.cpu = None
+        self.peak_bytes = None
+        self.rows = None
+        self.cache_hits = None
+        self.cache_misses = None
+        self.attrs = dict(attrs or {})
+        self.started = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._memory = None
+        self._child_peak = 0
+
+    def annotate(self, rows=None, cache_hits=None, cache_misses=None, **attrs):
+        """
+        Sets the row count, adds cache lookups and stores other attributes.
+        """
+        if rows is not None:
+            self.rows = int(rows)
+        if cache_hits is not None:
+            self.cache_hits = (self.cache_hits or 0) + int(cache_hits)
+        if cache_misses is not None:
+            self.cache_misses = (self.cache_misses or 0) + int(cache_misses)
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> dict:
+        record = {"type": "span", "run": self.run, "name": self.name, "parent": self.parent, "depth": self.depth,
+                  "started": datetime.fromtimestamp(self.started).isoformat(), "wall": self.wall, "cpu": self.cpu,
+                  "peak_bytes": self.peak_bytes, "rows": self.rows, "cache_hits": self.cache_hits,
+                  "cache_misses": self.cache_misses}
+        record.update(self.attrs)
+        return record
+
+
+class Tracer:
+    """
+    Nested wall time, CPU time, allocation, row and cache counters per stage
+    and per run.
+
+    Stages are traced with `span` blocks or the `trace` decorator; spans
+    nest per thread and belong to the run the same thread opened with
+    `start_run` / `run` (one Streamlit script execution, one batch, ...),
+    so concurrent sessions, each run in its own thread, trace their own
+    runs through the shared tracer. Finished spans are
+    kept in a bounded buffer and exported as JSON lines, one record per
+    span plus one summary record per run, so slow runs can be replayed
+    offline.
+
+    Peak allocations come from `tracemalloc` and are only recorded while
+    `memory` is on (it slows allocation-heavy code down). Memory tracing is
+    process configuration (TRACE_MEMORY, or a command line flag), not a
+    per-run switch: the peak is process wide, so it is exact for stages
+    run one at a time and an upper bound when threads overlap.
+
+    Attributes:
+        spans (deque of Span): Last `max_spans` finished spans, oldest first.
+        runs (list of dict): Summary of each of the last `max_runs` finished
+            runs: wall / CPU seconds, peak bytes, span count and cache hit
+            rate over its spans.
+        export_path (str or None): JSON lines file each finished run is
+            appended to.
+
+    Example:
+        with TRACER.run("batch"):
+            with TRACER.span("fetch", tickers=3) as span:
+                prices = source.get_prices(tickers, start, end)
+                span.annotate(rows=len(prices))
+        TRACER.export_jsonl("trace.jsonl")
+    """
+
+    def __init__(self, memory=TRACE_MEMORY, max_spans=TRACE_MAX_SPANS, export_path=TRACE_EXPORT_PATH, max_runs=50):
+        self.spans = deque(maxlen=max_spans)
+        self.runs = []
+        self.max_runs = max_runs
+        self.export_path = export_path
+        self._memory = False
+        self._count = itertools.count(1)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+        self.memory = memory
+
+    @property
+    def memory(self) -> bool:
+        return self._memory
+
+    @memory.setter
+    def memory(self, enabled):
+        # Only stop tracemalloc if this tracer started it
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        elif not enabled and self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._memory = bool(enabled)
+
+    @property
+    def current_run(self):
+        """
+        Number of the run open in this thread (None outside a run).
+        """
+        return getattr(self._local, "run", None)
+
+    def start_run(self, name="run", **attrs) -> int:
+        """
+        Opens run `name` in this thread, closing the thread's previous run if it is still open.
+        """
+        self.end_run()
+        with self._lock:
+            self._local.run = next(self._count)
+        self._local.run_span = self._open(name, attrs)
+        return self._local.run
+
+    def end_run(self):
+        """
+        Closes the run open in this thread, records its summary and appends
+        it to `export_path`. Returns the summary (None when no run is open).
+        """
+        span = getattr(self._local, "run_span", None)
+        if span is None:
+            return None
+        self._local.run_span = None
+        self._close(span)
+        self._local.run = None
+        summary = self._summarize(span)
+        with self._lock:
+            self.runs.append(summary)
+            del self.runs[:-self.max_runs]
+        if self.export_path:
+            self.export_jsonl(self.export_path, run=span.run)
+        return summary
+
+    @contextmanager
+    def run(self, name="run", **attrs):
+        run = self.start_run(name, **attrs)
+        try:
+            yield run
+        finally:
+            self.end_run()
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """
+        Traces the enclosed block as stage `name`; yields the Span so the
+        block can `annotate` rows and cache lookups.
+        """
+        span = self._open(name, attrs)
+        try:
+            yield span
+        finally:
+            self._close(span)
+
+    def trace(self, name=None, rows=None):
+        """
+        Decorator tracing every call of a function as stage `name` (default:
+        its qualified name). `rows(result)` gives the row count; by default
+        results with a length (frames, arrays) report it.
+        """
+        def decorator(func):
+            stage = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage) as span:
+                    result = func(*args, **kwargs)
+                    count = rows(result) if rows is not None else _length(result)
+                    if count is not None:
+                        span.annotate(rows=count)
+                    return result
+            return wrapper
+        return decorator
+
+    def bind(self, func):
+        """
+        Wraps `func` so that the spans it opens in another thread (a worker
+        pool) belong to the run open in the calling thread.
+        """
+        run = self.current_run
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = self.current_run
+            self._local.run = run
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.run = previous
+        return wrapper
+
+    def annotate(self, **attrs):
+        """
+        Annotates the innermost open span of this thread (no-op outside spans).
+        """
+        stack = self._stack()
+        if stack:
+            stack[-1].annotate(**attrs)
+
+    def run_spans(self, run=None) -> list:
+        """
+        Finished spans of `run` (the last finished run by default).
+        """
+        if run is None:
+            run = self.runs[-1]["run"] if self.runs else None
+        return [span for span in list(self.spans) if span.run == run]
+
+    def _summarize(self, root) -> dict:
+        """
+        Run record: wall / CPU seconds and peak bytes of the run, number of
+        spans, and cache hits, misses and hit rate summed over its spans.
+        """
+        spans = [span for span in self.run_spans(root.run) if span is not root]
+        hits = sum(span.cache_hits or 0 for span in spans)
+        misses = sum(span.cache_misses or 0 for span in spans)
+        return {
+            "type": "run", "run": root.run, "name": root.name,
+            "started": datetime.fromtimestamp(root.started).isoformat(), "wall": root.wall, "cpu": root.cpu,
+            "peak_bytes": root.peak_bytes, "spans": len(spans), "cache_hits": hits, "cache_misses": misses,
+            "cache_hit_rate": hits / (hits + misses) if hits + misses else None, **root.attrs,
+        }
+
+    def stage_table(self, run=None) -> list:
+        """
+        One dict per span of `run` (the last finished run by default), in start order.
+        """
+        return [span.to_dict() for span in sorted(self.run_spans(run), key=lambda s: s.started)]
+
+    def to_jsonl(self, run=None) -> str:
+        """
+        JSON lines of the spans and run summaries (of `run` only when given).
+        """
+        with self._lock:
+            spans = [s for s in self.spans if run is None or s.run == run]
+            runs = [r for r in self.runs if run is None or r["run"] == run]
+        records = [s.to_dict() for s in spans] + runs
+        return "".join(json.dumps(record, default=_jsonable) + "\n" for record in records)
+
+    def export_jsonl(self, path, run=None):
+        """
+        Appends `to_jsonl(run)` to file `path`.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(self.to_jsonl(run))
+
+    def clear(self):
+        with self._lock:
+            self.spans.clear()
+            self.runs.clear()
+
+    def _stack(self) -> list:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _open(self, name, attrs):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        span = Span(name, self.current_run, parent.name if parent else None, len(stack), attrs)
+        if self._memory and tracemalloc.is_tracing():
+            span._memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+        stack.append(span)
+        return span
+
+    def _close(self, span):
+        span.wall = time.perf_counter() - span._wall
+        span.cpu = time.process_time() - span._cpu
+        stack = self._stack()
+        if span in stack:
+            stack.remove(span)
+        if span._memory is not None and tracemalloc.is_tracing():
+            # Children reset the peak: their own peaks are carried up instead
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, span._child_peak)
+            span.peak_bytes = max(peak - span._memory, 0)
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        with self._lock:
+            self.spans.append(span)
+
+
+def _length(result):
+    if hasattr(result, "shape") and getattr(result, "ndim", 0):
+        return result.shape[0]
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    return None
+
+
+def _jsonable(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+# Process-wide profiler shared by the app, the pages and the lazy imports
+PROFILER = Profiler()
+
+# Process-wide tracer of the fetch, compute and render stages
+TRACER = Tracer()
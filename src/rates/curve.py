@@ -0,0 +1,169 @@
+import numpy as np
+
+from src.calendars.business_calendar import add_months, get_calendar
+from src.calendars.day_count import year_fraction
+
+INSTRUMENTS = ("deposit", "swap")
+
+# Days per unit of the day/week tenors; months per unit of the others
+_TENOR_DAYS = {"D": 1, "W": 7}
+_TENOR_MONTHS = {"M": 1, "Y": 12}
+
+
+class ZeroCurve:
+    """
+    Continuously compounded zero curve, log-linear in discount factors
+    between its pillars (flat forwards), with a flat zero rate beyond the
+    last pillar and from today to the first one.
+
+    Times are year fractions from `asof` under `act_method`; with `asof`
+    set, `discount_factors` takes dates directly. Every method is
+    vectorized over arrays of any shape, so a whole book of cash flows is
+    discounted in one call.
+
+    Attributes:
+        times (np.ndarray): Pillar maturities in years, increasing.
+        rates (np.ndarray): Zero rate of each pillar.
+        asof (np.datetime64 or None): Curve date.
+        act_method (str): Day count convention of the times.
+
+    Example:
+        curve = ZeroCurve([0.25, 1, 5], [0.030, 0.032, 0.035], asof="2025-01-02")
+        curve.discount([0.5, 2.0])
+        curve.discount_factors(np.array(["2026-01-02", "2030-01-02"], dtype="datetime64[D]"))
+    """
+
+    def __init__(self, times, rates, asof=None, act_method="Actual/365"):
+        self.times = np.atleast_1d(np.asarray(times, dtype=float))
+        self.rates = np.atleast_1d(np.asarray(rates, dtype=float))
+        if self.times.shape != self.rates.shape or self.times[0] <= 0 or np.any(np.diff(self.times) <= 0):
+            raise ValueError("ZeroCurve needs one rate per pillar and positive, increasing pillar times.")
+        self.asof = None if asof is None else np.datetime64(asof, "D")
+        self.act_method = act_method
+        self._nodes = np.concatenate([[0.0], self.times])
+        self._log_discount = np.concatenate([[0.0], self.rates * self.times])
+
+    @classmethod
+    def flat(cls, rate, asof=None, act_method="Actual/365"):
+        return cls([1.0], [rate], asof, act_method)
+
+    def discount(self, t):
+        """
+        Discount factors for times `t` in years.
+        """
+        t = np.asarray(t, dtype=float)
+        log_discount = np.where(t > self.times[-1], self.rates[-1] * t, np.interp(t, self._nodes, self._log_discount))
+        return np.exp(-log_discount)
+
+    def zero_rates(self, t):
+        t = np.asarray(t, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rates = -np.log(self.discount(t)) / t
+        return np.where(t > 0, rates, self.rates[0])
+
+    def forward_rates(self, start, end):
+        """
+        Simply compounded forward rates between times `start` and `end`.
+        """
+        start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+        return (self.discount(start) / self.discount(end) - 1) / (end - start)
+
+    def discount_factors(self, dates):
+        """
+        Discount factors of cash flows paid on `dates` (datetime64, any shape).
+        """
+        if self.asof is None:
+            raise ValueError("discount_factors needs a curve with an asof date.")
+        return self.discount(year_fraction(self.asof, dates, self.act_method))
+
+    def shifted(self, shift):
+        """
+        Curve with every zero rate moved by `shift` (parallel shift).
+        """
+        return ZeroCurve(self.times, self.rates + shift, self.asof, self.act_method)
+
+
+def tenor_dates(asof, tenors, calendar="WEEKEND", convention="modified_following"):
+    """
+    Maturity dates of tenors such as 'ON', '1W', '3M' or '10Y' from `asof`,
+    rolled on `calendar`.
+    """
+    start = np.datetime64(asof, "D")
+    dates = np.empty(len(tenors), dtype="datetime64[D]")
+    for i, tenor in enumerate(tenors):
+        tenor = tenor.strip().upper()
+        count, unit = (1, "D") if tenor in ("ON", "O/N") else (int(tenor[:-1]), tenor[-1])
+        if unit in _TENOR_DAYS:
+            dates[i] = start + np.timedelta64(count * _TENOR_DAYS[unit], "D")
+        elif unit in _TENOR_MONTHS:
+            dates[i] = add_months(start, count * _TENOR_MONTHS[unit])
+        else:
+            raise ValueError(f"Unsupported tenor: {tenor}")
+    return get_calendar(calendar).roll(dates, convention)
+
+
+def bootstrap(asof, tenors, instruments, quotes, act_method="Actual/365", calendar="WEEKEND", tolerance=1e-14):
+    """
+    Zero curve on `asof` fitted exactly to deposit and par swap quotes.
+
+    Deposits pay simple interest over their tenor. Swaps exchange an annual
+    fixed coupon against a floating leg worth par on the same curve. Pillars
+    are solved in maturity order; a swap whose annual coupon dates fall
+    beyond the previous pillar is solved with a few Newton steps on its
+    pillar discount factor, the coupons in between being interpolated
+    log-linearly like the resulting curve.
+
+    Arguments:
+        tenors (list of str): Tenor of each quote ('1M', '2Y', ...).
+        instruments (list of str): 'deposit' or 'swap' per quote.
+        quotes (array): Annual rates as fractions.
+
+    Returns:
+        ZeroCurve: curve with one pillar per quote.
+    """
+    asof = np.datetime64(asof, "D")
+    quotes = np.asarray(quotes, dtype=float)
+    unknown = set(instruments) - set(INSTRUMENTS)
+    if unknown:
+        raise ValueError(f"Unsupported curve instruments: {', '.join(sorted(unknown))}")
+
+    maturities = tenor_dates(asof, tenors, calendar)
+    order = np.argsort(maturities, kind="stable")
+    nodes, log_discount = [0.0], [0.0]
+
+    for i in order:
+        end = maturities[i]
+        t_end = float(year_fraction(asof, end, act_method))
+        if t_end <= nodes[-1]:
+            raise ValueError(f"Duplicate curve pillar at {end}.")
+
+        if instruments[i] == "deposit":
+            log_discount.append(np.log1p(quotes[i] * t_end))
+            nodes.append(t_end)
+            continue
+
+        # Annual coupon dates up to the maturity; those past the last pillar are interpolated towards this one
+        n_coupons = max(int(round(float(year_fraction(asof, end, "Actual/365")))), 1)
+        coupon_dates = get_calendar(calendar).roll(add_months(asof, 12 * np.arange(1, n_coupons + 1)),
+                                                   "modified_following")
+        coupon_dates[-1] = end
+        accruals = year_fraction(np.concatenate([[asof], coupon_dates[:-1]]), coupon_dates, act_method)
+        times = year_fraction(asof, coupon_dates, act_method)
+        known = times <= nodes[-1]
+        weight = np.where(known, 0.0, (times - nodes[-1]) / (t_end - nodes[-1]))
+        base = np.where(known, np.interp(times, nodes, log_discount), (1 - weight) * log_discount[-1])
+
+        # Par condition in y = -log DF(end): quote × Σ accrual × DF + DF(end) = 1
+        y = quotes[i] * t_end
+        for _ in range(50):
+            discount = np.exp(-(base + weight * y))
+            value = quotes[i] * (accruals * discount).sum() + np.exp(-y) - 1
+            step = value / (quotes[i] * (accruals * weight * discount).sum() + np.exp(-y))
+            y += step
+            if abs(step) < tolerance:
+                break
+        log_discount.append(y)
+        nodes.append(t_end)
+
+    nodes, log_discount = np.array(nodes[1:]), np.array(log_discount[1:])
+    return ZeroCurve(nodes, log_discount / nodes, asof, act_method)
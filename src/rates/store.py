@@ -0,0 +1,171 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from api.config import RATES_CURVE_CACHE_ENTRIES, RATES_DIR
+from src.calendars.business_calendar import get_calendar
+from src.calendars.day_count import accrual_factors
+from src.profiling import TRACER
+from src.rates.curve import ZeroCurve, bootstrap
+
+# File name of the fixings of rate tickers and indices quoted under another name
+RATE_ALIASES = {"^SOFR": "SOFR", "^EURSTRON": "ESTR", "^IRX": "IRX"}
+
+_STORES = {}
+
+
+def get_rate_store(path=RATES_DIR):
+    """
+    Returns the rate store of directory `path`, opened once per process.
+    """
+    if path not in _STORES:
+        _STORES[path] = RateStore(path)
+    return _STORES[path]
+
+
+class RateStore:
+    """
+    Rate fixings and curve snapshots read from local files.
+
+    Fixings live in `fixings/<NAME>.csv` (columns: date, rate in % per
+    year) and curve quotes in `curves/<NAME>.csv` (columns: date, tenor,
+    instrument, rate in %; one snapshot per date, instruments as in
+    `bootstrap`). Files are read on first use. Fixings are looked up as of
+    each date with one binary search over the whole date array; curves are
+    bootstrapped once per (snapshot, day count, calendar) and kept in a
+    bounded LRU, so repricing on the same date never refits a curve.
+
+    Attributes:
+        path (str): Store directory (missing directories make an empty store).
+        hits (int), misses (int): Curve cache counters.
+
+    Example:
+        rates = get_rate_store()
+        rates.fixings("^SOFR", level_index["Date"])
+        rates.curve("USD-SOFR", "2025-01-02").discount_factors(payment_dates)
+    """
+
+    def __init__(self, path=RATES_DIR, max_curves=RATES_CURVE_CACHE_ENTRIES):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._fixings = {}
+        self._quotes = {}
+        self._curves = LRUCache(maxsize=max_curves)
+        self._lock = threading.Lock()
+
+    def fixing_names(self) -> list:
+        return self._names("fixings")
+
+    def curve_names(self) -> list:
+        return self._names("curves")
+
+    def has_fixings(self, name) -> bool:
+        file_name = RATE_ALIASES.get(name, name)
+        return file_name in self._fixings or os.path.exists(self._file("fixings", file_name))
+
+    def fixings(self, name, dates) -> np.ndarray:
+        """
+        Annual fixing (fraction) of rate `name` in force on each of `dates`:
+        the last one published on or before the date, NaN before the first
+        fixing and after the last one (not fixed yet).
+        """
+        fixing_dates, rates = self._fixing_series(name)
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        position = np.searchsorted(fixing_dates, dates, side="right") - 1
+        found = (position >= 0) & (dates <= fixing_dates[-1])
+        return np.where(found, rates[np.clip(position, 0, None)], np.nan)
+
+    def with_fixings(self, name, dates, rates=None) -> np.ndarray:
+        """
+        `rates` (annual fractions on `dates`, e.g. a downloaded rate column)
+        with the local fixings of `name` substituted wherever they are
+        published; the fixings alone when `rates` is None.
+        """
+        if not self.has_fixings(name):
+            if rates is None:
+                raise ValueError(f"Missing benchmark column: {name}")
+            return np.asarray(rates, dtype=float)
+        fixings = self.fixings(name, dates)
+        return fixings if rates is None else np.where(np.isnan(fixings), rates, fixings)
+
+    def accrued(self, name, dates, act_method=None, calendar="WEEKEND") -> np.ndarray:
+        """
+        Amount of rate `name` earned on each date: the fixing times the year
+        fraction since the previous date under `act_method`, or 1/252 when no
+        convention is set.
+        """
+        rates = self.fixings(name, dates)
+        if act_method is None:
+            return rates / 252
+        return rates * accrual_factors(dates, act_method, get_calendar(calendar))
+
+    def curve(self, name, asof, act_method="Actual/365", calendar="WEEKEND") -> ZeroCurve:
+        """
+        Curve `name` bootstrapped from its last snapshot on or before `asof`.
+        """
+        quotes, snapshots = self._curve_quotes(name)
+        position = snapshots.searchsorted(pd.Timestamp(asof), side="right") - 1
+        if position < 0:
+            raise ValueError(f"No {name} curve snapshot on or before {pd.Timestamp(asof).date()}")
+        snapshot = snapshots[position]
+
+        key = (name, snapshot, act_method, calendar)
+        with self._lock:
+            curve = self._curves.get(key)
+        if curve is not None:
+            self.hits += 1
+            TRACER.annotate(cache_hits=1)
+            return curve
+
+        self.misses += 1
+        TRACER.annotate(cache_misses=1)
+        rows = quotes.loc[[snapshot]]
+        curve = bootstrap(snapshot, rows["tenor"].tolist(), rows["instrument"].str.lower().tolist(),
+                          rows["rate"].to_numpy(dtype=float) / 100, act_method, calendar)
+        with self._lock:
+            self._curves[key] = curve
+        return curve
+
+    def discount_curve(self, params: dict, asof):
+        """
+        Curve named by params['discount_curve'] as of `asof`, under the
+        params day count and calendar; None when no curve is selected (the
+        wrappers then discount at the flat params['discount_rate']).
+        """
+        name = params.get("discount_curve")
+        if not name or name == "Flat":
+            return None
+        return self.curve(name, asof, params.get("act_method", "Actual/365"), params.get("calendar", "WEEKEND"))
+
+    def _names(self, kind):
+        directory = os.path.join(self.path, kind)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(n[:-4] for n in os.listdir(directory) if n.endswith(".csv"))
+
+    def _file(self, kind, name):
+        return os.path.join(self.path, kind, f"{name}.csv")
+
+    def _fixing_series(self, name):
+        file_name = RATE_ALIASES.get(name, name)
+        if file_name not in self._fixings:
+            path = self._file("fixings", file_name)
+            if not os.path.exists(path):
+                raise ValueError(f"No fixings for {name} in {self.path}")
+            frame = pd.read_csv(path, parse_dates=["date"]).dropna().sort_values("date")
+            self._fixings[file_name] = (frame["date"].to_numpy().astype("datetime64[D]"),
+                                        frame["rate"].to_numpy(dtype=float) / 100)
+        return self._fixings[file_name]
+
+    def _curve_quotes(self, name):
+        if name not in self._quotes:
+            path = self._file("curves", name)
+            if not os.path.exists(path):
+                raise ValueError(f"No curve {name} in {self.path}")
+            quotes = pd.read_csv(path, parse_dates=["date"]).set_index("date").sort_index(kind="stable")
+            self._quotes[name] = (quotes, quotes.index.unique())
+        return self._quotes[name]
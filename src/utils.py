@@ -1,12 +1,10 @@
-from datetime import date, timedelta
+from datetime import date
 
-def get_last_business_day(ref_date: date) -> date:
-    # If Saturday → go back 1 day; if Sunday → go back 2 days
-    if ref_date.weekday() == 5:  # Saturday
-        return ref_date - timedelta(days=1)
-    elif ref_date.weekday() == 6:  # Sunday
-        return ref_date - timedelta(days=2)
-    return ref_date
+from src.calendars.business_calendar import get_calendar
+
+def get_last_business_day(ref_date: date, calendar: str = "WEEKEND") -> date:
+    # Rolls back weekends and the holidays of `calendar` (e.g. "NYSE", "TARGET")
+    return get_calendar(calendar).roll(ref_date, "preceding").item()
 
 # def get_last_business_day_minus_one(ref_date: date) -> date:
 #     # Step 1: Get last business day
@@ -1,16 +1,78 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from src.compute.execution import run_tasks
+
 class BaseWrapper(ABC):
     """
     Abstract base class for financial instrument wrappers.
 
     Each subclass must implement the `price()` method, which returns the
-    instrument's fair value or market value based on internal logic.
+    instrument's fair value or market value based on internal logic, and
+    provides `greeks()`: closed-form wrappers through `_last_level()` and
+    `_bumped()`, simulation-based ones by overriding it.
+
+    Simulation-based wrappers accept `backend` ('serial', 'thread' or
+    'process') and `workers` in `price()` and dispatch their independent
+    work units (path chunks, scenario slices) through `_run()`.
     """
 
     @abstractmethod
-    def price(self, **kwargs):
+    def price(self, backend="serial", workers=None, **kwargs):
         """
         Compute the price of the instrument.
         """
-        pass
\ No newline at end of file
+        pass
+
+    def greeks(self, level_bump=0.01, rate_bump=0.0001, **kwargs):
+        """
+        Price and sensitivities of a wrapper valued in closed form on the
+        index history, by central differences of `price()`: delta and gamma
+        per unit of the last index level (bumped by ±`level_bump`, relative)
+        and rho per unit of rate (discount curve shifted by ±`rate_bump`, 0
+        for wrappers that do not discount). Vega is 0: no closed-form wrapper
+        depends on a volatility. Simulation-based wrappers override this with
+        their Monte Carlo estimators.
+
+        Returns:
+            dict: 'price', 'delta', 'gamma', 'vega' and 'rho', each with its
+            standard error (0, closed form) under '<name>_std_error'.
+        """
+        price = np.asarray(self.price()["price"], dtype=float)
+        level = self._last_level()
+        up = np.asarray(self._bumped(level_factor=1 + level_bump).price()["price"], dtype=float)
+        down = np.asarray(self._bumped(level_factor=1 - level_bump).price()["price"], dtype=float)
+        rate_up = np.asarray(self._bumped(rate_shift=rate_bump).price()["price"], dtype=float)
+        rate_down = np.asarray(self._bumped(rate_shift=-rate_bump).price()["price"], dtype=float)
+
+        step = level_bump * level
+        result = {
+            "price": price,
+            "delta": (up - down) / (2 * step),
+            "gamma": (up - 2 * price + down) / step ** 2,
+            "vega": np.zeros_like(price),
+            "rho": (rate_up - rate_down) / (2 * rate_bump),
+        }
+        for name in list(result):
+            result[f"{name}_std_error"] = np.zeros_like(price)
+        return result
+
+    def _last_level(self):
+        """
+        Last index level the closed-form price is marked on.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide closed-form greeks.")
+
+    def _bumped(self, level_factor=1.0, rate_shift=0.0):
+        """
+        Copy of the wrapper with the last index level scaled by
+        `level_factor` and the discount curve shifted by `rate_shift`.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not provide closed-form greeks.")
+
+    def _run(self, func, tasks, backend="serial", workers=None):
+        """
+        Runs `func(*task)` for every task on the chosen execution backend.
+        """
+        return run_tasks(func, tasks, backend=backend, workers=workers)
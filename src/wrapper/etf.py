@@ -1,25 +1,90 @@
-from base_wrapper import BaseWrapper
+import copy
+
+import numpy as np
+
+from src.wrapper.base_wrapper import BaseWrapper
+from src.wrapper.nav import NAVEngine
 
 class ETF(BaseWrapper):
     """
-    Wrapper class for an Exchange-Traded Fund (ETF).
+    Wrapper class for an Exchange-Traded Fund (ETF) replicating the index.
+
+    The NAV is the index level net of the total expense ratio, accrued
+    daily. Accumulating share classes reinvest the index income;
+    distributing ones pay it out at each `distribution_frequency` period
+    end. Fee arrays hold one value per share class and are valued together.
 
     Attributes:
-        market_price (float): The current price of one ETF share in the market.
-        shares_outstanding (int): The total number of shares issued.
+        engine (NAVEngine): NAV engine on the index history.
+        ter (np.ndarray): Annual total expense ratio as a fraction.
+        distributing (bool): Pays the income out instead of reinvesting it.
+        distribution_frequency (str): 'Monthly', 'Quarterly', 'Semi-Annually' or 'Annually'.
+        income (np.ndarray): Income (dividend) return of the index on each
+            date, required when distributing.
 
     Example:
-        ETF(market_price=25.5, shares_outstanding=100000)
+        ETF(levels, dates, ter=[0.001, 0.002], distributing=True, income=income)
     """
 
-    def __init__(self, market_price: float, shares_outstanding: int):
-        self.market_price = market_price
-        self.shares_outstanding = shares_outstanding
+    def __init__(self, levels, dates, ter=0.0, distributing=False, distribution_frequency="Quarterly", income=None,
+                 act_method="Actual/365", calendar="WEEKEND"):
+        super().__init__()
+        if distributing and income is None:
+            raise ValueError("A distributing ETF needs the income returns of the index.")
+        self.engine = NAVEngine(levels, dates, act_method, calendar)
+        self.ter = np.asarray(ter, dtype=float)
+        self.distributing = distributing
+        self.distribution_frequency = distribution_frequency
+        self.income = income
+
+    @classmethod
+    def from_params(cls, params: dict, level_index, income=None):
+        """
+        Builds the ETF on the `LevelIndex` output from the simulation params
+        (params['ter'] in % per year, params['distributing'] as chosen on the
+        page); `income` is `LevelIndex.income_returns()`.
+        """
+        return cls(
+            levels=level_index["index_value"].to_numpy(),
+            dates=level_index["Date"].to_numpy(),
+            ter=np.asarray(params.get("ter", 0.0), dtype=float) / 100,
+            distributing=params.get("distributing") == "Distributing",
+            distribution_frequency=params.get("distribution_frequency", "Quarterly"),
+            income=None if income is None else np.asarray(income, dtype=float),
+            act_method=params.get("act_method", "Actual/365"),
+            calendar=params.get("calendar", "WEEKEND"),
+        )
 
     def price(self):
         """
-        Calculate the total market capitalization of the ETF.
+        Value of one unit of notional invested on the first date of the
+        index history, on the last date: the NAV plus the distributions
+        received (undiscounted).
+
         Returns:
-            float: Total value = market_price × shares_outstanding
+            dict: 'price', 'std_error' (0, closed form), 'dates', 'nav' and
+            'distributions' (... × dates).
+        """
+        nav = self.engine.net_of_management(self.ter)
+        distributions = np.zeros_like(nav)
+        if self.distributing:
+            nav, distributions = self.engine.distribute(nav, self.income, self.distribution_frequency)
+        return {
+            "price": nav[..., -1] + distributions.sum(axis=-1),
+            "std_error": 0.0,
+            "dates": self.engine.dates,
+            "nav": nav,
+            "distributions": distributions,
+        }
+
+    def _last_level(self):
+        return self.engine.levels[..., -1]
+
+    def _bumped(self, level_factor=1.0, rate_shift=0.0):
+        """
+        Copy on the index history with its last level scaled by
+        `level_factor`; `rate_shift` is ignored, the NAV is not discounted.
         """
-        return self.market_price * self.shares_outstanding
\ No newline at end of file
+        wrapper = copy.copy(self)
+        wrapper.engine = self.engine.bumped(level_factor)
+        return wrapper
@@ -1,25 +1,89 @@
-from base_wrapper import BaseWrapper
+import copy
+
+import numpy as np
+
+from src.wrapper.base_wrapper import BaseWrapper
+from src.wrapper.nav import NAVEngine
 
 class Fund(BaseWrapper):
     """
-    Wrapper class for a traditional Fund (e.g., mutual fund).
+    Wrapper class for a traditional Fund (e.g., mutual fund) invested in the index.
+
+    The NAV accrues the management fee daily and a performance fee above a
+    high-water mark, crystallized at each `crystallization_frequency`
+    period end. The client pays the entry fee on subscription and the exit
+    fee on redemption. Fee arrays hold one value per share class and are
+    valued together.
 
     Attributes:
-        nav (float): Net Asset Value per unit.
-        units (int): Number of units owned or issued.
+        engine (NAVEngine): NAV engine on the index history.
+        management_fee (np.ndarray): Annual management fee as a fraction.
+        performance_fee (np.ndarray): Share of the gains above the high-water mark.
+        entry_fee, exit_fee (np.ndarray): Fractions of the amount subscribed / redeemed.
+        crystallization_frequency (str): 'Monthly', 'Quarterly', 'Semi-Annually' or 'Annually'.
 
     Example:
-        Fund(nav=105.0, units=1000)
+        Fund(levels, dates, management_fee=0.015, performance_fee=[0.1, 0.2], entry_fee=0.02)
     """
 
-    def __init__(self, nav: float, units: int):
-        self.nav = nav
-        self.units = units
+    def __init__(self, levels, dates, management_fee=0.0, performance_fee=0.0, entry_fee=0.0, exit_fee=0.0,
+                 crystallization_frequency="Annually", act_method="Actual/365", calendar="WEEKEND"):
+        super().__init__()
+        self.engine = NAVEngine(levels, dates, act_method, calendar)
+        self.management_fee = np.asarray(management_fee, dtype=float)
+        self.performance_fee = np.asarray(performance_fee, dtype=float)
+        self.entry_fee = np.asarray(entry_fee, dtype=float)
+        self.exit_fee = np.asarray(exit_fee, dtype=float)
+        self.crystallization_frequency = crystallization_frequency
+
+    @classmethod
+    def from_params(cls, params: dict, level_index):
+        """
+        Builds the fund on the `LevelIndex` output from the simulation params
+        (fees in %).
+        """
+        fees = {key: np.asarray(params.get(key, 0.0), dtype=float) / 100
+                for key in ("management_fee", "performance_fee", "entry_fee", "exit_fee")}
+        return cls(
+            levels=level_index["index_value"].to_numpy(),
+            dates=level_index["Date"].to_numpy(),
+            crystallization_frequency=params.get("crystallization_frequency", "Annually"),
+            act_method=params.get("act_method", "Actual/365"),
+            calendar=params.get("calendar", "WEEKEND"),
+            **fees,
+        )
 
     def price(self):
         """
-        Calculate the total value of the fund.
+        Value on the last date of one unit of notional subscribed on the
+        first date of the index history, net of every fee (exit fee
+        included).
+
         Returns:
-            float: Total value = nav × units
+            dict: 'price', 'std_error' (0, closed form), 'dates', and per
+            date (... × dates) 'nav', 'high_water_mark' and 'performance_fees'.
+        """
+        nav = self.engine.net_of_management(self.management_fee)
+        products = np.broadcast_shapes(nav.shape[:-1], self.performance_fee.shape)
+        nav = np.broadcast_to(nav, products + nav.shape[-1:])
+        nav, hwm, fees = self.engine.performance_fees(nav, self.performance_fee, self.crystallization_frequency)
+        return {
+            "price": (1 - self.entry_fee) * nav[..., -1] / nav[..., 0] * (1 - self.exit_fee),
+            "std_error": 0.0,
+            "dates": self.engine.dates,
+            "nav": nav,
+            "high_water_mark": hwm,
+            "performance_fees": fees,
+        }
+
+    def _last_level(self):
+        return self.engine.levels[..., -1]
+
+    def _bumped(self, level_factor=1.0, rate_shift=0.0):
+        """
+        Copy on the index history with its last level scaled by
+        `level_factor`; `rate_shift` is ignored, the NAV is not discounted.
         """
-        return self.nav * self.units
\ No newline at end of file
+        wrapper = copy.copy(self)
+        wrapper.engine = self.engine.bumped(level_factor)
+        return wrapper
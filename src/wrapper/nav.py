@@ -0,0 +1,141 @@
+import copy
+
+import numpy as np
+
+from src.calendars.business_calendar import get_calendar, period_ends
+from src.calendars.day_count import accrual_factors
+
+
+class NAVEngine:
+    """
+    Vectorized net asset value of fund share classes invested in an index.
+
+    Arrays are (... × dates): leading axes hold products (share classes,
+    fee grids or several indices) and broadcast against the fee arrays, so
+    a whole book of funds is valued over the full index history in a few
+    array passes. Management fees and distributions are cumulative
+    products over dates; only the performance fee high-water mark is
+    carried from one crystallization period to the next, in a loop over
+    periods (a handful per year), never over dates.
+
+    NAVs are per unit issued at 1 on the first date.
+
+    Attributes:
+        levels (np.ndarray): (... × dates) gross level of the invested index.
+        dates (np.ndarray): Valuation dates (datetime64[D]).
+        returns (np.ndarray): (... × dates) gross return of each date, 0 on the first.
+        accrual (np.ndarray): Year fraction accrued on each date under
+            `act_method` on `calendar`, 0 on the first.
+
+    Example:
+        engine = NAVEngine(level_index["index_value"], level_index["Date"])
+        nav = engine.net_of_management([0.005, 0.01, 0.015])
+        nav, hwm, fees = engine.performance_fees(nav, 0.2, "Annually")
+    """
+
+    def __init__(self, levels, dates, act_method="Actual/365", calendar="WEEKEND"):
+        self.levels = np.asarray(levels, dtype=float)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        if self.levels.shape[-1] != len(self.dates):
+            raise ValueError("levels must have one value per date.")
+
+        self.returns = np.zeros_like(self.levels)
+        self.returns[..., 1:] = self.levels[..., 1:] / self.levels[..., :-1] - 1
+        self.accrual = accrual_factors(self.dates, act_method, get_calendar(calendar))
+        self.accrual[:1] = 0.0
+
+    def bumped(self, level_factor):
+        """
+        Copy of the engine with the last index level scaled by `level_factor`.
+        """
+        engine = copy.copy(self)
+        engine.levels = self.levels.copy()
+        engine.levels[..., -1] *= level_factor
+        engine.returns = self.returns.copy()
+        engine.returns[..., -1] = (1 + self.returns[..., -1]) * level_factor - 1
+        return engine
+
+    def net_of_management(self, fees):
+        """
+        NAV after the management fee `fees` (annual fraction, one per
+        product) accrued on the previous NAV over each date's year fraction.
+
+        Returns:
+            np.ndarray: (... × dates) NAV, income reinvested.
+        """
+        fees = np.asarray(fees, dtype=float)[..., None]
+        return np.cumprod(1 + self.returns - fees * self.accrual, axis=-1)
+
+    def distribute(self, nav, income, frequency="Quarterly"):
+        """
+        Pays out the income earned by the fund at each `frequency` period end.
+
+        The income of a date is `income` (fraction of the level, e.g. the
+        index dividend yield of that day) times the previous NAV. The NAV
+        drops by the amount paid on the payment date, so after k payments
+        it is the accumulating NAV scaled by the product of (1 - paid
+        fraction) of the k payments.
+
+        Arguments:
+            nav (np.ndarray): (... × dates) accumulating NAV from `net_of_management`.
+            income (np.ndarray): (... × dates) income return, broadcastable to `nav`.
+
+        Returns:
+            tuple: distributing NAV (ex-distribution) and the amount paid on
+            each date, both (... × dates).
+        """
+        income = np.broadcast_to(np.nan_to_num(np.asarray(income, dtype=float)), nav.shape)
+        ends = np.flatnonzero(period_ends(self.dates, frequency))
+
+        # Income accrued over each period (ends[k-1], ends[k]] in units of the accumulating NAV
+        earned = np.zeros(nav.shape)
+        earned[..., 1:] = nav[..., :-1] * income[..., 1:]
+        starts = np.concatenate([[0], ends + 1])
+        accrued = np.add.reduceat(earned, starts, axis=-1)[..., :len(ends)]
+
+        scale = np.ones(nav.shape[:-1] + (len(ends) + 1,))
+        scale[..., 1:] = np.cumprod(1 - accrued / nav[..., ends], axis=-1)
+
+        distributions = np.zeros(nav.shape)
+        distributions[..., ends] = accrued * scale[..., :-1]
+        period = np.searchsorted(ends, np.arange(len(self.dates)), side="right")
+        return nav * scale[..., period], distributions
+
+    def performance_fees(self, nav, rates, frequency="Annually"):
+        """
+        Crystallizes the performance fee `rates` (fraction of the gain above
+        the high-water mark, one per product) at each `frequency` period end.
+
+        Between crystallizations the fee is accrued daily in the published
+        NAV; on a crystallization date it is paid and the high-water mark
+        moves to the NAV after the fee when it was exceeded. The initial
+        high-water mark is the issue NAV.
+
+        Arguments:
+            nav (np.ndarray): (... × dates) NAV before performance fees.
+
+        Returns:
+            tuple: NAV net of performance fees, the high-water mark in force
+            on each date and the fee paid on each date, all (... × dates).
+        """
+        ends = np.flatnonzero(period_ends(self.dates, frequency))
+        rates = np.broadcast_to(np.asarray(rates, dtype=float), nav.shape[:-1])
+
+        # Scale applied by the fees already paid, and high-water mark, per period
+        scale = np.ones(nav.shape[:-1] + (len(ends) + 1,))
+        hwm = np.empty_like(scale)
+        hwm[..., 0] = nav[..., 0]
+        fees = np.zeros(nav.shape)
+        for k, end in enumerate(ends):
+            gross = scale[..., k] * nav[..., end]
+            fee = rates * np.maximum(gross - hwm[..., k], 0.0)
+            fees[..., end] = fee
+            scale[..., k + 1] = scale[..., k] * (1 - fee / gross)
+            hwm[..., k + 1] = np.maximum(hwm[..., k], gross - fee)
+
+        period = np.searchsorted(ends, np.arange(len(self.dates)), side="left")
+        gross = nav * scale[..., period]
+        hwm = hwm[..., period]
+        accrued = rates[..., None] * np.maximum(gross - hwm, 0.0)
+        return gross - accrued, hwm, fees
+
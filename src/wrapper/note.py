@@ -1,9 +1,445 @@
-from base_wrapper import BaseWrapper
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.calendars.business_calendar import add_months, get_calendar
+from src.calendars.day_count import year_fraction
+from src.compute.path_simulator import GBMPathSimulator
+from src.rates.store import get_rate_store
+from src.wrapper.base_wrapper import BaseWrapper
+
+OBSERVATIONS_PER_YEAR = {"Monthly": 12, "Quarterly": 4, "Annually": 1}
+TRADING_DAYS = 252
+
 
 class Note(BaseWrapper):
-    
-    def __init__(self):
+    """
+    Wrapper class for an autocallable (Phoenix) note on one or several underlyings.
+
+    On each observation date the note redeems early at 100% if the basket
+    performance is at or above the autocall barrier. A coupon is paid on
+    each observation where the performance is at or above the coupon
+    barrier; with the memory effect, missed coupons are caught up on the next
+    paying observation. At maturity the capital is repaid in full unless the
+    redemption barrier was breached, in which case the holder receives the
+    final performance (floored at 100% when capital is guaranteed).
+
+    Attributes:
+        spots (array): Current level of each underlying.
+        vols (array): Annualized volatility of each underlying.
+        corr (array): Correlation matrix of the underlyings.
+        rate (float): Continuously compounded discount rate.
+        autocall_barrier (float): Autocall barrier in % of initial fixing.
+        redemption_barrier (float): Capital protection barrier in %.
+        coupon (float): Annual coupon in %, paid pro rata per observation.
+        maturity_years (float): Note maturity in years.
+        observation_frequency (str): 'Monthly', 'Quarterly' or 'Annually'.
+        effet_memoire (bool): Memory effect on missed coupons.
+        barrier_type (str): 'European' (maturity only), 'American' (every
+            observation date) or 'Continuous' (every trading day).
+        option_type (str): 'Worst of', 'Best of' or 'Single Underlying'.
+        capital_guaranteed (bool): Floors the redemption at 100%.
+        coupon_barrier (float): Coupon barrier in %, defaults to the
+            redemption barrier.
+        initial_fixings (array): Strike levels, defaults to `spots` (new issue).
+        div_yields (array): Continuous dividend yields, default 0.
+        valuation_date (date): When set, observation dates are generated on
+            `calendar` (modified following) from this date and simulation
+            times are year fractions under `act_method`; otherwise the grid
+            is regular with 252 trading days per year.
+        calendar (str): Holiday calendar of the observation schedule.
+        act_method (str): Day count convention of the simulation times.
+        curve (ZeroCurve): Discount curve of the observation dates; the
+            simulation drift is then its zero rate at maturity and `rate` is
+            ignored. None discounts at the flat `rate`.
+
+    Example:
+        Note(spots=[100, 50], vols=[0.2, 0.3], corr=[[1, 0.5], [0.5, 1]], rate=0.03,
+             autocall_barrier=100, redemption_barrier=60, coupon=8, maturity_years=5)
+    """
+
+    def __init__(self, spots, vols, corr, rate=0.03, autocall_barrier=100.0, redemption_barrier=60.0,
+                 coupon=0.0, maturity_years=1.0, observation_frequency="Quarterly", effet_memoire=False,
+                 barrier_type="European", option_type="Worst of", capital_guaranteed=False,
+                 coupon_barrier=None, initial_fixings=None, div_yields=0.0, valuation_date=None,
+                 calendar="WEEKEND", act_method="Actual/365", curve=None):
         super().__init__()
+        self.spots = np.atleast_1d(np.asarray(spots, dtype=float))
+        self.vols = np.atleast_1d(np.asarray(vols, dtype=float))
+        self.corr = np.atleast_2d(np.asarray(corr, dtype=float))
+        self.rate = rate
+        self.div_yields = div_yields
+        self.initial_fixings = self.spots if initial_fixings is None else np.asarray(initial_fixings, dtype=float)
+        self.autocall_barrier = autocall_barrier / 100
+        self.redemption_barrier = redemption_barrier / 100
+        self.coupon_barrier = self.redemption_barrier if coupon_barrier is None else coupon_barrier / 100
+        self.effet_memoire = effet_memoire
+        self.barrier_type = barrier_type
+        self.option_type = option_type
+        self.capital_guaranteed = capital_guaranteed
+
+        if observation_frequency not in OBSERVATIONS_PER_YEAR:
+            raise ValueError(f"Unsupported observation frequency: {observation_frequency}")
+        if barrier_type not in ("European", "American", "Continuous"):
+            raise ValueError(f"Unsupported barrier type: {barrier_type}")
+        if option_type not in ("Worst of", "Best of", "Single Underlying"):
+            raise ValueError(f"Unsupported option type: {option_type}")
+
+        per_year = OBSERVATIONS_PER_YEAR[observation_frequency]
+        self.n_observations = int(round(maturity_years * per_year))
+        if self.n_observations < 1:
+            raise ValueError("maturity_years must cover at least one observation period.")
+
+        self.coupon = coupon / 100 / per_year
+        self.observation_dates = None
+
+        if valuation_date is not None:
+            self._dated_schedule(valuation_date, per_year, get_calendar(calendar), act_method)
+        elif barrier_type == "Continuous":
+            # Daily grid; observation dates fall on every (252 / per_year)-th step
+            step = TRADING_DAYS // per_year
+            self.times = np.arange(1, self.n_observations * step + 1) / TRADING_DAYS
+            self.observation_steps = np.arange(1, self.n_observations + 1) * step - 1
+            self.observation_times = self.times[self.observation_steps]
+        else:
+            self.observation_times = np.arange(1, self.n_observations + 1) / per_year
+            self.times = self.observation_times
+            self.observation_steps = np.arange(self.n_observations)
+
+        self.curve = curve
+        if curve is not None:
+            self.rate = float(curve.zero_rates(self.observation_times[-1]))
+
+    def _dated_schedule(self, valuation_date, per_year, calendar, act_method):
+        """
+        Observation dates rolled on `calendar`, with simulation times measured
+        from `valuation_date` under `act_method` (every business day in between
+        for continuous barriers).
+        """
+        start = np.datetime64(valuation_date, "D")
+        months = np.arange(1, self.n_observations + 1) * (12 // per_year)
+        self.observation_dates = calendar.roll(add_months(start, months), "modified_following")
+        self.observation_times = year_fraction(start, self.observation_dates, act_method)
+
+        if self.barrier_type == "Continuous":
+            grid = calendar.business_days(start + np.timedelta64(1, "D"), self.observation_dates[-1])
+            self.times = year_fraction(start, grid, act_method)
+            self.observation_steps = np.searchsorted(grid, self.observation_dates)
+        else:
+            self.times = self.observation_times
+            self.observation_steps = np.arange(self.n_observations)
+
+    @classmethod
+    def from_params(cls, params: dict, prices: pd.DataFrame, rate=0.03):
+        """
+        Builds a note from the simulation params, calibrating spots, volatilities
+        and correlations on the historical `prices` of its underlyings.
+
+        For 'Single Underlying' notes, `prices` is expected to hold one column
+        (e.g. the index level). The observation schedule starts from the last
+        date of `prices`, on params['calendar'] under params['act_method'].
+        Cash flows are discounted on the local curve params['discount_curve']
+        as of that date when one is selected.
+        """
+        prices = prices.dropna(how="all").ffill().dropna()
+        if params.get("option_type") == "Single Underlying":
+            prices = prices.iloc[:, :1]
+
+        log_returns = np.log(prices / prices.shift(1)).dropna()
+        vols = log_returns.std().to_numpy() * np.sqrt(TRADING_DAYS)
+        corr = np.atleast_2d(log_returns.corr().to_numpy()) if prices.shape[1] > 1 else np.ones((1, 1))
+
+        keys = ("autocall_barrier", "redemption_barrier", "coupon", "maturity_years", "observation_frequency",
+                "effet_memoire", "barrier_type", "option_type", "capital_guaranteed", "coupon_barrier")
+        return cls(
+            spots=prices.iloc[-1].to_numpy(),
+            vols=vols,
+            corr=corr,
+            rate=params.get("discount_rate", rate),
+            valuation_date=prices.index[-1],
+            calendar=params.get("calendar", "WEEKEND"),
+            act_method=params.get("act_method", "Actual/365"),
+            curve=get_rate_store().discount_curve(params, prices.index[-1]),
+            **{k: params[k] for k in keys if k in params},
+        )
+
+    def simulator(self, antithetic=True, sampling="pseudo"):
+        return GBMPathSimulator(self.vols, self.corr, self.rate, self.div_yields, self.times,
+                                antithetic=antithetic, sampling=sampling)
+
+    def price(self, n_paths=100_000, chunk_size=None, antithetic=True, sampling="pseudo", seed=None,
+              backend="serial", workers=None):
+        """
+        Monte Carlo price of the note as a fraction of notional.
+
+        Path chunks are independent work units run on `backend` ('serial',
+        'thread' or 'process') with `workers` workers; each chunk draws from
+        its own spawned seed stream, so the result does not depend on the
+        backend or the worker count.
+
+        Returns:
+            dict: 'price', 'std_error', 'n_paths', 'elapsed' (seconds) and
+            'paths_per_second', plus 'autocall_probability' per observation.
+        """
+        start = time.perf_counter()
+        simulator = self.simulator(antithetic=antithetic, sampling=sampling)
+        tasks = [(self, simulator, n, stream, offset) for n, stream, offset in
+                 simulator.plan(n_paths, chunk_size, seed)]
+
+        estimator, n_done, exits = None, 0, np.zeros(self.n_observations)
+        for chunk_estimator, chunk_paths, chunk_exits in self._run(_price_chunk, tasks, backend, workers):
+            estimator = chunk_estimator if estimator is None else estimator.merge(chunk_estimator)
+            n_done += chunk_paths
+            exits += chunk_exits
+
+        elapsed = time.perf_counter() - start
+        return {
+            "price": estimator.mean,
+            "std_error": estimator.std_error,
+            "n_paths": n_done,
+            "elapsed": elapsed,
+            "paths_per_second": n_done / elapsed if elapsed > 0 else float("inf"),
+            "autocall_probability": exits[:self.n_observations - 1] / n_done,
+        }
+
+    def greeks(self, n_paths=100_000, chunk_size=None, antithetic=True, sampling="pseudo", seed=None,
+               vol_bump=0.01, rate_bump=0.0001, backend="serial", workers=None):
+        """
+        Price and sensitivities from a single batched simulation.
+
+        Autocall and barrier payoffs are discontinuous, so delta and gamma use
+        likelihood-ratio weights on the first simulated step (no extra paths).
+        Vega and rho are central differences computed with common random
+        numbers: every bumped scenario (vol up/down per underlying, rate
+        up/down) reuses the base draws and is simulated in the same vectorized
+        pass as an extra leading axis.
+
+        Returns:
+            dict: 'price', 'delta' and 'gamma' (per unit of each spot),
+            'vega' (per unit of each volatility), 'rho' (per unit of rate),
+            each with its standard error under '<name>_std_error'.
+        """
+        simulator = self.simulator(antithetic=antithetic, sampling=sampling)
+        n_scenarios = 2 * len(self.vols) + 2
+        if chunk_size is None:
+            chunk_size = max(2, simulator.default_chunk_size() // n_scenarios // 2 * 2)
+
+        tasks = [(self, simulator, n, stream, offset, vol_bump, rate_bump) for n, stream, offset in
+                 simulator.plan(n_paths, chunk_size, seed)]
+
+        merged = None
+        for estimators in self._run(_greeks_chunk, tasks, backend, workers):
+            merged = estimators if merged is None else {k: merged[k].merge(v) for k, v in estimators.items()}
+
+        result = {}
+        for name, estimator in merged.items():
+            result[name] = estimator.mean
+            result[f"{name}_std_error"] = estimator.std_error
+        return result
+
+    def scenario_prices(self, spot_moves, rate_shifts=0.0, vol_shifts=0.0, n_paths=100_000, chunk_size=None,
+                        antithetic=True, sampling="pseudo", seed=None, backend="serial", workers=None):
+        """
+        Prices after instantaneous market shocks, every scenario in one batched
+        simulation.
+
+        Scenarios share the same draws (common random numbers, as in `greeks`)
+        on a leading axis, so price differences between scenarios carry little
+        Monte Carlo noise. Strikes stay at `initial_fixings`.
+
+        Arguments:
+            spot_moves (array): (scenarios × assets) shocked over current spot.
+            rate_shifts (float or array): Additive shift of the discount rate,
+                one per scenario.
+            vol_shifts (float or array): Additive shift of the volatilities, one
+                per scenario or (scenarios × assets).
+
+        Returns:
+            dict: 'price' and 'std_error', one per scenario.
+        """
+        moves = np.atleast_2d(np.asarray(spot_moves, dtype=float))
+        n_scenarios = moves.shape[0]
+        if moves.shape[1] != len(self.vols):
+            raise ValueError("spot_moves must have one column per underlying.")
+
+        rates = float(self.rate) + np.broadcast_to(np.asarray(rate_shifts, dtype=float), (n_scenarios,))
+        vol_shifts = np.asarray(vol_shifts, dtype=float)
+        if vol_shifts.ndim == 1:
+            vol_shifts = vol_shifts[:, None]
+        vols = np.maximum(np.broadcast_to(self.vols + vol_shifts, moves.shape), 0.0)
+
+        simulator = self.simulator(antithetic=antithetic, sampling=sampling)
+        if chunk_size is None:
+            chunk_size = max(2, simulator.default_chunk_size() // n_scenarios // 2 * 2)
+        tasks = [(self, simulator, n, stream, offset, moves, vols, rates) for n, stream, offset in
+                 simulator.plan(n_paths, chunk_size, seed)]
+
+        estimator = None
+        for chunk_estimator in self._run(_scenario_chunk, tasks, backend, workers):
+            estimator = chunk_estimator if estimator is None else estimator.merge(chunk_estimator)
+        return {"price": estimator.mean, "std_error": estimator.std_error}
+
+    def discount_factors(self, rate=None):
+        """
+        Discount factor of each observation date, optionally under shifted
+        drift rates `rate` (one per scenario). With a curve, shifted rates
+        move the whole curve by their difference from the drift rate.
+        """
+        if self.curve is None:
+            rate = self.rate if rate is None else np.asarray(rate, dtype=float)[..., None]
+            return np.exp(-rate * self.observation_times)
+        shift = 0.0 if rate is None else np.asarray(rate, dtype=float)[..., None] - self.rate
+        return self.curve.discount(self.observation_times) * np.exp(-shift * self.observation_times)
+
+    def present_values(self, paths, discount):
+        """
+        Discounted payoff of every path.
+
+        Arguments:
+            paths (np.ndarray): (... × paths × steps × assets) performances
+                relative to today's spots.
+            discount (np.ndarray): Discount factor of each observation date,
+                optionally with the same leading axes as `paths`.
+
+        Returns:
+            tuple: present values (... × paths) and the index of the
+            observation on which each path redeems (maturity = last index).
+        """
+        moneyness = self.spots / self.initial_fixings
+        performance = self._basket(paths if np.all(moneyness == 1) else paths * moneyness)
+        observed = performance[..., self.observation_steps]
+
+        if self.barrier_type == "European":
+            knocked_in = observed[..., -1] < self.redemption_barrier
+        else:
+            knocked_in = performance.min(axis=-1) < self.redemption_barrier
+
+        coupons, redemption, exit_index = autocall_cashflows(
+            observed, knocked_in, self.autocall_barrier, self.coupon_barrier, self.coupon,
+            self.effet_memoire, self.capital_guaranteed,
+        )
+        discount = np.broadcast_to(discount[..., None, :], coupons.shape)
+        redemption_discount = np.take_along_axis(discount, exit_index[..., None], axis=-1)[..., 0]
+        pv = (coupons * discount).sum(axis=-1) + redemption * redemption_discount
+        return pv, exit_index
+
+    def _basket(self, performances):
+        if self.option_type == "Worst of":
+            return performances.min(axis=-1)
+        if self.option_type == "Best of":
+            return performances.max(axis=-1)
+        return performances[..., 0]
+
+
+def autocall_cashflows(observed, knocked_in, autocall_barrier, coupon_barrier, coupon, memory=False,
+                       capital_guaranteed=False):
+    """
+    Vectorized autocall lifecycle on observed basket performances.
+
+    Arguments:
+        observed (np.ndarray): (... × observations) basket performance on each
+            observation date, maturity last.
+        knocked_in (np.ndarray): (...) whether the redemption barrier was breached.
+        autocall_barrier, coupon_barrier (float): Barriers as fractions of the
+            initial fixing.
+        coupon (float): Coupon per observation period as a fraction of notional.
+        memory (bool): Missed coupons are caught up on the next paying observation.
+        capital_guaranteed (bool): Floors the redemption at 100%.
+
+    Returns:
+        tuple: coupons paid on each observation (... × observations), the
+        redemption amount (...) and the index of the redemption observation (...).
+    """
+    n_obs = observed.shape[-1]
+    steps = np.arange(n_obs)
+
+    called = observed[..., :-1] >= autocall_barrier
+    exit_index = np.where(called.any(axis=-1), called.argmax(axis=-1), n_obs - 1)
+    alive = steps <= exit_index[..., None]
+
+    paying = alive & ((observed >= coupon_barrier) | (steps == exit_index[..., None]) & (observed >= autocall_barrier))
+    if memory:
+        last_paid = np.maximum.accumulate(np.where(paying, steps, -1), axis=-1)
+        previous = np.concatenate([np.full(last_paid.shape[:-1] + (1,), -1), last_paid[..., :-1]], axis=-1)
+        coupons = np.where(paying, (steps - previous) * coupon, 0.0)
+    else:
+        coupons = np.where(paying, coupon, 0.0)
+
+    final = observed[..., -1]
+    # A knocked-in path repays its final performance, capped at par
+    at_maturity = np.where(knocked_in, np.minimum(final, 1.0), 1.0)
+    if capital_guaranteed:
+        at_maturity = np.maximum(at_maturity, 1.0)
+    redemption = np.where(exit_index < n_obs - 1, 1.0, at_maturity)
+    return coupons, redemption, exit_index
+
+
+def _price_chunk(note, simulator, n, seed_sequence, offset):
+    """
+    Prices one chunk of paths; module level so process workers can unpickle it.
+    """
+    paths = simulator.performances(simulator.normals(n, seed_sequence, offset))
+    pv, exit_index = note.present_values(paths, note.discount_factors())
+    samples = _pair_average(pv) if simulator.antithetic else pv
+    exits = np.bincount(exit_index.ravel(), minlength=note.n_observations)
+    return simulator.estimator(samples, offset), pv.size, exits
+
+
+def _greeks_chunk(note, simulator, n, seed_sequence, offset, vol_bump, rate_bump):
+    """
+    Price, likelihood-ratio delta/gamma and common-random-number vega/rho
+    estimators for one chunk of paths.
+    """
+    z = simulator.normals(n, seed_sequence, offset)
+    n_assets = len(note.vols)
+
+    pv, _ = note.present_values(simulator.performances(z), note.discount_factors())
+
+    # Score of the first step's density with respect to each spot
+    dt = simulator.dt[0]
+    corr_inv = np.linalg.inv(note.corr)
+    whitened = z[:, 0, :] @ np.linalg.inv(simulator.cholesky)
+    scale = note.vols * np.sqrt(dt) * note.spots
+    score = whitened / scale
+    score_slope = -score / note.spots - np.diag(corr_inv) / (note.vols ** 2 * dt * note.spots ** 2)
+
+    # Bumped scenarios on a leading axis: (vol_i up, vol_i down) per asset, then rate up, rate down
+    vols = np.tile(note.vols, (2 * n_assets + 2, 1))
+    rates = np.full(2 * n_assets + 2, float(note.rate))
+    assets = np.arange(n_assets)
+    vols[2 * assets, assets] += vol_bump
+    vols[2 * assets + 1, assets] -= vol_bump
+    rates[-2:] += (rate_bump, -rate_bump)
+    bumped, _ = note.present_values(simulator.performances(z, vols=vols, rate=rates), note.discount_factors(rates))
+
+    samples = {
+        "price": pv,
+        "delta": pv[:, None] * score,
+        "gamma": pv[:, None] * (score ** 2 + score_slope),
+        "vega": (bumped[0:2 * n_assets:2] - bumped[1:2 * n_assets:2]).T / (2 * vol_bump),
+        "rho": (bumped[-2] - bumped[-1]) / (2 * rate_bump),
+    }
+    if simulator.antithetic:
+        samples = {k: _pair_average(v, axis=0) for k, v in samples.items()}
+    return {k: simulator.estimator(v, offset) for k, v in samples.items()}
+
+
+def _scenario_chunk(note, simulator, n, seed_sequence, offset, moves, vols, rates):
+    """
+    Present values of one chunk of paths under every shocked scenario.
+    """
+    paths = simulator.performances(simulator.normals(n, seed_sequence, offset), vols=vols, rate=rates)
+    pv, _ = note.present_values(paths * moves[:, None, None, :], note.discount_factors(rates))
+    samples = pv.T
+    if simulator.antithetic:
+        samples = _pair_average(samples, axis=0)
+    return simulator.estimator(samples, offset)
+
 
-    def price(self):
-        pass
\ No newline at end of file
+def _pair_average(values, axis=-1):
+    """
+    Averages antithetic pairs (first half against second half of the chunk).
+    """
+    first, second = np.split(values, 2, axis=axis)
+    return 0.5 * (first + second)
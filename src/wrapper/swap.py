@@ -1,34 +1,223 @@
-from base_wrapper import BaseWrapper
+import copy
 
-class Note(BaseWrapper):
+import numpy as np
+
+from src.calendars.business_calendar import add_months, get_calendar
+from src.calendars.day_count import year_fraction
+from src.rates.curve import ZeroCurve
+from src.rates.store import get_rate_store
+from src.wrapper.base_wrapper import BaseWrapper
+
+FUNDING_LEGS = ("Floating", "Fixed")
+
+
+def reset_dates(start, maturity_years, frequency="Quarterly", calendar="WEEKEND"):
+    """
+    Trade date followed by the reset (payment) dates up to the maturity,
+    rolled modified following on `calendar`.
     """
-    Wrapper class for a fixed-rate bond or note.
+    start = np.datetime64(start, "D")
+    end = add_months(start, int(round(maturity_years * 12)))
+    return np.concatenate([[start], get_calendar(calendar).schedule(start, end, frequency)])
+
+
+class Swap(BaseWrapper):
+    """
+    Total return swap on the index: the holder receives the index
+    performance over each reset period and pays a funding leg, either the
+    floating fixing plus a spread or a fixed rate, on a notional reset to 1
+    at every reset date.
+
+    Valued in closed form off the index path. Between resets t_k and
+    t_k+1 the index leg is worth L(t) / L(t_k) - DF(t, T) (the current
+    period plus a strip of par floaters); the floating funding leg is
+    (1 + (r_k + spread) τ_k) DF(t, t_k+1) - DF(t, T) + spread × (annuity of
+    later periods) and the fixed one rate × (annuity from the current
+    period). The curve is applied as seen from each valuation date, so the
+    whole mark-to-market history is one (dates × periods) discount grid.
+    Spreads and fixed rates may be arrays (one per product) and broadcast
+    over the history.
 
     Attributes:
-        face_value (float): Principal amount repaid at maturity.
-        coupon_rate (float): Annual coupon rate (e.g., 0.05 for 5%).
-        years_to_maturity (int): Number of years until maturity.
+        levels (np.ndarray): (... × dates) index level (total return for a
+            self-financing index leg).
+        dates (np.ndarray): Index dates (datetime64[D]).
+        resets (np.ndarray): Trade date, reset dates and maturity.
+        accruals (np.ndarray): Year fraction of each reset period under `act_method`.
+        funding_leg (str): 'Floating' or 'Fixed'.
+        fixed_rate (np.ndarray): Fixed funding rate as a fraction.
+        spread (np.ndarray): Spread over the floating fixing as a fraction.
+        curve (ZeroCurve): Discount curve.
+        fixings (np.ndarray): Floating fixing of each reset period; periods
+            not fixed (NaN or no fixings given) use the curve forward between
+            their reset dates.
+        fixed (np.ndarray): True for the periods fixed from the given fixings.
 
     Example:
-        Note(face_value=1000, coupon_rate=0.05, years_to_maturity=3)
+        Swap(levels, dates, maturity_years=5, spread=[0.0025, 0.005], curve=ZeroCurve.flat(0.03))
     """
 
-    def __init__(self, face_value: float, coupon_rate: float, years_to_maturity: int):
-        self.face_value = face_value
-        self.coupon_rate = coupon_rate
-        self.years_to_maturity = years_to_maturity
+    def __init__(self, levels, dates, maturity_years=5.0, reset_frequency="Quarterly", funding_leg="Floating",
+                 fixed_rate=0.0, spread=0.0, curve=None, fixings=None, trade_date=None, act_method="Actual/365",
+                 calendar="WEEKEND"):
+        super().__init__()
+        if funding_leg not in FUNDING_LEGS:
+            raise ValueError(f"Unsupported funding leg: {funding_leg}")
+        self.levels = np.asarray(levels, dtype=float)
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+        self.funding_leg = funding_leg
+        self.fixed_rate = np.asarray(fixed_rate, dtype=float)
+        self.spread = np.asarray(spread, dtype=float)
+        self.curve = curve or ZeroCurve.flat(0.03)
+        self.act_method = act_method
+
+        self.resets = reset_dates(self.dates[0] if trade_date is None else trade_date, maturity_years,
+                                  reset_frequency, calendar)
+        if len(self.resets) < 2:
+            raise ValueError("maturity_years must cover at least one reset period.")
+        self.accruals = year_fraction(self.resets[:-1], self.resets[1:], act_method)
+
+        # Periods not fixed yet (NaN) use the curve forward between their reset dates
+        self.fixed = np.zeros(len(self.accruals), dtype=bool) if fixings is None else ~np.isnan(fixings)
+        self.fixings = np.where(self.fixed, fixings if fixings is not None else 0.0, self._curve_forwards())
+
+    @classmethod
+    def from_params(cls, params: dict, level_index, curve=None, fixings=None):
+        """
+        Builds the swap on the `LevelIndex` output from the simulation params
+        (fixed rate in %, spread in bp), trading on the first index date.
+
+        Discounts on `curve`, by default the local curve
+        params['discount_curve'] as of the last index date, or flat at
+        params['discount_rate']. Floating periods are fixed from `fixings`,
+        by default the local fixings of params['floating_rate_index'] on
+        each reset date when the rate store has them.
+        """
+        dates = level_index["Date"].to_numpy()
+        rates = get_rate_store()
+        curve = curve or rates.discount_curve(params, dates[-1]) or ZeroCurve.flat(params.get("discount_rate", 0.03))
+        maturity_years = params.get("swap_maturity_years", 5.0)
+        reset_frequency = params.get("reset_frequency", "Quarterly")
+        calendar = params.get("calendar", "WEEKEND")
+
+        index_name = params.get("floating_rate_index")
+        if fixings is None and index_name and rates.has_fixings(index_name):
+            resets = reset_dates(dates[0], maturity_years, reset_frequency, calendar)
+            fixings = rates.fixings(index_name, resets[:-1])
+
+        return cls(
+            levels=level_index["index_value"].to_numpy(),
+            dates=dates,
+            maturity_years=maturity_years,
+            reset_frequency=reset_frequency,
+            funding_leg=params.get("funding_leg", "Floating"),
+            fixed_rate=np.asarray(params.get("fixed_rate", 0.0), dtype=float) / 100,
+            spread=np.asarray(params.get("funding_spread", 0.0), dtype=float) / 10_000,
+            curve=curve,
+            fixings=fixings,
+            act_method=params.get("act_method", "Actual/365"),
+            calendar=calendar,
+        )
+
+    def _curve_forwards(self):
+        """
+        Forward rate of each reset period on the curve, from the times of
+        its reset dates after the curve date (the trade date for an undated
+        curve). Periods already started on the curve date are read over
+        their length from the curve date.
+        """
+        origin = self.resets[0] if self.curve.asof is None else self.curve.asof
+        times = year_fraction(origin, self.resets, self.curve.act_method)
+        start = np.maximum(times[:-1], 0.0)
+        return self.curve.forward_rates(start, start + (times[1:] - times[:-1]))
+
+    def mark_to_market(self):
+        """
+        Value of the swap for the index receiver on every index date, per
+        unit notional: NaN before the trade date, 0 from maturity on.
+
+        Returns:
+            np.ndarray: (... × dates) mark-to-market.
+        """
+        alive = (self.dates >= self.resets[0]) & (self.dates < self.resets[-1])
+        period = np.clip(np.searchsorted(self.resets, self.dates, side="right") - 1, 0, len(self.accruals) - 1)
+
+        # Discount factor from each date to each payment date, later payments only
+        discount = self.curve.discount(year_fraction(self.dates[:, None], self.resets[None, 1:], self.act_method))
+        later = np.arange(len(self.accruals)) > period[:, None]
+        maturity_discount = discount[:, -1]
+        next_discount = discount[np.arange(len(self.dates)), period]
+
+        annuity = (np.where(later, discount, 0.0) * self.accruals).sum(axis=-1)
+
+        index_leg = self.levels / self._reset_levels()[..., period] - maturity_discount
+        if self.funding_leg == "Floating":
+            spread = self.spread[..., None]
+            current = 1 + (self.fixings[period] + spread) * self.accruals[period]
+            funding = current * next_discount - maturity_discount + spread * annuity
+        else:
+            funding = self.fixed_rate[..., None] * (annuity + self.accruals[period] * next_discount)
+
+        value = np.where(alive, index_leg - funding, 0.0)
+        return np.where(self.dates < self.resets[0], np.nan, value)
+
+    def settlements(self):
+        """
+        Net amount settled at each reset date within the index history: the
+        index return of the period minus its funding, per unit notional.
 
-    def price(self, discount_rate=0.03):
+        Returns:
+            tuple: settlement dates and the (... × settlements) amounts.
         """
-        Calculate the present value of the bond using a fixed discount rate.
+        paid = np.flatnonzero(self.resets[1:] <= self.dates[-1])
+        reset_levels = self._reset_levels()
+        index_return = reset_levels[..., paid + 1] / reset_levels[..., paid] - 1
+        if self.funding_leg == "Floating":
+            rate = self.fixings[paid] + self.spread[..., None]
+        else:
+            rate = self.fixed_rate[..., None] + np.zeros(len(paid))
+        return self.resets[paid + 1], index_return - rate * self.accruals[paid]
 
-        Arguments:
-            discount_rate (float): Annual discount rate used for present value.
+    def price(self):
+        """
+        Mark-to-market on the last index date, with its history and the
+        cumulative P&L (settlements received plus mark-to-market).
 
         Returns:
-            float: Present value = PV(coupons) + PV(face value)
+            dict: 'price', 'std_error' (0, closed form), 'dates', and per
+            date (... × dates) 'mtm' and 'pnl'.
+        """
+        mtm = self.mark_to_market()
+        settled_dates, amounts = self.settlements()
+        settled = np.concatenate([np.zeros(amounts.shape[:-1] + (1,)), np.cumsum(amounts, axis=-1)], axis=-1)
+        realized = settled[..., np.searchsorted(settled_dates, self.dates, side="right")]
+        return {
+            "price": mtm[..., -1],
+            "std_error": 0.0,
+            "dates": self.dates,
+            "mtm": mtm,
+            "pnl": realized + mtm,
+        }
+
+    def _reset_levels(self):
+        """
+        Index level on each reset date (last index date on or before it).
+        """
+        last = np.clip(np.searchsorted(self.dates, self.resets, side="right") - 1, 0, len(self.dates) - 1)
+        return self.levels[..., last]
+
+    def _last_level(self):
+        return self.levels[..., -1]
+
+    def _bumped(self, level_factor=1.0, rate_shift=0.0):
+        """
+        Copy with the last index level scaled by `level_factor` and the curve
+        shifted by `rate_shift`, periods not fixed following its forwards.
         """
-        coupons = self.coupon_rate * self.face_value
-        pv_coupons = coupons * ((1 - (1 + discount_rate) ** -self.years_to_maturity) / discount_rate)
-        pv_face = self.face_value / ((1 + discount_rate) ** self.years_to_maturity)
-        return pv_coupons + pv_face
\ No newline at end of file
+        swap = copy.copy(self)
+        swap.levels = self.levels.copy()
+        swap.levels[..., -1] *= level_factor
+        if rate_shift:
+            swap.curve = self.curve.shifted(rate_shift)
+            swap.fixings = np.where(self.fixed, self.fixings, swap._curve_forwards())
+        return swap
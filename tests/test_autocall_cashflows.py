@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.wrapper.note import autocall_cashflows
+
+
+def cashflows(observed, knocked_in, memory=False, capital_guaranteed=False):
+    return autocall_cashflows(np.array([observed]), np.array([knocked_in]), autocall_barrier=1.2,
+                              coupon_barrier=0.8, coupon=0.05, memory=memory, capital_guaranteed=capital_guaranteed)
+
+
+def test_knocked_in_path_recovering_above_par_redeems_at_par():
+    _, redemption, exit_index = cashflows([0.9, 0.5, 1.1], knocked_in=True)
+    assert exit_index[0] == 2
+    assert redemption[0] == 1.0
+
+
+def test_knocked_in_path_below_par_redeems_at_final_performance():
+    _, redemption, _ = cashflows([0.9, 0.5, 0.7], knocked_in=True)
+    assert redemption[0] == 0.7
+
+
+def test_capital_guarantee_floors_knocked_in_redemption():
+    _, redemption, _ = cashflows([0.9, 0.5, 0.7], knocked_in=True, capital_guaranteed=True)
+    assert redemption[0] == 1.0
+
+
+def test_autocall_redeems_at_par_with_coupon():
+    coupons, redemption, exit_index = cashflows([0.9, 1.3, 0.5], knocked_in=True)
+    assert exit_index[0] == 1
+    assert redemption[0] == 1.0
+    np.testing.assert_allclose(coupons[0], [0.05, 0.05, 0.0])
+
+
+def test_memory_catches_up_missed_coupons():
+    coupons, _, _ = cashflows([0.7, 0.6, 0.9], knocked_in=False, memory=True)
+    np.testing.assert_allclose(coupons[0], [0.0, 0.0, 0.15])
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from api.batch_fetcher import BatchFetcher
+from api.providers import BaseProvider
+
+
+class CountingProvider(BaseProvider):
+    """
+    Serves a constant close for known tickers and an empty column otherwise;
+    the currency call fails until `currency_failures` calls have been made.
+    """
+
+    def __init__(self, known, currency_failures=0):
+        self.known = known
+        self.currency_failures = currency_failures
+        self.calls = {}
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        for ticker in tickers:
+            self.calls[ticker] = self.calls.get(ticker, 0) + 1
+        dates = pd.bdate_range("2024-01-01", periods=3)
+        return pd.DataFrame({t: 100.0 if t in self.known else float("nan") for t in tickers}, index=dates)
+
+    def get_currency(self, ticker):
+        self.calls["currency"] = self.calls.get("currency", 0) + 1
+        if self.calls["currency"] <= self.currency_failures:
+            raise ConnectionError("timeout")
+        return "USD"
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        return pd.Series(dtype=float)
+
+
+def test_empty_prices_are_not_retried():
+    provider = CountingProvider(known={"AAA"})
+    with BatchFetcher(provider, retries=3, backoff=0.0) as fetcher:
+        report = fetcher.fetch_prices(["AAA", "ZZZ"])
+    assert sorted(report.values) == ["AAA"] and sorted(report.errors) == ["ZZZ"]
+    assert provider.calls == {"AAA": 1, "ZZZ": 1}
+
+
+def test_failures_are_fetched_again_and_successes_memoised():
+    provider = CountingProvider(known=set(), currency_failures=2)
+    with BatchFetcher(provider, retries=1, backoff=0.0) as fetcher:
+        assert not fetcher.fetch_currencies(["AAA"]).ok
+        assert fetcher.get_currency("AAA") == "USD"
+        assert fetcher.get_currency("AAA") == "USD"
+    assert provider.calls["currency"] == 3
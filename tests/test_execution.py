@@ -0,0 +1,15 @@
+import numpy as np
+
+from src.compute.execution import MeanEstimator
+
+
+def test_merged_std_error_keeps_its_precision_on_offset_samples():
+    samples = 1e8 + np.random.default_rng(0).standard_normal((20_000, 2))
+    estimator = MeanEstimator()
+    for chunk in np.array_split(samples, 7):
+        estimator = estimator.merge(MeanEstimator.from_samples(chunk))
+
+    expected = samples.std(axis=0, ddof=1) / np.sqrt(len(samples))
+    np.testing.assert_allclose(estimator.std_error, expected, rtol=1e-8)
+    np.testing.assert_allclose(estimator.mean, samples.mean(axis=0), rtol=1e-14)
+    assert estimator.count == len(samples)
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from api.providers import LocalProvider
+from src.compute.fx import FXMatrix
+from src.pipeline import SimulationPipeline
+
+DATES = pd.bdate_range("2024-01-01", periods=4)
+CLOSES = pd.DataFrame({"AAA": [100.0, 101.0, 102.0, 103.0], "BBB": [50.0, 51.0, 52.0, 53.0]}, index=DATES)
+
+
+def test_unknown_currency_is_not_taken_as_the_index_currency():
+    with pytest.raises(ValueError, match="BBB"):
+        FXMatrix.from_prices(pd.DataFrame(index=DATES), {"AAA": "EUR", "BBB": None}, "EUR", DATES)
+
+
+def test_failed_currency_lookup_fails_the_fetch():
+    provider = LocalProvider(CLOSES, currencies={"AAA": "EUR"})
+    pipeline = SimulationPipeline(cache_dir=None, provider=provider)
+    params = {"components": [{"ticker": "AAA", "weight": 50}, {"ticker": "BBB", "weight": 50}],
+              "index_currency": "EUR", "start_date": "2024-01-01", "end_date": "2024-01-06"}
+    try:
+        with pytest.raises(ValueError, match="Currency lookup failed for BBB"):
+            pipeline.fetch(params)
+    finally:
+        pipeline.close()
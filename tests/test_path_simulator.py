@@ -0,0 +1,20 @@
+import numpy as np
+
+from src.compute.path_simulator import GBMPathSimulator
+
+
+def quasi_simulator():
+    return GBMPathSimulator([0.2, 0.3], [[1.0, 0.4], [0.4, 1.0]], 0.02, 0.0, [1.0, 2.0, 3.0], sampling="quasi")
+
+
+def test_quasi_shifts_follow_the_seed():
+    simulator = quasi_simulator()
+    draws = [simulator.normals(n, stream, offset) for seed in (1, 2) for n, stream, offset in simulator.plan(64, seed=seed)]
+    assert not np.allclose(draws[0], draws[1])
+
+
+def test_quasi_draws_do_not_depend_on_chunking():
+    simulator = quasi_simulator()
+    whole = np.concatenate([simulator.normals(n, s, o)[:n // 2] for n, s, o in simulator.plan(64, 64, seed=7)])
+    chunked = np.concatenate([simulator.normals(n, s, o)[:n // 2] for n, s, o in simulator.plan(64, 16, seed=7)])
+    np.testing.assert_array_equal(whole, chunked)
@@ -0,0 +1,43 @@
+import pandas as pd
+
+from api.price_cache import PriceCache
+from api.providers import BaseProvider
+
+DATES = pd.bdate_range("2024-01-01", periods=5)
+
+
+class FlakyProvider(BaseProvider):
+    """
+    Returns an all-NaN column for every ticker on the first `failures` calls, closes afterwards.
+    """
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.calls = 0
+
+    def get_prices(self, tickers, start_date=None, end_date=None, adjusted=True):
+        self.calls += 1
+        value = float("nan") if self.calls <= self.failures else 100.0
+        return pd.DataFrame({t: value for t in tickers}, index=DATES)
+
+    def get_currency(self, ticker):
+        return "USD"
+
+    def get_dividends(self, ticker, start_date=None, end_date=None):
+        return pd.Series(dtype=float)
+
+
+def test_empty_fetch_is_not_recorded_as_coverage(tmp_path):
+    provider = FlakyProvider(failures=1)
+    cache = PriceCache(provider=provider, cache_dir=str(tmp_path))
+
+    first = cache.get_prices(["AAA"], "2024-01-01", "2024-01-08")
+    assert first["AAA"].isna().all()
+    assert "AAA" not in cache.index
+
+    second = cache.get_prices(["AAA"], "2024-01-01", "2024-01-08")
+    assert provider.calls == 2
+    assert (second["AAA"] == 100.0).all()
+
+    cache.get_prices(["AAA"], "2024-01-01", "2024-01-08")
+    assert provider.calls == 2
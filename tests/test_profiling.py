@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.profiling import Tracer
+
+
+def test_concurrent_runs_keep_their_own_spans():
+    tracer = Tracer()
+    barrier = threading.Barrier(2)
+    runs = {}
+
+    def session(name):
+        with tracer.run(name) as run:
+            barrier.wait()
+            with tracer.span(f"{name}.stage"):
+                barrier.wait()
+            runs[name] = run
+
+    threads = [threading.Thread(target=session, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert runs["a"] != runs["b"]
+    for name, run in runs.items():
+        assert [span["name"] for span in tracer.stage_table(run)] == [name, f"{name}.stage"]
+    assert tracer.current_run is None
+
+
+def test_bound_workers_trace_into_the_caller_run():
+    tracer = Tracer()
+
+    def work():
+        with tracer.span("worker"):
+            pass
+
+    with tracer.run("batch") as run, ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(tracer.bind(work)).result()
+    assert [span.name for span in tracer.run_spans(run)] == ["worker", "batch"]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_market_data
+from src.compute.level_index import LevelIndex
+from src.compute.scenarios import Scenario, ScenarioEngine
+
+
+@pytest.mark.parametrize("frequency", ["Weekly", "Monthly"])
+def test_rebalanced_paths_match_the_level_index_of_the_shocked_history(frequency):
+    data = synthetic_market_data(400, 3)
+    tickers = [c for c in data.columns if not c.startswith("dividend_") and c != "^IRX"][:3]
+    params = {"components": [{"ticker": t, "weight": w} for t, w in zip(tickers, [50, 30, 20])],
+              "return_type": "Price Return", "rebalancing_freq": frequency, "transaction_cost": 0.5}
+    scenarios = [Scenario.hypothetical("Crash", equity=-0.3, horizon=40), Scenario.hypothetical("Rally", equity=0.2, horizon=25)]
+    engine = ScenarioEngine(data, params)
+    paths = engine.index_paths(scenarios)[0]
+    base = engine.base()
+
+    for j, scenario in enumerate(scenarios):
+        returns, _ = scenario.shocks(base["prices"], base["rates"], data.index, engine.tickers)
+        dates = pd.DatetimeIndex(engine._shock_dates(len(returns)))
+        shocked = pd.DataFrame(base["prices"][-1] * np.cumprod(1 + returns, axis=0), index=dates, columns=tickers)
+        levels = LevelIndex(pd.concat([data, shocked]), params).compute()["index_value"].to_numpy()
+        expected = levels[-len(returns):] / levels[-len(returns) - 1] * base["levels"].iloc[-1]
+        np.testing.assert_allclose(paths[:len(returns), j], expected, rtol=1e-12)
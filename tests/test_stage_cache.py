@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from src.pipeline import StageCache
+
+
+def test_hit_flag_comes_from_the_lookup():
+    cache = StageCache()
+    assert cache.get_or_compute("k", lambda: 1) == (1, False)
+    assert cache.get_or_compute("k", lambda: 2) == (1, True)
+    assert cache.get_or_compute("none", lambda: None) == (None, False)
+    assert cache.get_or_compute("none", lambda: 3) == (None, True)
+
+
+def test_concurrent_lookups_keep_consistent_counters(tmp_path):
+    cache = StageCache(max_entries=8, cache_dir=str(tmp_path))
+    keys = [f"k{i % 20}" for i in range(400)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda key: cache.get_or_compute(key, lambda: key.upper()), keys))
+
+    assert all(value == key.upper() for (value, _), key in zip(results, keys))
+    assert cache.hits + cache.misses == len(keys)
+    assert cache.hits == sum(hit for _, hit in results)
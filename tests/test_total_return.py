@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from api.providers import LocalProvider
+from src.pipeline import SimulationPipeline
+
+DATES = pd.bdate_range("2024-01-01", periods=4)
+# Traded closes: the stock goes ex a 2.0 dividend on the third date and drops by it
+CLOSES = pd.DataFrame({"AAA": [100.0, 100.0, 98.0, 98.0]}, index=DATES)
+DIVIDENDS = pd.DataFrame({"AAA": [2.0]}, index=DATES[2:3])
+
+
+def index_levels(return_type):
+    provider = LocalProvider(CLOSES, currencies={"AAA": "USD"}, dividends=DIVIDENDS)
+    pipeline = SimulationPipeline(cache_dir=None, provider=provider)
+    params = {"components": [{"ticker": "AAA", "weight": 100}], "return_type": return_type,
+              "start_date": "2024-01-01", "end_date": "2024-01-06"}
+    try:
+        return pipeline.run(params)["index"]["index_value"].to_numpy(), provider
+    finally:
+        pipeline.close()
+
+
+def test_adjusted_closes_carry_the_dividend():
+    adjusted = LocalProvider(CLOSES, dividends=DIVIDENDS).get_prices(["AAA"])["AAA"].to_numpy()
+    np.testing.assert_allclose(adjusted, [98.0, 98.0, 98.0, 98.0])
+
+
+def test_total_return_counts_the_dividend_once():
+    levels, provider = index_levels("Total Return")
+    # (98 + 2) / 100: the dividend makes up for the drop of the close
+    np.testing.assert_allclose(levels, [100.0, 100.0, 100.0, 100.0])
+    assert all(call[-1] is False for call in provider.calls if call[0] == "prices")
+
+
+def test_price_return_reads_adjusted_closes():
+    levels, provider = index_levels("Price Return")
+    np.testing.assert_allclose(levels, [100.0, 100.0, 100.0, 100.0])
+    assert all(call[-1] is True for call in provider.calls if call[0] == "prices")
@@ -0,0 +1,25 @@
+import numpy as np
+
+from src.rates.curve import ZeroCurve
+from src.wrapper.etf import ETF
+from src.wrapper.swap import Swap
+
+DATES = np.arange(np.datetime64("2022-01-03"), np.datetime64("2023-06-30"))
+DATES = DATES[np.is_busday(DATES)]
+LEVELS = 100 * np.cumprod(1 + 0.01 * np.random.default_rng(0).standard_normal(len(DATES)))
+
+
+def test_swap_delta_is_one_over_the_reset_level():
+    swap = Swap(LEVELS, DATES, maturity_years=3, spread=[0.0025, 0.005], curve=ZeroCurve.flat(0.03))
+    greeks = swap.greeks()
+    reset_level = swap._reset_levels()[np.searchsorted(swap.resets, DATES[-1], side="right") - 1]
+    np.testing.assert_allclose(greeks["delta"], 1 / reset_level, rtol=1e-8)
+    np.testing.assert_allclose(greeks["gamma"], 0.0, atol=1e-8)
+    assert np.all(greeks["rho"] != 0.0) and np.all(greeks["vega"] == 0.0)
+
+
+def test_etf_delta_scales_with_the_nav():
+    etf = ETF(LEVELS, DATES, ter=[0.001, 0.002])
+    greeks = etf.greeks()
+    np.testing.assert_allclose(greeks["delta"], greeks["price"] / LEVELS[-1], rtol=1e-4)
+    np.testing.assert_allclose(greeks["rho"], 0.0)